@@ -4,224 +4,563 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
                              QWidget, QPushButton, QListWidget, QListWidgetItem, 
                              QLineEdit, QSpinBox, QLabel, QMessageBox, QDialog,
                              QDialogButtonBox, QFormLayout, QTextEdit, QMenu,
-                             QFrame, QSplitter, QGroupBox, QComboBox, QScrollArea)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QPainter, QPixmap, QIntValidator
-from datetime import datetime
-import heapq
+                             QFrame, QSplitter, QGroupBox, QComboBox, QScrollArea,
+                             QCheckBox, QProgressBar, QListView, QStyledItemDelegate, QStyle)
+from PyQt5.QtCore import (Qt, pyqtSignal, QTimer, QThread, QAbstractListModel, QModelIndex, QRect, QSize,
+                          QCoreApplication)
+from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QPainter, QPixmap, QIntValidator, QPen
 import smtplib
-import imaplib
-import email
 from email.mime.text import MIMEText
-from datetime import datetime, timedelta
 import re
 from typing import List, Dict
 import os
-from email.header import decode_header
 import json
+import threading
+import time
+from functools import lru_cache
+from taskcore import DATA_DIR, EmailSyncState, EmailTaskExtractor, JournalStore, StoreLockedError, TaskManager
+from taskcore.indexes import IncrementalSearch
 
-# Import your existing TaskManager class (assuming it's in the same file or imported)
-# For this example, I'll include a simplified version of the necessary classes
+class TaskListModel(QAbstractListModel):
+    """
+    Tasks shown in the task list, in display order (model side of the QListView).
 
-class Task:
-    def __init__(self, task_id, title, priority=1):
-        self.task_id = task_id
-        self.title = title
-        self.priority = priority
-        self.completed = False
-        self.created_at = datetime.now()
+    - set_tasks(tasks, sort_key) replaces the whole list (filter / search / sort changes)
+    - insert_task / remove_task / update_task change one row and emit only that
+      row's signal, so the view repaints one row instead of rebuilding the list
+    - insert_tasks adds a batch at once (one rowsInserted, or one reset when sorted)
+    - sort_key (None = insertion order): where insert_task / update_task place a task
+    - insertion_rank(task_id): the task's position in insertion order, so a task that
+      re-enters the list with sort_key None goes back between its neighbours
+    - the task_id -> row map is built on the first row lookup after set_tasks, so
+      installing a large search result does not walk every row
+    - set_source(source) shows a TaskListSource lazily instead: the first PAGE_SIZE
+      tasks now, the next page whenever the view scrolls near the end (Qt's
+      canFetchMore / fetchMore); the loaded rows are always the source's first rows,
+      sync_task / reload keep them so after a change
+    """
+    TaskRole = Qt.UserRole
+    PAGE_SIZE = 100
 
-    def __lt__(self, other):
-        return self.priority > other.priority
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = []
+        self._rows = {}  # task_id -> row, None until the next row lookup
+        self.sort_key = None
+        self.insertion_rank = None  # None: tasks inserted with sort_key None go at the end
+        self.source = None  # TaskListSource in paged mode
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self._tasks[index.row()]
+        if role == self.TaskRole:
+            return task
+        if role == Qt.DisplayRole:
+            return f"#{task.task_id}: {task.title}"
+        if role == Qt.ToolTipRole:
+            return task.title
+        return None
+
+    def task_at(self, row):
+        return self._tasks[row]
+
+    def row_of(self, task_id):
+        return self._row_map().get(task_id)
+
+    def set_tasks(self, tasks, sort_key=None):
+        self.beginResetModel()
+        self._tasks = list(tasks)
+        self.sort_key = sort_key
+        self.source = None
+        self._rows = None
+        self.endResetModel()
+
+    def set_source(self, source):  # Time Complexity O(PAGE_SIZE + source page cost)
+        self.beginResetModel()
+        self._tasks = source.page(0, self.PAGE_SIZE)
+        self.sort_key = None
+        self.source = source
+        self._rows = None
+        self.endResetModel()
+
+    def reload(self):
+        """Paged mode: re-read the rows loaded so far (after a batch of changes)"""
+        self.beginResetModel()
+        self._tasks = self.source.page(0, max(len(self._tasks), self.PAGE_SIZE))
+        self._rows = None
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.source is not None and len(self._tasks) < self.source.count()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        tasks = self.source.page(len(self._tasks), self.PAGE_SIZE)
+        if not tasks:
+            return
+        first = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), first, first + len(tasks) - 1)
+        self._tasks.extend(tasks)
+        self._reindex(first)
+        self.endInsertRows()
+
+    def sync_task(self, task_id):  # Time Complexity O(n / 500 + loaded rows)
+        """
+        Paged mode, after one task changed: put its row where the source now lists it,
+        or drop it when the source lists it past the loaded rows (a later page brings it)
+        """
+        row = self._row_map().get(task_id)
+        position = self.source.position(task_id)
+        if row is not None and row == position:
+            self._tasks[row] = self.source.task(task_id)
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+            return
+        if row is not None:
+            self.remove_task(task_id)
+        if position is not None and position <= len(self._tasks):
+            self._insert_row(position, self.source.task(task_id))
+
+    def insert_task(self, task):  # Time Complexity O(n) (list insert), O(log n) key comparisons
+        self._insert_row(self._position(task), task)
+
+    def _insert_row(self, row, task):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.insert(row, task)
+        self._reindex(row)
+        self.endInsertRows()
+
+    def insert_tasks(self, tasks):  # Time Complexity O(k) unsorted, O((n + k) log(n + k)) sorted
+        if len(tasks) <= 1 or (self.sort_key is not None and len(tasks) * 8 < len(self._tasks)):
+            for task in tasks:  # a few rows: keep the rest of the view (scroll, selection) as it is
+                self.insert_task(task)
+            return
+        if self.sort_key is None:
+            first = len(self._tasks)
+            self.beginInsertRows(QModelIndex(), first, first + len(tasks) - 1)
+            self._tasks.extend(tasks)
+            self._reindex(first)
+            self.endInsertRows()
+            return
+        # stable sort: new tasks go after their equals, as insert_task places them
+        self.set_tasks(sorted(self._tasks + list(tasks), key=self.sort_key), self.sort_key)
+
+    def remove_task(self, task_id):  # Time Complexity O(n)
+        row = self._row_map().get(task_id)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tasks[row]
+        del self._rows[task_id]
+        self._reindex(row)
+        self.endRemoveRows()
+
+    def update_task(self, task):
+        """Repaint the task's row, moving it when a changed field puts it out of order"""
+        row = self._row_map().get(task.task_id)
+        if row is None:
+            return
+        self._tasks[row] = task  # a deleted and re-added task is a new object
+        if self.sort_key is not None and not self._in_order(row):
+            self.remove_task(task.task_id)
+            self.insert_task(task)
+            return
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def _position(self, task):
+        """Row for a new task: after its equals in sort_key order (like a stable sort), else by insertion rank"""
+        if self.sort_key is None:
+            return self._insertion_position(task)
+        key = self.sort_key(task)
+        low, high = 0, len(self._tasks)
+        while low < high:
+            middle = (low + high) // 2
+            if key < self.sort_key(self._tasks[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def _insertion_position(self, task):  # O(log n) insertion_rank calls
+        """Row for task when the rows are in insertion order: the end for a task just added"""
+        if self.insertion_rank is None or not self._tasks:
+            return len(self._tasks)
+        rank = self.insertion_rank(task.task_id)
+        if rank is None or self.insertion_rank(self._tasks[-1].task_id) < rank:
+            return len(self._tasks)
+        low, high = 0, len(self._tasks)
+        while low < high:
+            middle = (low + high) // 2
+            if rank < self.insertion_rank(self._tasks[middle].task_id):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def _in_order(self, row):
+        key = self.sort_key(self._tasks[row])
+        return ((row == 0 or self.sort_key(self._tasks[row - 1]) <= key)
+                and (row == len(self._tasks) - 1 or key <= self.sort_key(self._tasks[row + 1])))
+
+    def _row_map(self):
+        if self._rows is None:
+            self._rows = {task.task_id: row for row, task in enumerate(self._tasks)}
+        return self._rows
+
+    def _reindex(self, start):
+        if self._rows is None:
+            return
+        for row in range(start, len(self._tasks)):
+            self._rows[self._tasks[row].task_id] = row
+
+
+class TaskListSource:
+    """
+    One listing of the task manager (display order + status filter) for
+    TaskListModel.set_source, read a page at a time from the ordered views.
+    """
+
+    def __init__(self, task_manager, order="added", status="all"):
+        self.task_manager = task_manager
+        self.order = order
+        self.status = status
+
+    def count(self):
+        return self.task_manager.count_tasks(self.status)
+
+    def page(self, offset, limit):
+        return self.task_manager.list_tasks(self.order, offset, limit, status=self.status)
+
+    def position(self, task_id):
+        return self.task_manager.task_position(task_id, self.order, self.status)
+
+    def task(self, task_id):
+        return self.task_manager.get_task(task_id)
+
+
+# ------------------------------------------------------------------------------
+#   SHARED STYLES AND RENDER CACHE
+#
+# One stylesheet per top-level window, set once on that window when it is built;
+# its widgets pick their rules by type or object name instead of each carrying its
+# own copy, which Qt would parse and polish again for every widget. The sheets stay
+# off the application and use no descendant or property selectors, so Qt only
+# matches a handful of rules against the widgets of the window that owns them.
+
+WINDOW_STYLESHEET = """
+    QMainWindow#taskWindow {
+        background-color: #f8f9fa;
+    }
+    QPushButton {
+        background-color: #4a90e2;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 6px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton:hover {
+        background-color: #357abd;
+    }
+    QPushButton:pressed {
+        background-color: #2a5d94;
+    }
+    QPushButton#filterButton {
+        background-color: #6c757d;
+    }
+    QPushButton#activeFilterButton {
+        background-color: #4a90e2;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #e9ecef;
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 10px;
+        background-color: white;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #495057;
+    }
+    QLabel#taskListHeader {
+        color: #495057;
+        margin: 10px;
+    }
+    QListView#taskList {
+        border: none;
+        background-color: #f8f9fa;
+    }
+    QLabel#emptyLabel {
+        color: #6c757d;
+        font-size: 14px;
+        margin: 50px;
+    }
+    QMenu#taskMenu {
+        background-color: white;
+        border: 1px solid #ccc;
+        border-radius: 6px;
+        padding: 5px;
+    }
+    QMenu#taskMenu::item {
+        padding: 8px 16px;
+        border-radius: 4px;
+    }
+    QMenu#taskMenu::item:selected {
+        background-color: #4a90e2;
+        color: white;
+    }
+"""
+
+FORM_DIALOG_STYLESHEET = """
+    QDialog#formDialog {
+        background-color: #f8f9fa;
+    }
+    QLineEdit, QSpinBox {
+        padding: 8px;
+        border: 2px solid #e9ecef;
+        border-radius: 6px;
+        font-size: 12px;
+    }
+    QLineEdit:focus, QSpinBox:focus {
+        border-color: #4a90e2;
+    }
+    QPushButton {
+        padding: 8px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QLabel#formNote {
+        color: #666;
+        font-size: 10px;
+        margin: 10px;
+    }
+"""
+
+IMPORT_DIALOG_STYLESHEET = """
+    QDialog#importDialog {
+        background-color: #f8f9fa;
+    }
+    QPushButton {
+        padding: 8px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+        background-color: #4a90e2;
+        color: white;
+        border: none;
+    }
+    QPushButton:hover {
+        background-color: #357abd;
+    }
+    QLabel#importStatus {
+        color: #666;
+    }
+    QLabel#importError {
+        color: #e74c3c;
+    }
+    QFrame#importRow {
+        border: 1px solid #ddd;
+        border-radius: 5px;
+        margin: 2px;
+        padding: 5px;
+    }
+    QLabel#importRowInfo {
+        color: #666;
+        font-size: 9px;
+    }
+"""
+
+DATE_LABEL_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def set_style_name(widget, name):
+    """Change the object name the window's stylesheet selects on and re-polish just that widget"""
+    widget.setObjectName(name)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+@lru_cache(maxsize=4096)
+def date_label(created_at):
+    """Date shown on a task row; the same rows are repainted on every scroll and hover"""
+    return created_at.strftime(DATE_LABEL_FORMAT)
+
+
+class RenderCache:
+    """
+    Fonts and colours shared by every painted task row and dialog row.
+
+    - built once, on first use (render_cache()): QFont needs a QApplication
+    - priority_styles {priority: (badge background, badge text colour, font)}
+    """
+    PRIORITY_COLORS = {  # priority: (background, text)
+        1: ("#e3f2fd", "#1976d2"),
+        2: ("#f3e5f5", "#7b1fa2"),
+        3: ("#fff3e0", "#f57c00"),
+        4: ("#ffebee", "#d32f2f"),
+        5: ("#ffcdd2", "#b71c1c"),
+    }
 
-class TaskManager:
     def __init__(self):
-        self.tasks = {}
-        self.priority_queue = []
-        self.history = []
-        
-    def add_task(self, task_id, title, priority=1):
-        if task_id in self.tasks.keys():
-            return False
-        task = Task(task_id, title, priority)
-        self.tasks[task_id] = task
-        heapq.heappush(self.priority_queue, (-task.priority, task_id))
-        self._save_to_history("add", task_id)
-        return True
+        self.title_font = QFont("Arial", 10, QFont.Bold)
+        self.text_font = QFont("Arial", 9)
+        self.date_font = QFont("Arial", 7)
+        self.header_font = QFont("Arial", 16, QFont.Bold)
+        self.heading_font = QFont("Arial", 12, QFont.Bold)
+        priority_font = QFont("Arial", 9)
+        bold_priority_font = QFont("Arial", 9, QFont.Bold)
+        self.priority_styles = {
+            priority: (QColor(background), QColor(text), bold_priority_font if priority == 5 else priority_font)
+            for priority, (background, text) in self.PRIORITY_COLORS.items()
+        }
+        self.card_color = QColor("white")
+        self.border_color = QColor("#ddd")
+        self.hover_color = QColor("#f0f8ff")
+        self.hover_border_color = QColor("#4a90e2")
+        self.completed_color = QColor("green")
+        self.pending_color = QColor("orange")
+        self.date_color = QColor("gray")
+        self.title_color = QColor("black")
 
-    def get_task(self, task_id):
-        return self.tasks.get(task_id, None)
-
-    def remove_task(self, task_id):
-        if task_id in self.tasks:
-            task_copy = self.tasks[task_id]
-            del self.tasks[task_id]
-            self._save_to_history("remove", (task_id, task_copy))
-            return True
-        return False
-
-    def complete_task(self, task_id):
-        if task_id in self.tasks:
-            current_task = self.tasks[task_id]
-            current_task.completed = True
-            self._save_to_history("complete", task_id)
-            return True
-        return False
-
-    def get_all_tasks(self):
-        return list(self.tasks.values())
-
-    def get_stats(self):
-        total = len(self.tasks)
-        completed = sum(1 for task in self.tasks.values() if task.completed)
-        pending = total - completed
-        return {"total": total, "completed": completed, "pending": pending}
-
-    def linear_search(self, title):
-        results = []
-        search_term = title.lower()
-        for task in self.tasks.values():
-            if search_term in task.title.lower():
-                results.append(task)
-        return results
+    def priority_style(self, priority):
+        return self.priority_styles.get(priority, self.priority_styles[1])
 
-    def sort_by_priority(self):
-        task_list = list(self.tasks.values())
-        task_list.sort(key=lambda x: x.priority, reverse=True)
-        return task_list
 
-    def sort_by_date(self):
-        task_list = list(self.tasks.values())
-        task_list.sort(key=lambda x: x.created_at, reverse=True)
-        return task_list
+_render_cache = None
 
-    def undo(self):
-        if not self.history:
-            return False
-        last_operation = self.history.pop()
-        if last_operation[0] == "add":
-            task_id = last_operation[1]
-            self.tasks.pop(task_id, None)
-            self.priority_queue = [
-                item for item in self.priority_queue if item[1] != task_id
-            ]
-            heapq.heapify(self.priority_queue)
-            return True
-        elif last_operation[0] == "remove":
-            task_id, task = last_operation[1]
-            self.tasks[task_id] = task
-            heapq.heappush(self.priority_queue, (-task.priority, task_id))
-            return True
-        elif last_operation[0] == "complete":
-            task_id = last_operation[1]
-            if task_id in self.tasks:
-                self.tasks[task_id].completed = False
-                return True
-        return False
-
-    def _save_to_history(self, operation, data):
-        self.history.append((operation, data))
-        if len(self.history) > 10:
-            self.history.pop(0)
-
-class TaskWidget(QWidget):
-    """Custom widget for displaying individual tasks"""
-    task_action = pyqtSignal(str, str)  # task_id, action
-    
-    def __init__(self, task, parent=None):
+
+def render_cache():
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+    return _render_cache
+
+
+class TaskDelegate(QStyledItemDelegate):
+    """
+    Paints a task row (title, priority badge, status, date) as a rounded card,
+    in place of one QWidget with its own layout and labels per task. Only the
+    rows in the viewport are ever painted, with the shared RenderCache fonts and
+    colours.
+    """
+    ROW_HEIGHT = 44
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.task = task
-        self.setup_ui()
-        
-    def setup_ui(self):
-        layout = QHBoxLayout()
-        layout.setContentsMargins(10, 5, 10, 5)
-        
-        # Task info
-        task_info = QLabel(f"#{self.task.task_id}: {self.task.title}")
-        task_info.setFont(QFont("Arial", 10, QFont.Bold))
-        
-        # Priority indicator
-        priority_label = QLabel(f"Priority: {self.task.priority}")
-        priority_label.setStyleSheet(self.get_priority_style())
-        
-        # Status indicator
-        status_label = QLabel("✓ Completed" if self.task.completed else "⏳ Pending")
-        status_label.setStyleSheet("color: green;" if self.task.completed else "color: orange;")
-        
-        # Date
-        date_label = QLabel(self.task.created_at.strftime("%Y-%m-%d %H:%M"))
-        date_label.setStyleSheet("color: gray; font-size: 9px;")
-        
-        layout.addWidget(task_info)
-        layout.addStretch()
-        layout.addWidget(priority_label)
-        layout.addWidget(status_label)
-        layout.addWidget(date_label)
-        
-        self.setLayout(layout)
-        self.setStyleSheet("""
-            TaskWidget {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 8px;
-                margin: 2px;
-            }
-            TaskWidget:hover {
-                background-color: #f0f8ff;
-                border-color: #4a90e2;
-            }
-        """)
-        
-    def get_priority_style(self):
-        colors = {
-            1: "background-color: #e3f2fd; color: #1976d2; padding: 2px 6px; border-radius: 10px;",
-            2: "background-color: #f3e5f5; color: #7b1fa2; padding: 2px 6px; border-radius: 10px;",
-            3: "background-color: #fff3e0; color: #f57c00; padding: 2px 6px; border-radius: 10px;",
-            4: "background-color: #ffebee; color: #d32f2f; padding: 2px 6px; border-radius: 10px;",
-            5: "background-color: #ffcdd2; color: #b71c1c; padding: 2px 6px; border-radius: 10px; font-weight: bold;"
-        }
-        return colors.get(self.task.priority, colors[1])
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.RightButton:
-            self.show_context_menu(event.globalPos())
-        super().mousePressEvent(event)
-        
-    def show_context_menu(self, position):
-        menu = QMenu(self)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: white;
-                border: 1px solid #ccc;
-                border-radius: 6px;
-                padding: 5px;
-            }
-            QMenu::item {
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QMenu::item:selected {
-                background-color: #4a90e2;
-                color: white;
-            }
-        """)
-        
-        if not self.task.completed:
-            complete_action = menu.addAction("✓ Mark as Completed")
-            complete_action.triggered.connect(lambda: self.task_action.emit(self.task.task_id, "complete"))
-        else:
-            uncomplete_action = menu.addAction("↺ Mark as Incomplete")
-            uncomplete_action.triggered.connect(lambda: self.task_action.emit(self.task.task_id, "uncomplete"))
-            
-        menu.addSeparator()
-        edit_action = menu.addAction("✏️ Edit Task")
-        edit_action.triggered.connect(lambda: self.task_action.emit(self.task.task_id, "edit"))
-        
-        delete_action = menu.addAction("🗑️ Delete Task")
-        delete_action.triggered.connect(lambda: self.task_action.emit(self.task.task_id, "delete"))
-        
-        menu.exec_(position)
+        self.resources = render_cache()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        task = index.data(TaskListModel.TaskRole)
+        if task is None:
+            return
+        resources = self.resources
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Card
+        card = option.rect.adjusted(2, 2, -2, -2)
+        highlighted = option.state & (QStyle.State_MouseOver | QStyle.State_Selected)
+        painter.setPen(QPen(resources.hover_border_color if highlighted else resources.border_color))
+        painter.setBrush(resources.hover_color if highlighted else resources.card_color)
+        painter.drawRoundedRect(card, 8, 8)
+        
+        # Right side, laid out right to left: date, status, priority badge
+        right = card.right() - 10
+        right = self._draw_text(painter, right, card, date_label(task.created_at),
+                                resources.date_font, resources.date_color)
+        status = "✓ Completed" if task.completed else "⏳ Pending"
+        right = self._draw_text(painter, right, card, status, resources.text_font,
+                                resources.completed_color if task.completed else resources.pending_color)
+        background, text_color, font = resources.priority_style(task.priority)
+        label = f"Priority: {task.priority}"
+        painter.setFont(font)
+        width = painter.fontMetrics().horizontalAdvance(label) + 12
+        badge = QRect(right - width, card.center().y() - 10, width, 20)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(badge, 10, 10)
+        painter.setPen(text_color)
+        painter.drawText(badge, Qt.AlignCenter, label)
+        right = badge.left() - 10
+        
+        # Title, elided to the space left
+        painter.setFont(resources.title_font)
+        painter.setPen(resources.title_color)
+        title_rect = QRect(card.left() + 10, card.top(), max(0, right - card.left() - 10), card.height())
+        title = painter.fontMetrics().elidedText(f"#{task.task_id}: {task.title}", Qt.ElideRight,
+                                                 title_rect.width())
+        painter.drawText(title_rect, Qt.AlignVCenter | Qt.AlignLeft, title)
+        painter.restore()
+
+    def _draw_text(self, painter, right, card, text, font, color):
+        """Draw text right-aligned at x = right, return the x where the next item ends"""
+        painter.setFont(font)
+        painter.setPen(color)
+        width = painter.fontMetrics().horizontalAdvance(text)
+        painter.drawText(QRect(right - width, card.top(), width, card.height()), Qt.AlignVCenter, text)
+        return right - width - 10
+
+def find_tasks(task_manager, title_search, query, candidates, status_filter, sort_key=None):
+    """
+    - matches: IncrementalSearch entries for the tasks whose title contains query,
+      narrowed from candidates when given (None for an empty query: every task)
+    - visible: the matching tasks that pass status_filter ("all", "pending", "completed"),
+      sorted by sort_key when given
+    """
+    if query:
+        matches = title_search.matches(query, candidates)
+        tasks = [entry[2] for entry in matches]
+    else:
+        matches = None
+        tasks = task_manager.get_all_tasks()
+    if status_filter == "pending":
+        visible = [task for task in tasks if not task.completed]
+    elif status_filter == "completed":
+        visible = [task for task in tasks if task.completed]
+    else:
+        visible = tasks
+    if sort_key is not None:
+        visible = sorted(visible, key=sort_key)
+    return matches, visible
+
+
+class SearchWorker(QThread):
+    """
+    Runs find_tasks off the GUI thread, for task lists too large to search within a frame.
+
+    - matched(generation, query, matches, visible): the window drops a result whose
+      generation is no longer current (newer keystroke, filter change or task change)
+    - a task change that races the search can make it fail; the change has already
+      started a newer search, so the failed one emits nothing
+    """
+    matched = pyqtSignal(int, str, object, list)
+
+    def __init__(self, generation, task_manager, title_search, query, candidates, status_filter, sort_key=None,
+                 parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.query = query
+        self.search_args = (task_manager, title_search, query, candidates, status_filter, sort_key)
+
+    def run(self):
+        try:
+            matches, visible = find_tasks(*self.search_args)
+        except RuntimeError:  # dict changed size during the scan
+            return
+        self.matched.emit(self.generation, self.query, matches, visible)
+
 
 class AddTaskDialog(QDialog):
     def __init__(self, parent=None, task=None):
@@ -229,6 +568,8 @@ class AddTaskDialog(QDialog):
         self.task = task
         self.setWindowTitle("Edit Task" if task else "Add New Task")
         self.setFixedSize(400, 200)
+        self.setObjectName("formDialog")
+        self.setStyleSheet(FORM_DIALOG_STYLESHEET)
         self.setup_ui()
         
     def setup_ui(self):
@@ -270,27 +611,6 @@ class AddTaskDialog(QDialog):
         layout.addRow(buttons)
         self.setLayout(layout)
         
-        # Styling
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #f8f9fa;
-            }
-            QLineEdit, QSpinBox {
-                padding: 8px;
-                border: 2px solid #e9ecef;
-                border-radius: 6px;
-                font-size: 12px;
-            }
-            QLineEdit:focus, QSpinBox:focus {
-                border-color: #4a90e2;
-            }
-            QPushButton {
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-            }
-        """)
-        
     def get_data(self):
         return {
             'task_id': self.task_id_input.text(),
@@ -298,149 +618,200 @@ class AddTaskDialog(QDialog):
             'priority': self.priority_input.value()
         }
 
-class EmailTaskExtractor:
-    def __init__(self):
-        self.imap_server = None
-        self.smtp_server = None
-        
-    def connect_to_email(self, email_address, password, imap_server="imap.gmail.com", smtp_server="smtp.gmail.com"):
-        """Connect to email account"""
-        try:
-            # Connect to IMAP server
-            self.imap_server = imaplib.IMAP4_SSL(imap_server)
-            self.imap_server.login(email_address, password)
-            return True
-        except Exception as e:
-            print(f"Failed to connect to email: {e}")
-            return False
-    
-    def extract_tasks_from_emails(self, folder="INBOX", days_back=7):
-        """Extract potential tasks from emails"""
-        if not self.imap_server:
-            return []
-            
+class EmailExtractionWorker(QThread):
+    """
+    Connects and extracts email tasks on a background thread, so the window stays responsive.
+
+    - progress(stage, done, total): scan progress, at most every PROGRESS_INTERVAL seconds
+    - tasks_found(list): partial results, batched every RESULTS_INTERVAL seconds
+    - failed(str): connection or scan error
+    - QThread.finished: emitted last, also after cancel()
+    - cancel(): stop after the current message; the connections are closed and
+      the sync position only covers the messages handled before the stop
+    """
+    progress = pyqtSignal(str, int, int)
+    tasks_found = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    PROGRESS_INTERVAL = 0.1
+    RESULTS_INTERVAL = 0.25
+
+    def __init__(self, extractor, config, sync_state=None, parent=None):
+        super().__init__(parent)
+        self.extractor = extractor
+        self.config = config
+        self.sync_state = sync_state
+        self._cancelled = threading.Event()
+        self._last_progress = 0.0
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def report_progress(self, stage, done, total):
+        now = time.monotonic()
+        if done == total or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress.emit(stage, done, total)
+
+    def run(self):
+        config = self.config
+        self.progress.emit("Connecting...", 0, 0)
+        if not self.extractor.connect_to_email(config['email'], config['password'], config['imap_server']):
+            self.failed.emit("Failed to connect to email. Please check your credentials and try again.")
+            return
         try:
-            self.imap_server.select(folder)
-            
-            # Search for emails from the last N days
-            date_since = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
-            _, message_ids = self.imap_server.search(None, f'SINCE {date_since}')
-            
-            tasks = []
-            task_keywords = ['todo', 'task', 'deadline', 'urgent', 'action required', 'follow up', 'reminder']
-            
-            for msg_id in message_ids[0].split()[:20]:  # Limit to 20 most recent emails
-                _, msg_data = self.imap_server.fetch(msg_id, '(RFC822)')
-                email_body = msg_data[0][1]
-                email_message = email.message_from_bytes(email_body)
-                
-                # Get email details
-                subject = self.decode_header_value(email_message['Subject'])
-                sender = email_message['From']
-                date_received = email_message['Date']
-                
-                # Extract body text
-                body = self.get_email_body(email_message)
-                
-                # Check if email contains task-related keywords
-                combined_text = f"{subject} {body}".lower()
-                if any(keyword in combined_text for keyword in task_keywords):
-                    # Extract potential task from subject or body
-                    task_text = self.extract_task_text(subject, body)
-                    if task_text:
-                        tasks.append({
-                            'title': task_text,
-                            'source': f"Email from {sender}",
-                            'date': date_received,
-                            'priority': self.determine_priority(combined_text)
-                        })
-            
-            return tasks
-            
+            batch = []
+            last_emit = time.monotonic()
+            for task in self.extractor.iter_tasks_from_emails(config['folder'], config['days_back'], self.sync_state,
+                                                              progress=self.report_progress,
+                                                              cancelled=self.is_cancelled):
+                batch.append(task)
+                if time.monotonic() - last_emit >= self.RESULTS_INTERVAL:
+                    self.tasks_found.emit(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+                if self.is_cancelled():
+                    break
+            if batch:
+                self.tasks_found.emit(batch)
         except Exception as e:
-            print(f"Error extracting tasks from emails: {e}")
-            return []
-    
-    def decode_header_value(self, header_value):
-        """Decode email header value"""
-        if header_value is None:
-            return ""
+            self.failed.emit(f"An error occurred: {str(e)}")
+        finally:
+            self.extractor.disconnect()
+
+
+class EmailImportDialog(QDialog):
+    """
+    Task selection dialog filled while the extraction worker is still scanning:
+    a progress line on top, one checkbox row per task as results arrive.
+    """
+    stop_requested = pyqtSignal()
+
+    def __init__(self, parent=None, first_task_id=1):
+        super().__init__(parent)
+        self.first_task_id = first_task_id
+        self.checkboxes = []  # (checkbox, task_data, task_id)
+        self.error = None
+        self.setWindowTitle("Select Tasks to Import")
+        self.setFixedSize(600, 400)
+        self.setObjectName("importDialog")
+        self.setStyleSheet(IMPORT_DIALOG_STYLESHEET)
+        self.resources = render_cache()
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
         
-        decoded_parts = decode_header(header_value)
-        decoded_string = ""
+        # Instructions
+        instructions = QLabel("Select the tasks you want to import:")
+        instructions.setFont(self.resources.heading_font)
+        layout.addWidget(instructions)
         
-        for part, encoding in decoded_parts:
-            if isinstance(part, bytes):
-                decoded_string += part.decode(encoding or 'utf-8', errors='ignore')
-            else:
-                decoded_string += part
-                
-        return decoded_string
-    
-    def get_email_body(self, email_message):
-        """Extract email body text"""
-        body = ""
-        
-        if email_message.is_multipart():
-            for part in email_message.walk():
-                content_type = part.get_content_type()
-                if content_type == "text/plain":
-                    try:
-                        body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                        break
-                    except:
-                        continue
-        else:
-            try:
-                body = email_message.get_payload(decode=True).decode('utf-8', errors='ignore')
-            except:
-                body = str(email_message.get_payload())
+        # Scan progress
+        self.status_label = QLabel("Connecting to email...")
+        self.status_label.setObjectName("importStatus")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # busy until the first count arrives
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.progress_bar)
         
-        return body[:500]  # Limit body length
-    
-    def extract_task_text(self, subject, body):
-        """Extract meaningful task text from email"""
-        # Priority to subject line for task extraction
-        if subject and len(subject.strip()) > 5:
-            return subject.strip()[:100]  # Limit length
-        
-        # If subject is not useful, try to extract from body
-        lines = body.split('\n')
-        for line in lines[:10]:  # Check first 10 lines
-            line = line.strip()
-            if len(line) > 10 and len(line) < 100:
-                return line
-        
-        return subject.strip()[:50] if subject else "Email task"
-    
-    def determine_priority(self, text):
-        """Determine priority based on email content"""
-        urgent_words = ['urgent', 'asap', 'immediate', 'critical', 'deadline']
-        high_words = ['important', 'priority', 'soon', 'action required']
+        # Task list with checkboxes
+        scroll_area = QScrollArea()
+        task_widget = QWidget()
+        self.task_layout = QVBoxLayout()
+        self.task_layout.addStretch()
+        task_widget.setLayout(self.task_layout)
+        scroll_area.setWidget(task_widget)
+        scroll_area.setWidgetResizable(True)
+        layout.addWidget(scroll_area)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        select_all_btn = QPushButton("Select All")
+        deselect_all_btn = QPushButton("Deselect All")
+        self.stop_btn = QPushButton("Stop")
+        self.import_btn = QPushButton("Import Selected")
+        cancel_btn = QPushButton("Cancel")
+        
+        select_all_btn.clicked.connect(lambda: self.set_all_checked(True))
+        deselect_all_btn.clicked.connect(lambda: self.set_all_checked(False))
+        self.stop_btn.clicked.connect(self.stop_requested.emit)
+        cancel_btn.clicked.connect(self.reject)
         
-        text_lower = text.lower()
+        button_layout.addWidget(select_all_btn)
+        button_layout.addWidget(deselect_all_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.stop_btn)
+        button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(cancel_btn)
         
-        if any(word in text_lower for word in urgent_words):
-            return 5
-        elif any(word in text_lower for word in high_words):
-            return 3
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def add_tasks(self, tasks):
+        """Append one row per task (slot for EmailExtractionWorker.tasks_found)"""
+        for task_data in tasks:
+            task_id = self.first_task_id + len(self.checkboxes)
+            # rows take their look from the dialog's stylesheet (object names) and the shared fonts
+            frame = QFrame()
+            frame.setFrameStyle(QFrame.Box)
+            frame.setObjectName("importRow")
+            
+            frame_layout = QVBoxLayout()
+            
+            # Checkbox with task title
+            checkbox = QCheckBox(f"Task #{task_id}: {task_data['title']}")
+            checkbox.setChecked(True)  # Default to checked
+            checkbox.setFont(self.resources.title_font)
+            
+            # Additional info
+            info_label = QLabel(f"Priority: {task_data['priority']} | Source: {task_data['source']}")
+            info_label.setObjectName("importRowInfo")
+            
+            frame_layout.addWidget(checkbox)
+            frame_layout.addWidget(info_label)
+            frame.setLayout(frame_layout)
+            
+            # keep the stretch last, so rows stack at the top
+            self.task_layout.insertWidget(self.task_layout.count() - 1, frame)
+            self.checkboxes.append((checkbox, task_data, task_id))
+
+    def set_progress(self, stage, done, total):
+        self.status_label.setText(f"{stage} {done}/{total}" if total else stage)
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+
+    def show_error(self, message):
+        self.error = message
+        self.status_label.setText(message)
+        set_style_name(self.status_label, "importError")
+
+    def scan_finished(self):
+        """Slot for the worker's finished signal"""
+        self.progress_bar.hide()
+        self.stop_btn.setEnabled(False)
+        if self.error is not None:
+            return  # keep the error message
+        if self.checkboxes:
+            self.status_label.setText(f"Found {len(self.checkboxes)} tasks.")
         else:
-            return 2
-    
-    def disconnect(self):
-        """Disconnect from email server"""
-        if self.imap_server:
-            try:
-                self.imap_server.close()
-                self.imap_server.logout()
-            except:
-                pass
+            self.status_label.setText("No task-related emails found in the specified timeframe.")
+
+    def set_all_checked(self, checked):
+        for checkbox, _, _ in self.checkboxes:
+            checkbox.setChecked(checked)
+
 
 class EmailConfigDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Email Configuration")
         self.setFixedSize(400, 300)
+        self.setObjectName("formDialog")
+        self.setStyleSheet(FORM_DIALOG_STYLESHEET)
         self.setup_ui()
         
     def setup_ui(self):
@@ -459,6 +830,7 @@ class EmailConfigDialog(QDialog):
         self.imap_input = QLineEdit()
         self.imap_input.setText("imap.gmail.com")
         self.imap_input.setPlaceholderText("imap.gmail.com")
+        self.imap_input.setToolTip("host[:port] (SSL), or imap://host:port for a plain-text server")
         
         # Days back
         self.days_input = QSpinBox()
@@ -479,7 +851,7 @@ class EmailConfigDialog(QDialog):
         # Info label
         info_label = QLabel("Note: For Gmail, use an App Password instead of your regular password.")
         info_label.setWordWrap(True)
-        info_label.setStyleSheet("color: #666; font-size: 10px; margin: 10px;")
+        info_label.setObjectName("formNote")
         layout.addRow(info_label)
         
         # Buttons
@@ -490,27 +862,6 @@ class EmailConfigDialog(QDialog):
         layout.addRow(buttons)
         self.setLayout(layout)
         
-        # Styling
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #f8f9fa;
-            }
-            QLineEdit, QSpinBox {
-                padding: 8px;
-                border: 2px solid #e9ecef;
-                border-radius: 6px;
-                font-size: 12px;
-            }
-            QLineEdit:focus, QSpinBox:focus {
-                border-color: #4a90e2;
-            }
-            QPushButton {
-                padding: 8px 16px;
-                border-radius: 6px;
-                font-weight: bold;
-            }
-        """)
-        
     def get_config(self):
         return {
             'email': self.email_input.text(),
@@ -521,14 +872,33 @@ class EmailConfigDialog(QDialog):
         }
 
 class TaskManagerUI(QMainWindow):
-    def __init__(self):
+    SEARCH_DELAY_MS = 150           # keystrokes closer together than this run one search
+    BACKGROUND_SEARCH_TASKS = 20000  # searches over more tasks than this run on a SearchWorker
+    FLUSH_INTERVAL_MS = 1000        # journal records buffered while idle are written this often
+
+    def __init__(self, task_manager=None):
         super().__init__()
-        self.task_manager = TaskManager()
+        # The shared taskcore engine on the CLI's store (./task_data), so both see the same tasks
+        self.task_manager = task_manager or TaskManager(storage=JournalStore(DATA_DIR))
         self.email_extractor = EmailTaskExtractor()
+        self.email_worker = None  # EmailExtractionWorker of the running / last extraction
         self.current_filter = "all"
+        self.current_order = "added"  # TaskManager.ORDERS key, set by the sort buttons
+        self.title_search = IncrementalSearch(self.task_manager.title_index)
+        self.search_generation = 0    # bumped by every search; older results are dropped
+        self.search_pending = False   # a SearchWorker result is still to come
+        self.search_worker = None
+        self.shown_query = ""         # query and filter of the tasks in the list
+        self.shown_filter = "all"
         self.setup_ui()
+        self.task_manager.subscribe(self.on_tasks_changed)
         self.refresh_task_list()
         
+        # The journal group-commits on writes; this also flushes the last records of a quiet spell
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.task_manager.flush)
+        self.flush_timer.start(self.FLUSH_INTERVAL_MS)
+        
     def setup_ui(self):
         self.setWindowTitle("Task Manager Pro")
         self.setGeometry(100, 100, 1000, 700)
@@ -555,41 +925,9 @@ class TaskManagerUI(QMainWindow):
         
         main_layout.addWidget(splitter)
         
-        # Styling
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f8f9fa;
-            }
-            QPushButton {
-                background-color: #4a90e2;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #357abd;
-            }
-            QPushButton:pressed {
-                background-color: #2a5d94;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background-color: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #495057;
-            }
-        """)
+        # Styling: one sheet for the window, its dialogs and menus included
+        self.setObjectName("taskWindow")
+        self.setStyleSheet(WINDOW_STYLESHEET)
         
     def create_left_panel(self):
         panel = QWidget()
@@ -610,7 +948,13 @@ class TaskManagerUI(QMainWindow):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search tasks...")
-        self.search_input.textChanged.connect(self.search_tasks)
+        self.search_input.textChanged.connect(self.schedule_search)
+        
+        # Debounce: restarted by every keystroke, searches once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.search_tasks)
         
         # Filter buttons
         filter_layout = QHBoxLayout()
@@ -622,9 +966,10 @@ class TaskManagerUI(QMainWindow):
         self.pending_btn.clicked.connect(lambda: self.set_filter("pending"))
         self.completed_btn.clicked.connect(lambda: self.set_filter("completed"))
         
-        filter_layout.addWidget(self.all_btn)
-        filter_layout.addWidget(self.pending_btn)
-        filter_layout.addWidget(self.completed_btn)
+        self.filter_buttons = {"all": self.all_btn, "pending": self.pending_btn, "completed": self.completed_btn}
+        for btn in self.filter_buttons.values():
+            filter_layout.addWidget(btn)
+        self.mark_active_filter()
         
         search_layout.addWidget(self.search_input)
         search_layout.addLayout(filter_layout)
@@ -684,86 +1029,172 @@ class TaskManagerUI(QMainWindow):
         
         # Header
         header = QLabel("Task List")
-        header.setFont(QFont("Arial", 16, QFont.Bold))
-        header.setStyleSheet("color: #495057; margin: 10px;")
-        
-        # Task list (scroll area)
-        self.scroll_area = QScrollArea()
-        self.task_list_widget = QWidget()
-        self.task_layout = QVBoxLayout()
-        self.task_list_widget.setLayout(self.task_layout)
-        
-        self.scroll_area.setWidget(self.task_list_widget)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: #f8f9fa;
-            }
-        """)
+        header.setFont(render_cache().header_font)
+        header.setObjectName("taskListHeader")
+        
+        # Task list: model + delegate, only the visible rows are painted
+        self.task_model = TaskListModel(self)
+        self.task_model.insertion_rank = lambda task_id: self.task_manager.task_position(task_id, "added")
+        self.task_view = QListView()
+        self.task_view.setModel(self.task_model)
+        self.task_view.setItemDelegate(TaskDelegate(self.task_view))
+        self.task_view.setUniformItemSizes(True)  # every row is ROW_HEIGHT, no per-row measuring
+        self.task_view.setMouseTracking(True)  # hover highlight
+        self.task_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.task_view.customContextMenuRequested.connect(self.show_task_menu)
+        self.task_view.setObjectName("taskList")
+        
+        self.empty_label = QLabel("No tasks found")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.setObjectName("emptyLabel")
+        for signal in (self.task_model.rowsInserted, self.task_model.rowsRemoved, self.task_model.modelReset):
+            signal.connect(self.update_empty_label)
         
         layout.addWidget(header)
-        layout.addWidget(self.scroll_area)
+        layout.addWidget(self.empty_label)
+        layout.addWidget(self.task_view)
         
         panel.setLayout(layout)
         return panel
         
     def refresh_task_list(self):
-        # Clear existing widgets
-        for i in reversed(range(self.task_layout.count())):
-            child = self.task_layout.itemAt(i)
-            if child is not None:
-                widget = child.widget()
-                if widget is not None:
-                    widget.setParent(None)
-            
-        # Get tasks based on current filter
-        tasks = self.get_filtered_tasks()
+        """
+        Reload the list from the task manager (filter, order or search changed).
+        Without a search the list pages through the task manager's ordered views: only
+        the first screenful is read now, the rest as the list is scrolled.
+        A query that extends the shown one only re-checks the shown matches; searches
+        over more than BACKGROUND_SEARCH_TASKS tasks run on a SearchWorker and the list
+        is replaced when the result arrives.
+        """
+        self.search_timer.stop()
+        self.search_generation += 1
+        query = self.search_input.text()
+        if not query:
+            self.search_pending = False
+            self.shown_query = ""
+            self.shown_filter = self.current_filter
+            self.task_model.set_source(TaskListSource(self.task_manager, self.current_order, self.current_filter))
+            return
+        candidates = self.title_search.candidates(query)
+        size = len(self.task_manager.tasks) if candidates is None else len(candidates)
+        if size <= self.BACKGROUND_SEARCH_TASKS:
+            self.search_pending = False
+            matches, visible = find_tasks(self.task_manager, self.title_search, query, candidates,
+                                          self.current_filter, self.order_key())
+            self.show_search_result(self.search_generation, query, matches, visible)
+            return
+        self.search_pending = True
+        if candidates is None:
+            # a deferred trigram build on the worker could miss a rename made here meanwhile
+            self.task_manager.title_index.ensure_built()
+        worker = SearchWorker(self.search_generation, self.task_manager, self.title_search, query, candidates,
+                              self.current_filter, self.order_key(), self)
+        worker.matched.connect(self.show_search_result)
+        worker.finished.connect(worker.deleteLater)
+        self.search_worker = worker
+        worker.start()
+        
+    def show_search_result(self, generation, query, matches, visible):
+        if generation != self.search_generation:
+            return  # superseded by a newer search or a task change
+        self.search_pending = False
+        if query:
+            self.title_search.remember(query, matches)
+        self.shown_query = query
+        self.shown_filter = self.current_filter
+        self.task_model.set_tasks(visible, self.order_key())
+        
+    def order_key(self):
+        """Sort key of the current display order, None for insertion order"""
+        return None if self.current_order == "added" else TaskManager.ORDERS[self.current_order]
+        
+    def update_empty_label(self, *args):
+        empty = self.task_model.rowCount() == 0
+        self.empty_label.setVisible(empty)
+        self.task_view.setVisible(not empty)
+        
+    def task_visible(self, task):
+        """Whether task passes the shown filter and search, i.e. belongs in the list"""
+        if self.shown_filter == "pending" and task.completed:
+            return False
+        if self.shown_filter == "completed" and not task.completed:
+            return False
+        if self.shown_query:
+            return self.shown_query.lower() in task.title.lower()
+        return True
         
-        if not tasks:
-            empty_label = QLabel("No tasks found")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("color: #6c757d; font-size: 14px; margin: 50px;")
-            self.task_layout.addWidget(empty_label)
+    def on_tasks_changed(self, changes):
+        """TaskManager listener: patch the rows of the tasks that changed, a batch at once"""
+        self.title_search.invalidate()
+        if self.search_pending:
+            self.refresh_task_list()  # the running search may have read the tasks before the change
+            return
+        if self.task_model.source is not None:
+            changed = changes["added"] + changes["removed"] + changes["updated"]
+            if len(changed) == 1:
+                self.task_model.sync_task(changed[0])
+            else:
+                self.task_model.reload()  # re-read the loaded rows once for the whole batch
+            return
+        updated = changes["updated"]
+        if self.task_model.sort_key is not None and updated and len(updated) + len(changes["added"]) > 1:
+            # tasks re-keyed in place leave the rows unsorted until they move, so take them
+            # all out and insert them with the new tasks into the still sorted rest
+            changes = {"added": changes["added"] + updated, "removed": changes["removed"] + updated}
+            updated = []
+        for task_id in changes["removed"]:
+            self.task_model.remove_task(task_id)
+        added = [self.task_manager.get_task(task_id) for task_id in changes["added"]]
+        self.task_model.insert_tasks([task for task in added if task is not None and self.task_visible(task)])
+        for task_id in updated:
+            self.sync_task_row(task_id)
+        
+    def sync_task_row(self, task_id):
+        """Bring one task's row in line with the task manager after a change to that task"""
+        task = self.task_manager.get_task(task_id)
+        shown = self.task_model.row_of(task_id) is not None
+        if task is None or not self.task_visible(task):
+            if shown:
+                self.task_model.remove_task(task_id)
+        elif shown:
+            self.task_model.update_task(task)
         else:
-            for task in tasks:
-                task_widget = TaskWidget(task)
-                task_widget.task_action.connect(self.handle_task_action)
-                self.task_layout.addWidget(task_widget)
-                
-        self.task_layout.addStretch()
+            self.task_model.insert_task(task)
         
-    def get_filtered_tasks(self):
-        tasks = self.task_manager.get_all_tasks()
+    def show_task_menu(self, position):
+        index = self.task_view.indexAt(position)
+        if not index.isValid():
+            return
+        task = self.task_model.task_at(index.row())
+        menu = QMenu(self)
+        menu.setObjectName("taskMenu")
         
-        if self.current_filter == "pending":
-            tasks = [t for t in tasks if not t.completed]
-        elif self.current_filter == "completed":
-            tasks = [t for t in tasks if t.completed]
-            
-        # Apply search filter if search text exists
-        search_text = getattr(self, 'search_input', None)
-        if search_text and search_text.text():
-            search_term = search_text.text().lower()
-            tasks = [t for t in tasks if search_term in t.title.lower()]
+        if not task.completed:
+            complete_action = menu.addAction("✓ Mark as Completed")
+            complete_action.triggered.connect(lambda: self.handle_task_action(task.task_id, "complete"))
+        else:
+            uncomplete_action = menu.addAction("↺ Mark as Incomplete")
+            uncomplete_action.triggered.connect(lambda: self.handle_task_action(task.task_id, "uncomplete"))
             
-        return tasks
+        menu.addSeparator()
+        edit_action = menu.addAction("✏️ Edit Task")
+        edit_action.triggered.connect(lambda: self.handle_task_action(task.task_id, "edit"))
+        
+        delete_action = menu.addAction("🗑️ Delete Task")
+        delete_action.triggered.connect(lambda: self.handle_task_action(task.task_id, "delete"))
+        
+        menu.exec_(self.task_view.viewport().mapToGlobal(position))
         
     def set_filter(self, filter_type):
         self.current_filter = filter_type
         self.refresh_task_list()
         
-        # Update button styles
-        buttons = [self.all_btn, self.pending_btn, self.completed_btn]
-        for btn in buttons:
-            btn.setStyleSheet("background-color: #6c757d;")
+        # Update button styles: the stylesheet colours the button marked active
+        self.mark_active_filter()
             
-        if filter_type == "all":
-            self.all_btn.setStyleSheet("background-color: #4a90e2;")
-        elif filter_type == "pending":
-            self.pending_btn.setStyleSheet("background-color: #4a90e2;")
-        elif filter_type == "completed":
-            self.completed_btn.setStyleSheet("background-color: #4a90e2;")
+    def mark_active_filter(self):
+        for filter_type, btn in self.filter_buttons.items():
+            set_style_name(btn, "activeFilterButton" if filter_type == self.current_filter else "filterButton")
             
     def add_task(self):
         dialog = AddTaskDialog(self)
@@ -777,7 +1208,6 @@ class TaskManagerUI(QMainWindow):
                     
                 success = self.task_manager.add_task(data['task_id'], data['title'], data['priority'])
                 if success:
-                    self.refresh_task_list()
                     QMessageBox.information(self, "Success", "Task added successfully!")
                 else:
                     QMessageBox.warning(self, "Error", "Task ID already exists!")
@@ -787,14 +1217,10 @@ class TaskManagerUI(QMainWindow):
     def handle_task_action(self, task_id, action):
         try:
             if action == "complete":
-                self.task_manager.complete_task(task_id)
-                self.refresh_task_list()
-                QMessageBox.information(self, "Success", "Task marked as completed!")
+                if self.task_manager.complete_task(task_id):
+                    QMessageBox.information(self, "Success", "Task marked as completed!")
             elif action == "uncomplete":
-                task = self.task_manager.get_task(task_id)
-                if task:
-                    task.completed = False
-                    self.refresh_task_list()
+                if self.task_manager.uncomplete_task(task_id):
                     QMessageBox.information(self, "Success", "Task marked as incomplete!")
             elif action == "edit":
                 task = self.task_manager.get_task(task_id)
@@ -803,9 +1229,7 @@ class TaskManagerUI(QMainWindow):
                     if dialog.exec_() == QDialog.Accepted:
                         data = dialog.get_data()
                         if data['title']:  # Only title can be edited for existing tasks
-                            task.title = data['title']
-                            task.priority = data['priority']
-                            self.refresh_task_list()
+                            self.task_manager.edit_task(task_id, data['title'], data['priority'])
                             QMessageBox.information(self, "Success", "Task updated successfully!")
                         else:
                             QMessageBox.warning(self, "Error", "Title cannot be empty!")
@@ -815,50 +1239,41 @@ class TaskManagerUI(QMainWindow):
                                            QMessageBox.Yes | QMessageBox.No)
                 if reply == QMessageBox.Yes:
                     if self.task_manager.remove_task(task_id):
-                        self.refresh_task_list()
                         QMessageBox.information(self, "Success", "Task deleted successfully!")
                     else:
                         QMessageBox.warning(self, "Error", "Failed to delete task!")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
                 
+    def schedule_search(self, *args):
+        self.search_timer.start()
+        
     def search_tasks(self):
         self.refresh_task_list()
         
     def sort_by_priority(self):
-        # This will be handled by refresh_task_list if we modify get_filtered_tasks
-        tasks = self.task_manager.sort_by_priority()
-        self.display_sorted_tasks(tasks)
+        self.set_order("priority")
         
     def sort_by_date(self):
-        tasks = self.task_manager.sort_by_date()
-        self.display_sorted_tasks(tasks)
-        
-    def display_sorted_tasks(self, tasks):
-        # Clear existing widgets
-        for i in reversed(range(self.task_layout.count())):
-            child = self.task_layout.itemAt(i)
-            if child is not None:
-                widget = child.widget()
-                if widget is not None:
-                    widget.setParent(None)
-            
-        for task in tasks:
-            task_widget = TaskWidget(task)
-            task_widget.task_action.connect(self.handle_task_action)
-            self.task_layout.addWidget(task_widget)
-            
-        self.task_layout.addStretch()
+        self.set_order("date")
+        
+    def set_order(self, order):
+        """Show tasks in a TaskManager.ORDERS order; it stays in effect across filters and searches"""
+        self.current_order = order
+        self.refresh_task_list()
         
     def undo_action(self):
         if self.task_manager.undo():
-            self.refresh_task_list()
             QMessageBox.information(self, "Success", "Undo successful!")
         else:
             QMessageBox.information(self, "Info", "Nothing to undo!")
             
     def extract_email_tasks(self):
-        """Extract tasks from email"""
+        """Extract tasks from email on a background worker, filling the selection dialog as tasks arrive"""
+        if self.email_worker is not None and self.email_worker.isRunning():
+            QMessageBox.information(self, "Please wait", "The previous email extraction is still stopping.")
+            return
+        
         dialog = EmailConfigDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             config = dialog.get_config()
@@ -867,132 +1282,25 @@ class TaskManagerUI(QMainWindow):
                 QMessageBox.warning(self, "Error", "Please provide email and password!")
                 return
             
-            # Show progress
-            progress = QMessageBox(self)
-            progress.setWindowTitle("Processing")
-            progress.setText("Connecting to email and extracting tasks...\nThis may take a moment.")
-            progress.setStandardButtons(QMessageBox.NoButton)
-            progress.show()
+            # Loaded fresh for every extraction and saved only when tasks are imported,
+            # so cancelling the selection dialog offers the same messages next time
+            sync_state = EmailSyncState("email_sync.json")
             
-            # Process in a separate thread (simplified version)
-            try:
-                # Connect to email
-                if self.email_extractor.connect_to_email(
-                    config['email'], 
-                    config['password'], 
-                    config['imap_server']
-                ):
-                    # Extract tasks
-                    email_tasks = self.email_extractor.extract_tasks_from_emails(
-                        config['folder'], 
-                        config['days_back']
-                    )
-                    
-                    progress.close()
-                    
-                    if email_tasks:
-                        # Show extracted tasks for user selection
-                        self.show_extracted_tasks(email_tasks)
-                    else:
-                        QMessageBox.information(self, "No Tasks Found", 
-                                              "No task-related emails found in the specified timeframe.")
-                else:
-                    progress.close()
-                    QMessageBox.critical(self, "Connection Error", 
-                                       "Failed to connect to email. Please check your credentials and try again.")
-                
-            except Exception as e:
-                progress.close()
-                QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
-            finally:
-                self.email_extractor.disconnect()
-    
-    def show_extracted_tasks(self, email_tasks):
-        """Show extracted email tasks for user selection"""
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Select Tasks to Import")
-        dialog.setFixedSize(600, 400)
-        
-        layout = QVBoxLayout()
-        
-        # Instructions
-        instructions = QLabel("Select the tasks you want to import:")
-        instructions.setFont(QFont("Arial", 12, QFont.Bold))
-        layout.addWidget(instructions)
-        
-        # Task list with checkboxes
-        scroll_area = QScrollArea()
-        task_widget = QWidget()
-        task_layout = QVBoxLayout()
-        
-        checkboxes = []
-        next_task_id = self.get_next_available_task_id()
-        
-        for i, task_data in enumerate(email_tasks):
-            frame = QFrame()
-            frame.setFrameStyle(QFrame.Box)
-            frame.setStyleSheet("QFrame { border: 1px solid #ddd; border-radius: 5px; margin: 2px; padding: 5px; }")
-            
-            frame_layout = QVBoxLayout()
+            import_dialog = EmailImportDialog(self, self.get_next_available_task_id())
+            worker = EmailExtractionWorker(self.email_extractor, config, sync_state, self)
+            worker.progress.connect(import_dialog.set_progress)
+            worker.tasks_found.connect(import_dialog.add_tasks)
+            worker.failed.connect(import_dialog.show_error)
+            worker.finished.connect(import_dialog.scan_finished)
+            import_dialog.stop_requested.connect(worker.cancel)
+            import_dialog.import_btn.clicked.connect(
+                lambda: self.import_selected_tasks(import_dialog, import_dialog.checkboxes, sync_state))
+            self.email_worker = worker
+            worker.start()
             
-            # Checkbox with task title
-            checkbox = QCheckBox(f"Task #{next_task_id + i}: {task_data['title']}")
-            checkbox.setChecked(True)  # Default to checked
-            checkbox.setFont(QFont("Arial", 10, QFont.Bold))
-            
-            # Additional info
-            info_label = QLabel(f"Priority: {task_data['priority']} | Source: {task_data['source']}")
-            info_label.setStyleSheet("color: #666; font-size: 9px;")
-            
-            frame_layout.addWidget(checkbox)
-            frame_layout.addWidget(info_label)
-            frame.setLayout(frame_layout)
-            
-            task_layout.addWidget(frame)
-            checkboxes.append((checkbox, task_data, next_task_id + i))
-        
-        task_widget.setLayout(task_layout)
-        scroll_area.setWidget(task_widget)
-        scroll_area.setWidgetResizable(True)
-        
-        layout.addWidget(scroll_area)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        select_all_btn = QPushButton("Select All")
-        deselect_all_btn = QPushButton("Deselect All")
-        import_btn = QPushButton("Import Selected")
-        cancel_btn = QPushButton("Cancel")
-        
-        select_all_btn.clicked.connect(lambda: self.toggle_all_checkboxes(checkboxes, True))
-        deselect_all_btn.clicked.connect(lambda: self.toggle_all_checkboxes(checkboxes, False))
-        import_btn.clicked.connect(lambda: self.import_selected_tasks(dialog, checkboxes))
-        cancel_btn.clicked.connect(dialog.reject)
-        
-        button_layout.addWidget(select_all_btn)
-        button_layout.addWidget(deselect_all_btn)
-        button_layout.addStretch()
-        button_layout.addWidget(import_btn)
-        button_layout.addWidget(cancel_btn)
-        
-        layout.addLayout(button_layout)
-        dialog.setLayout(layout)
-        
-        # Styling
-        dialog.setStyleSheet("""
-            QDialog { background-color: #f8f9fa; }
-            QPushButton { 
-                padding: 8px 16px; 
-                border-radius: 6px; 
-                font-weight: bold;
-                background-color: #4a90e2;
-                color: white;
-                border: none;
-            }
-            QPushButton:hover { background-color: #357abd; }
-        """)
-        
-        dialog.exec_()
+            # the dialog's event loop keeps the window painting while the worker scans
+            import_dialog.exec_()
+            worker.cancel()  # no-op once the scan is over; otherwise it stops at the next message
     
     def get_next_available_task_id(self):
         """Get the next available numeric task ID"""
@@ -1009,39 +1317,63 @@ class TaskManagerUI(QMainWindow):
         
         return max(existing_ids) + 1 if existing_ids else 1
     
-    def toggle_all_checkboxes(self, checkboxes, checked):
-        """Toggle all checkboxes"""
-        for checkbox, _, _ in checkboxes:
-            checkbox.setChecked(checked)
-    
-    def import_selected_tasks(self, dialog, checkboxes):
+    def import_selected_tasks(self, dialog, checkboxes, sync_state=None):
         """Import selected tasks"""
+        # importing ends a scan still running; wait for the worker so it no longer touches sync_state
+        if self.email_worker is not None:
+            self.email_worker.cancel()
+            self.email_worker.wait()
+            # its last tasks_found batch is still a queued signal, and sync_state already
+            # covers those messages: deliver it so the rows exist (checked) before reading them
+            QCoreApplication.sendPostedEvents()
         imported_count = 0
         
-        for checkbox, task_data, task_id in checkboxes:
-            if checkbox.isChecked():
-                success = self.task_manager.add_task(
-                    str(task_id), 
-                    task_data['title'], 
-                    task_data['priority']
-                )
-                if success:
-                    imported_count += 1
+        # one list update for the whole import
+        with self.task_manager.batch_changes():
+            for checkbox, task_data, task_id in checkboxes:
+                if checkbox.isChecked():
+                    success = self.task_manager.add_task(
+                        str(task_id), 
+                        task_data['title'], 
+                        task_data['priority']
+                    )
+                    if success:
+                        imported_count += 1
+                        if sync_state is not None:
+                            sync_state.remember(task_data.get('message_id'), str(task_id))
         
+        if sync_state is not None:
+            sync_state.save()
         dialog.accept()
         
         if imported_count > 0:
-            self.refresh_task_list()
             QMessageBox.information(self, "Success", f"Successfully imported {imported_count} tasks from email!")
         else:
             QMessageBox.information(self, "No Tasks Imported", "No tasks were selected for import.")
     
     def show_stats(self):
         stats = self.task_manager.get_stats()
+        by_priority = "\n".join(f"  Priority {priority}: {counts['pending']} pending / {counts['total']} total"
+                                for priority, counts in stats['by_priority'].items())
+        by_age = "\n".join(f"  {name.replace('_', ' ')}: {count}"
+                           for name, count in stats['pending_by_age'].items())
         QMessageBox.information(self, "Task Statistics", 
                               f"Total Tasks: {stats['total']}\n"
                               f"Completed: {stats['completed']}\n"
-                              f"Pending: {stats['pending']}")
+                              f"Pending: {stats['pending']}\n\n"
+                              f"By priority:\n{by_priority}\n\n"
+                              f"Pending by age:\n{by_age}")
+
+    def closeEvent(self, event):
+        """Stop a running email extraction and close the task store before the window goes away"""
+        if self.email_worker is not None and self.email_worker.isRunning():
+            self.email_worker.cancel()
+            self.email_worker.wait()
+        if self.search_pending:
+            self.search_worker.wait()
+        self.flush_timer.stop()
+        self.task_manager.close()  # last journal batch
+        super().closeEvent(event)
 
 def main():
     app = QApplication(sys.argv)
@@ -1049,8 +1381,15 @@ def main():
     # Set application style
     app.setStyle('Fusion')
     
+    # The CLI may have ./task_data open; two writers would corrupt it
+    try:
+        task_manager = TaskManager(storage=JournalStore(DATA_DIR))
+    except StoreLockedError as e:
+        QMessageBox.critical(None, "Task Manager", str(e))
+        sys.exit(1)
+    
     # Create and show main window
-    window = TaskManagerUI()
+    window = TaskManagerUI(task_manager)
     window.show()
     
     sys.exit(app.exec_())
@@ -0,0 +1,21 @@
+"""Shared helpers for the benchmark scripts."""
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import TaskManager  # noqa: E402
+
+
+def make_manager(config=None, **kwargs):
+    """
+    TaskManager with a throwaway config file, so no credentials prompt appears;
+    config adds entries to it (e.g. {"imap_server": "imap://127.0.0.1:1143"}).
+    """
+    config_dir = tempfile.mkdtemp(prefix="taskmanager-bench-")
+    config_path = os.path.join(config_dir, "config.json")
+    with open(config_path, "w") as file:
+        json.dump({"email": "bench@example.com", "app_password": "unused", **(config or {})}, file)
+    return TaskManager(config_path=config_path, **kwargs)
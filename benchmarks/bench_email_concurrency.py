@@ -0,0 +1,79 @@
+"""
+Benchmark: email ingestion throughput vs. number of parallel IMAP connections,
+against the local fake IMAP server with a simulated network round-trip.
+
+Run from the repository root:
+    python benchmarks/bench_email_concurrency.py [messages_per_folder] [latency_ms]
+"""
+import imaplib
+import multiprocessing
+import sys
+import threading
+import time
+
+import _common  # noqa: F401  (puts the repository root on sys.path)
+from bench_email_fetch import make_message
+from taskcore.email_fetch import IMAPPool, fetch_folders, search_folders, unique_messages
+from fake_imap import FakeIMAPServer
+
+FOLDERS = ["INBOX", "Work", "[Gmail]/Important"]
+CONNECTIONS = [1, 2, 4, 8]
+BATCH_SIZE = 50
+
+
+def serve(per_folder, latency, ready):
+    """Run the fake server in its own process, so it does not share the GIL with the client."""
+    server = FakeIMAPServer(latency=latency)
+    for index, folder in enumerate(FOLDERS):
+        for i in range(per_folder):
+            # "[Gmail]/Important" repeats INBOX messages, like a Gmail label
+            number = i if folder == "[Gmail]/Important" and i % 2 else index * per_folder + i
+            server.add_message(folder, make_message(number))
+    server.start()
+    ready.put(server.port)
+    threading.Event().wait()
+
+
+def ingest(port, connections):
+    def connect():
+        connection = imaplib.IMAP4("127.0.0.1", port)
+        connection.login("bench", "bench")
+        return connection
+
+    def search(connection, folder):
+        pool.select(connection, folder)
+        return connection.uid("SEARCH", None, "ALL")[1][0].split()
+
+    pool = IMAPPool(connect, connections)
+    try:
+        found = search_folders(pool, FOLDERS, search)
+        return [uid for _, uid, _ in unique_messages(fetch_folders(pool, found, batch_size=BATCH_SIZE))]
+    finally:
+        pool.close()
+
+
+def main():
+    per_folder = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20.0) / 1000
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(per_folder, latency, ready), daemon=True)
+    server.start()
+    port = ready.get()
+    try:
+        print(f"{len(FOLDERS)} folders x {per_folder} messages, {latency * 1000:.0f} ms per round-trip, "
+              f"{BATCH_SIZE} messages per FETCH")
+        print(f"{'connections':>11} {'time':>8} {'unique msgs':>12} {'msgs/s':>9}")
+        baseline = None
+        for connections in CONNECTIONS:
+            start = time.perf_counter()
+            uids = ingest(port, connections)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{connections:>11} {elapsed:>7.2f}s {len(uids):>12} {len(uids) / elapsed:>9.0f}"
+                  f"   x{baseline / elapsed:.1f}")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: MIME parsing + task extraction inline vs. on a process pool, over a
+lazily generated stream of multipart HTML messages (memory should stay flat).
+
+Run from the repository root:
+    python benchmarks/bench_email_extract.py [messages] [workers ...]
+"""
+import os
+import resource
+import sys
+import time
+from email.message import EmailMessage
+
+import _common  # noqa: F401  (puts the repository root on sys.path)
+from taskcore.email_extract import cli_task_from_message, extract_in_processes
+
+HTML_PARAGRAPHS = 200
+
+
+def make_message(i):
+    message = EmailMessage()
+    message["Subject"] = f"Weekly report {i}"
+    message["From"] = "boss@example.com"
+    message["Message-ID"] = f"<{i}@example.com>"
+    text = f"Hello,\n\nTask: review report {i}\nDeadline: Friday\nPriority: High\n"
+    message.set_content(text)
+    message.add_alternative("<html><body>" + "<p>Quarterly numbers, see attached.</p>" * HTML_PARAGRAPHS
+                            + f"<p>Task: review report {i}</p></body></html>", subtype="html")
+    return message.as_bytes()
+
+
+def stream(count):
+    template = make_message(0)
+    for i in range(count):
+        # same size and structure as make_message(i), without paying for EmailMessage here
+        yield i, template.replace(b"report 0", b"report %d" % i).replace(b"<0@", b"<%d@" % i)
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    workers_list = [int(w) for w in sys.argv[2:]] or [0, 2, os.cpu_count() or 1]
+    print(f"{count} multipart messages of {len(make_message(0)) // 1024} KB, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'time':>8} {'msgs/s':>9} {'tasks':>7} {'peak RSS':>10}")
+    for workers in workers_list:
+        start = time.perf_counter()
+        found = sum(1 for _, task in extract_in_processes(stream(count), cli_task_from_message, workers) if task)
+        elapsed = time.perf_counter() - start
+        label = "inline" if workers == 0 else str(workers)
+        print(f"{label:>8} {elapsed:>7.2f}s {count / elapsed:>9.0f} {found:>7} {peak_rss_mb():>8.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: one RFC822 FETCH per message vs. batched header + partial-body FETCH,
+against the local fake IMAP server with a simulated network round-trip.
+
+Run from the repository root:
+    python benchmarks/bench_email_fetch.py [messages] [latency_ms]
+"""
+import imaplib
+import sys
+import time
+from email.message import EmailMessage
+
+import _common  # noqa: F401  (puts the repository root on sys.path)
+from taskcore.email_fetch import fetch_messages
+from fake_imap import FakeIMAPServer
+
+ATTACHMENT_BYTES = 200_000
+
+
+def make_message(i):
+    message = EmailMessage()
+    message["Subject"] = f"Report {i}"
+    message["From"] = "boss@example.com"
+    message["Message-ID"] = f"<{i}@example.com>"
+    message.set_content(f"Task: review report {i}\nPriority: High\nDeadline: Friday\n")
+    if i % 4 == 0:  # every 4th mail carries an attachment
+        message.add_attachment(bytes(ATTACHMENT_BYTES), maintype="application", subtype="pdf",
+                               filename=f"report-{i}.pdf")
+    return message.as_bytes()
+
+
+def one_by_one(connection, ids):
+    for msg_id in ids:
+        connection.fetch(msg_id, "(RFC822)")
+
+
+def batched(connection, ids):
+    for _ in fetch_messages(connection, ids):
+        pass
+
+
+def run(server, strategy):
+    connection = imaplib.IMAP4(server.host, server.port)
+    connection.login("bench", "bench")
+    connection.select("INBOX")
+    _, data = connection.search(None, "ALL")
+    ids = data[0].split()
+    server.reset_counters()
+    start = time.perf_counter()
+    strategy(connection, ids)
+    elapsed = time.perf_counter() - start
+    fetches = server.commands["FETCH"]
+    sent = server.bytes_sent
+    connection.logout()
+    return elapsed, fetches, sent
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    with FakeIMAPServer(latency=latency) as server:
+        for i in range(count):
+            server.add_message("INBOX", make_message(i))
+        print(f"{count} messages, {latency * 1000:.0f} ms per round-trip, "
+              f"{ATTACHMENT_BYTES // 1000} KB attachment on every 4th message")
+        print(f"{'strategy':>22} {'time':>9} {'FETCH cmds':>11} {'bytes sent':>12} {'msgs/s':>9}")
+        for name, strategy in (("RFC822 one by one", one_by_one), ("batched PEEK + partial", batched)):
+            elapsed, fetches, sent = run(server, strategy)
+            print(f"{name:>22} {elapsed:>8.2f}s {fetches:>11} {sent / 1e6:>10.2f}MB {count / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
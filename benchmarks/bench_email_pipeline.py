@@ -0,0 +1,174 @@
+"""
+Benchmark: the email import pipelines end to end, against the local fake IMAP
+server seeded with generated mail (multipart/HTML mixes, attachments, charsets and
+transfer encodings), reporting messages/s, bytes sent by the server, IMAP commands
+and the time spent in each pipeline stage.
+
+- CLI  : TaskManager.import_email_tasks, first a full import, then a repeat
+         incremental import of the unchanged mailbox
+- GUI  : EmailTaskExtractor.extract_tasks_from_emails with the desktop UI's rules
+         (header triage, keyword match); both run taskcore.email_import's pipeline
+
+Stage times are measured on the calling thread and are exclusive: while extraction
+pulls the next fetched message, the wait counts as "fetch", not "extract".
+"other" is the rest (header triage, Message-ID checks, loop overhead).
+
+Run from the repository root:
+    python benchmarks/bench_email_pipeline.py [messages_per_folder] [latency_ms] [connections] [workers]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import _common
+import main
+from taskcore import email_extract, email_import
+from taskcore.email_sync import EmailSyncState
+from fake_imap import FakeIMAPServer
+
+FOLDERS = ["INBOX", "Work"]
+PROFILE = {"days": 20, "task_ratio": 0.4, "html_ratio": 0.5, "attachment_ratio": 0.2,
+           "attachment_sizes": (20_000, 200_000, 1_000_000)}
+STAGES = ["connect", "search", "fetch headers", "fetch", "extract", "commit", "other"]
+
+
+class StageTimer:
+    """Exclusive wall time per stage for nested calls / generators on the main thread."""
+
+    def __init__(self):
+        self.totals = Counter()
+        self._stack = []
+
+    def enter(self, stage):
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.totals[parent[0]] += now - parent[1]
+        self._stack.append([stage, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        stage, start = self._stack.pop()
+        self.totals[stage] += now - start
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def call(self, stage, function):
+        def timed(*args, **kwargs):
+            if threading.current_thread() is not threading.main_thread():
+                return function(*args, **kwargs)  # pool threads overlap the main thread's stages
+            self.enter(stage)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.exit()
+        return timed
+
+    def iterate(self, stage, iterable):
+        iterator = iter(iterable)
+        try:
+            while True:
+                self.enter(stage)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.exit()
+                yield item
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    def generator(self, stage, function, stage_for=None):
+        def timed(*args, **kwargs):
+            return self.iterate(stage_for(kwargs) if stage_for else stage, function(*args, **kwargs))
+        return timed
+
+
+@contextlib.contextmanager
+def patched(patches):
+    saved = [(owner, name, getattr(owner, name)) for owner, name, _ in patches]
+    for owner, name, value in patches:
+        setattr(owner, name, value)
+    try:
+        yield
+    finally:
+        for owner, name, value in saved:
+            setattr(owner, name, value)
+
+
+def instrument(timer):
+    fetch_stage = (lambda kwargs: "fetch headers" if kwargs.get("body_bytes") == 0 else "fetch")
+    extractor = email_import.EmailTaskExtractor
+    return patched([
+        (email_import, "search_folders", timer.call("search", email_import.search_folders)),
+        (email_import, "fetch_folders", timer.generator("fetch", email_import.fetch_folders, fetch_stage)),
+        (email_extract, "extract_in_processes", timer.generator("extract", email_extract.extract_in_processes)),
+        (extractor, "connect_to_email", timer.call("connect", extractor.connect_to_email)),
+        (main.TaskManager, "_commit_email_tasks", timer.call("commit", main.TaskManager._commit_email_tasks)),
+    ])
+
+
+def measure(server, run):
+    timer = StageTimer()
+    server.reset_counters()
+    with instrument(timer), contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        found = run()
+        elapsed = time.perf_counter() - start
+    timer.totals["other"] = max(0.0, elapsed - sum(timer.totals.values()))
+    return elapsed, len(found), server.bytes_sent, sum(server.commands.values()), timer.totals
+
+
+def report(name, messages, result):
+    elapsed, tasks, sent, commands, stages = result
+    print(f"{name:<22} {elapsed:>7.2f}s {messages / elapsed:>8.0f} {tasks:>6} {sent / 1e6:>8.1f}MB {commands:>5}   "
+          + "  ".join(f"{stage} {stages[stage]:.2f}s" for stage in STAGES if stages.get(stage)))
+
+
+def main_():
+    per_folder = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    connections = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    messages = per_folder * len(FOLDERS)
+
+    with FakeIMAPServer(latency=latency) as server:
+        for index, folder in enumerate(FOLDERS):
+            server.seed(folder, per_folder, seed=index, start=index * per_folder, **PROFILE)
+        stored = sum(len(raw) for mailbox in server.mailboxes.values() for _, raw, _ in mailbox.messages)
+        print(f"{len(FOLDERS)} folders x {per_folder} generated messages ({stored / 1e6:.0f} MB stored), "
+              f"{latency * 1000:.0f} ms per round-trip, {connections} connections, "
+              f"workers={'CPU count' if workers is None else workers}")
+        print(f"{'pipeline':<22} {'time':>8} {'msgs/s':>8} {'tasks':>6} {'sent':>10} {'cmds':>5}   stages")
+
+        tm = _common.make_manager(config={"imap_server": server.endpoint})
+        sync_state = EmailSyncState(os.path.join(tempfile.mkdtemp(prefix="taskmanager-bench-"), "sync.json"))
+
+        def cli_import():
+            return tm.import_email_tasks(days_back=30, sync_state=sync_state, folders=FOLDERS,
+                                         connections=connections, workers=workers)
+        report("CLI import", messages, measure(server, cli_import))
+        report("CLI import (repeat)", messages, measure(server, cli_import))
+
+        def gui_extract(server_filter):
+            extractor = email_import.EmailTaskExtractor()
+            try:
+                extractor.connect_to_email("bench", "bench", server.endpoint)
+                return extractor.extract_tasks_from_emails(days_back=30, server_filter=server_filter,
+                                                           folders=FOLDERS, connections=connections,
+                                                           workers=workers)
+            finally:
+                extractor.disconnect()
+        report("GUI extract", messages, measure(server, lambda: gui_extract(True)))
+        report("GUI extract (no filter)", messages, measure(server, lambda: gui_extract(False)))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,98 @@
+"""
+Benchmark: task extraction rules, the original per-message re.search / any() scans
+vs. the precompiled single-pass email_extract.ExtractionEngine, on synthetic bodies
+(outputs are checked to be identical first).
+
+Run from the repository root:
+    python benchmarks/bench_extraction_engine.py [messages] [body lines]
+"""
+import random
+import re
+import sys
+import time
+
+import _common  # noqa: F401  (puts the repository root on sys.path)
+from taskcore.email_extract import DEFAULT_ENGINE
+
+FILLER = ["Thanks for the update on the project.", "Please see the notes from the meeting below.",
+          "The numbers for last quarter are attached.", "Let me know if you have any questions.",
+          "We can discuss this on our next call.", "Regards, the operations team"]
+LABELS = ["Task: prepare the {} report", "TODO: send the {} summary", "Action item: review {} budget",
+          "Deadline: Friday {}", "Priority: {}"]
+
+
+def make_body(rng, lines):
+    body = [rng.choice(FILLER) for _ in range(lines)]
+    for label in rng.sample(LABELS, rng.randint(0, len(LABELS))):
+        value = rng.choice(["High", "Medium", "Low", "urgent"]) if label.startswith("Priority") else rng.randint(1, 99)
+        body.insert(rng.randrange(len(body) + 1), label.format(value))
+    return "\n".join(body)
+
+
+def original_extract_task_info(content, subject):
+    """TaskManager.extract_task_info before the engine (patterns recompiled per call)"""
+    task_patterns = [r"Task:\s*(.*?)(?=\n|$)", r"TODO:\s*(.*?)(?=\n|$)", r"Action item:\s*(.*?)(?=\n|$)"]
+    task_desc = None
+    for pattern in task_patterns:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            task_desc = match.group(1).strip()
+            break
+    if not task_desc:
+        task_desc = subject
+    if task_desc:
+        deadline_match = re.search(r"Deadline:\s*(.*?)(?=\n|$)", content, re.IGNORECASE)
+        deadline = deadline_match.group(1).strip() if deadline_match else None
+        priority_match = re.search(r"Priority:\s*(.*?)(?=\n|$)", content, re.IGNORECASE)
+        priority = priority_match.group(1).strip() if priority_match else "Normal"
+        priority_map = {'HIGH': 5, 'MEDIUM': 3, 'NORMAL': 2, 'LOW': 1}
+        return {'description': task_desc, 'deadline': deadline, 'priority': priority_map.get(str(priority).upper(), 2)}
+
+
+def original_determine_priority(text):
+    """EmailTaskExtractor.determine_priority before the engine"""
+    urgent_words = ['urgent', 'asap', 'immediate', 'critical', 'deadline']
+    high_words = ['important', 'priority', 'soon', 'action required']
+    text_lower = text.lower()
+    if any(word in text_lower for word in urgent_words):
+        return 5
+    elif any(word in text_lower for word in high_words):
+        return 3
+    return 2
+
+
+def engine_extract_task_info(content, subject):
+    task = DEFAULT_ENGINE.extract_task_info(content, subject)
+    del task['created_date']
+    return task
+
+
+def timed(function, bodies):
+    start = time.perf_counter()
+    for body in bodies:
+        function(body)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(42)
+    bodies = [make_body(rng, lines) for _ in range(count)]
+
+    for body in bodies:
+        assert original_extract_task_info(body, "subject") == engine_extract_task_info(body, "subject")
+        assert original_determine_priority(body) == DEFAULT_ENGINE.determine_priority(body)
+
+    print(f"{count} bodies of {lines} lines (~{sum(map(len, bodies)) // count} chars), outputs identical")
+    print(f"{'rule':<22} {'original':>10} {'engine':>10} {'speed-up':>9}")
+    for name, original, engine in (
+            ("extract_task_info", lambda body: original_extract_task_info(body, "subject"),
+             lambda body: DEFAULT_ENGINE.extract_task_info(body, "subject")),
+            ("determine_priority", original_determine_priority, DEFAULT_ENGINE.determine_priority)):
+        before, after = timed(original, bodies), timed(engine, bodies)
+        print(f"{name:<22} {count / before:>8.0f}/s {count / after:>8.0f}/s {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: cold start from a binary MmapSnapshot, directly and through a
+JournalStore, and RSS growth as tasks are touched.
+
+Run from the repository root:
+    python benchmarks/bench_mmap_snapshot.py [n]
+"""
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from _common import make_manager
+from taskcore.storage import JournalStore, MmapSnapshot
+
+SIZES = [10_000, 1_000_000]
+TOUCHED = 10_000
+
+
+def rss_mb():
+    """
+    (anonymous, file-backed) resident memory in MB, Linux only (None elsewhere).
+    Anonymous memory is the materialized Task objects; file-backed is mapped
+    snapshot pages, which the OS can drop again under memory pressure.
+    """
+    try:
+        with open("/proc/self/status") as file:
+            fields = dict(line.split(":", 1) for line in file)
+        return int(fields["RssAnon"].split()[0]) / 1024, int(fields["RssFile"].split()[0]) / 1024
+    except (OSError, KeyError):
+        return None
+
+
+def rows(n):
+    now = time.time()
+    for i in range(n):
+        yield (str(i), f"task {i} review report", i % 5 + 1, i % 3 == 0, now - i)
+
+
+def write_snapshot(path, n):
+    MmapSnapshot.write(path, rows(n))
+
+
+def cold_start(path, n):
+
+    before = rss_mb()
+    start = time.perf_counter()
+    tm = make_manager(snapshot=path)
+    opened = time.perf_counter() - start
+    assert len(tm.tasks) == n
+
+    ids = random.Random(0).sample(range(n), min(TOUCHED, n))
+    start = time.perf_counter()
+    for i in ids:
+        tm.get_task(str(i))
+    touched = time.perf_counter() - start
+    after = rss_mb()
+
+    start = time.perf_counter()
+    tm.get_next_task()
+    first_query = time.perf_counter() - start
+    tm.close()
+    growth = None if before is None else (after[0] - before[0], after[1] - before[1])
+    return opened, touched, growth, first_query
+
+
+def store_open(n, directory):
+    store_dir = os.path.join(directory, f"journal-{n}")
+    store = JournalStore(store_dir, fsync=False)
+    store.write_snapshot(rows(n))
+    store.close()
+    start = time.perf_counter()
+    tm = make_manager(storage=JournalStore(store_dir))
+    elapsed = time.perf_counter() - start
+    assert len(tm.tasks) == n
+    tm.close()
+    return elapsed
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else SIZES
+    directory = tempfile.mkdtemp(prefix="taskmanager-mmap-")
+    try:
+        print(f"{'tasks':>10} {'mmap open':>10} {f'touch {TOUCHED}':>12} {'RSS anon/file':>16} "
+              f"{'1st query':>10} {'store open':>12}")
+        for n in sizes:
+            # write and open in separate fresh processes, so no freed memory hides RSS growth
+            path = os.path.join(directory, f"tasks-{n}.snap")
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                pool.apply(write_snapshot, (path, n))
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                opened, touched, growth, first_query = pool.apply(cold_start, (path, n))
+            reopened = store_open(n, directory)
+            growth_text = "n/a" if growth is None else f"+{growth[0]:.1f}/+{growth[1]:.1f} MB"
+            print(f"{n:>10} {opened * 1000:>8.2f}ms {touched * 1000:>10.1f}ms {growth_text:>16} "
+                  f"{first_query:>9.2f}s {reopened * 1000:>10.2f}ms")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
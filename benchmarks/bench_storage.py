@@ -0,0 +1,70 @@
+"""
+Benchmark: JournalStore write throughput per fsync batch size, and reload time.
+
+Run from the repository root:
+    python benchmarks/bench_storage.py [n]
+"""
+import io
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from _common import make_manager
+from taskcore.storage import JournalStore
+
+BATCH_SIZES = [1, 64, 1024]
+WRITES = 2_000
+
+
+def fresh_dir():
+    return tempfile.mkdtemp(prefix="taskmanager-store-")
+
+
+def write_throughput(batch_size):
+    directory = fresh_dir()
+    tm = make_manager(storage=JournalStore(directory, batch_size=batch_size, flush_interval=60))
+    start = time.perf_counter()
+    for i in range(WRITES):
+        tm.add_task(str(i), f"task {i}", i % 5 + 1)
+    tm.close()
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(directory)
+    return WRITES / elapsed
+
+
+def reload_time(n, snapshot):
+    directory = fresh_dir()
+    tm = make_manager(storage=JournalStore(directory, fsync=False, snapshot_every=n * 10))
+    with redirect_stdout(io.StringIO()):
+        for i in range(n):
+            tm.add_task(str(i), f"task {i} review report", i % 5 + 1)
+            if i % 3 == 0:
+                tm.complete_task(str(i))
+    if snapshot:
+        tm.checkpoint()
+    tm.close()
+    del tm
+
+    start = time.perf_counter()
+    reloaded = make_manager(storage=JournalStore(directory))
+    elapsed = time.perf_counter() - start
+    assert len(reloaded.tasks) == n
+    reloaded.close()
+    shutil.rmtree(directory)
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Write throughput with fsync, {WRITES} adds:")
+    for batch_size in BATCH_SIZES:
+        print(f"  batch_size={batch_size:>5}: {write_throughput(batch_size):>10.0f} writes/s")
+    print(f"\nReload of {n} tasks:")
+    print(f"  from snapshot      : {reload_time(n, snapshot=True):.2f} s")
+    print(f"  from journal only  : {reload_time(n, snapshot=False):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
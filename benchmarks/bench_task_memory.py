@@ -0,0 +1,59 @@
+"""
+Benchmark: bytes per task for Task vs CompactTask, alone and inside a TaskManager.
+
+Run from the repository root:
+    python benchmarks/bench_task_memory.py [n]
+"""
+import gc
+import sys
+import tracemalloc
+
+from _common import make_manager
+from taskcore import CompactTask, Task
+
+TITLES = ["Finish data structures assignment", "Reply to client email", "Review pull request",
+          "Prepare sprint demo", "Pay invoice"]
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return used, kept
+
+
+def objects_only(task_class, n):
+    # Fresh title strings with repeated contents, as an email import would produce
+    return [task_class(str(i), "".join(TITLES[i % len(TITLES)]), i % 5 + 1) for i in range(n)]
+
+
+def full_manager(compact, title_index, n):
+    tm = make_manager(compact=compact, title_index=title_index)
+    for i in range(n):
+        tm.add_task(str(i), "".join(TITLES[i % len(TITLES)]), i % 5 + 1)
+    return tm
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = [
+        ("Task objects", lambda: objects_only(Task, n)),
+        ("CompactTask objects", lambda: objects_only(CompactTask, n)),
+        ("TaskManager, no title index", lambda: full_manager(False, False, n)),
+        ("TaskManager(compact), no title index", lambda: full_manager(True, False, n)),
+        ("TaskManager, all indexes", lambda: full_manager(False, True, n)),
+        ("TaskManager(compact), all indexes", lambda: full_manager(True, True, n)),
+    ]
+    print(f"n={n}")
+    print(f"{'layout':>38} {'bytes/task':>11}")
+    for label, build in rows:
+        used, kept = measure(build)
+        print(f"{label:>38} {used / n:>11.0f}")
+        del kept
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: trigram title index vs the original lower()-and-scan linear_search.
+
+Run from the repository root (sizes are optional, default 10k 100k 1M):
+    python benchmarks/bench_title_search.py 10000 100000
+"""
+import io
+import random
+import sys
+import time
+import timeit
+from contextlib import redirect_stdout
+
+from _common import make_manager
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+WORDS = ("review report meeting invoice deploy fix bug write docs call client "
+         "update budget plan sprint design test release email backup migrate").split()
+QUERIES = ["invoice", "deploy fix", "budget plan sprint", "xyz-not-there", "re"]
+PREFIXES = ["review rep", "mig"]
+REPEAT = 5
+
+
+def make_title(rng, i):
+    return f"{' '.join(rng.choice(WORDS) for _ in range(4))} #{i}"
+
+
+def build(n, title_index):
+    rng = random.Random(7)
+    tm = make_manager(title_index=title_index)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for i in range(n):
+            tm.add_task(str(i), make_title(rng, i), rng.randint(1, 5))
+    return tm, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for n in sizes:
+        scan_tm, scan_build = build(n, title_index=False)
+        index_tm, index_build = build(n, title_index=True)
+        print(f"\nn={n}: build {scan_build:.2f}s without index, {index_build:.2f}s with index")
+        print(f"{'query':>22} {'hits':>8} {'scan ms':>10} {'index ms':>10} {'speedup':>9}")
+        for query in QUERIES:
+            hits = len(index_tm.linear_search(query))
+            scan = timeit.timeit(lambda tm=scan_tm: tm.linear_search(query), number=REPEAT) / REPEAT
+            indexed = timeit.timeit(lambda tm=index_tm: tm.linear_search(query), number=REPEAT) / REPEAT
+            print(f"{query!r:>22} {hits:>8} {scan * 1000:>10.2f} {indexed * 1000:>10.2f} {scan / indexed:>8.1f}x")
+        for prefix in PREFIXES:
+            hits = len(index_tm.prefix_search(prefix))
+            scan = timeit.timeit(lambda tm=scan_tm: tm.prefix_search(prefix), number=REPEAT) / REPEAT
+            indexed = timeit.timeit(lambda tm=index_tm: tm.prefix_search(prefix), number=REPEAT) / REPEAT
+            label = f"prefix {prefix!r}"
+            print(f"{label:>22} {hits:>8} {scan * 1000:>10.2f} {indexed * 1000:>10.2f} {scan / indexed:>8.1f}x")
+        del scan_tm, index_tm
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: top_k() on the indexed priority queue vs the old copy-and-heapify peek.
+
+Run from the repository root:
+    python benchmarks/bench_top_k.py
+"""
+import heapq
+import random
+import timeit
+
+from _common import make_manager
+
+SIZES = [1_000, 10_000, 100_000, 200_000]
+KS = [1, 3, 50, 500]
+REPEAT = 20
+
+
+def legacy_top_k(priority_queue, tasks, k):
+    """The old get_top_3_tasks approach: copy the whole heap, heapify, pop."""
+    temp_heap = priority_queue.copy()
+    heapq.heapify(temp_heap)
+    found = []
+    while temp_heap and len(found) < k:
+        _, task_id = heapq.heappop(temp_heap)
+        task = tasks.get(task_id)
+        if task is not None and not task.completed:
+            found.append(task)
+    return found
+
+
+def main():
+    random.seed(42)
+    print(f"{'n':>8} {'k':>5} {'legacy ms':>11} {'top_k ms':>10} {'speedup':>9}")
+    for n in SIZES:
+        tm = make_manager()
+        legacy_heap = []
+        for i in range(n):
+            priority = random.randint(1, 5)
+            tm.add_task(str(i), f"task {i}", priority)
+            legacy_heap.append((-priority, str(i)))
+
+        for k in KS:
+            legacy = timeit.timeit(lambda: legacy_top_k(legacy_heap, tm.tasks, k), number=REPEAT) / REPEAT
+            new = timeit.timeit(lambda: list(tm.top_k(k)), number=REPEAT) / REPEAT
+            print(f"{n:>8} {k:>5} {legacy * 1000:>11.3f} {new * 1000:>10.3f} {legacy / new:>8.1f}x")
+
+    # A filtered query only pays for what it walks past
+    n = SIZES[-1]
+    wanted = lambda task: task.title.endswith("7")
+    filtered = timeit.timeit(lambda: list(tm.top_k(50, filter=wanted)), number=REPEAT) / REPEAT
+    print(f"\ntop_k(50, filter=title ends with '7') at n={n}: {filtered * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: building styled rows, per-widget stylesheets and fonts vs the dialog's
+IMPORT_DIALOG_STYLESHEET / RenderCache, plus the cached date label of painted task rows.
+
+- rows   : the email import dialog's task rows (frame, checkbox, info label), built
+           and shown until Qt has polished them; "before" is the previous code, one
+           setStyleSheet and one QFont per row. Each dialog is deleted before the
+           next one is built, and the best of REPEAT rounds is reported
+- dates  : strftime per painted row vs the cached date_label
+
+Needs PyQt5; runs on the offscreen platform, so no display is required.
+
+Run from the repository root:
+    python benchmarks/bench_ui_rows.py [rows]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import _common  # noqa: F401  (puts the repository root on sys.path)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPEAT = 3
+
+OLD_DIALOG_STYLESHEET = """
+    QDialog { background-color: #f8f9fa; }
+    QPushButton {
+        padding: 8px 16px;
+        border-radius: 6px;
+        font-weight: bold;
+        background-color: #4a90e2;
+        color: white;
+        border: none;
+    }
+    QPushButton:hover { background-color: #357abd; }
+"""
+
+
+def old_rows(ui, dialog, tasks):
+    """The row construction before the shared stylesheet (one sheet and font per row)"""
+    for task_id, task_data in enumerate(tasks, 1):
+        frame = ui.QFrame()
+        frame.setFrameStyle(ui.QFrame.Box)
+        frame.setStyleSheet("QFrame { border: 1px solid #ddd; border-radius: 5px; margin: 2px; padding: 5px; }")
+        frame_layout = ui.QVBoxLayout()
+        checkbox = ui.QCheckBox(f"Task #{task_id}: {task_data['title']}")
+        checkbox.setChecked(True)
+        checkbox.setFont(ui.QFont("Arial", 10, ui.QFont.Bold))
+        info_label = ui.QLabel(f"Priority: {task_data['priority']} | Source: {task_data['source']}")
+        info_label.setStyleSheet("color: #666; font-size: 9px;")
+        frame_layout.addWidget(checkbox)
+        frame_layout.addWidget(info_label)
+        frame.setLayout(frame_layout)
+        dialog.task_layout.insertWidget(dialog.task_layout.count() - 1, frame)
+
+
+def time_rows(app, build):
+    from PyQt5.QtCore import QEvent
+
+    start = time.perf_counter()
+    dialog = build()
+    dialog.show()
+    app.processEvents()  # layout + style polish of every new row
+    elapsed = time.perf_counter() - start
+    dialog.close()
+    dialog.deleteLater()
+    # processEvents() leaves deferred deletes queued; a dialog left alive would be
+    # polished again by the next case and skew it
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    return elapsed
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    try:
+        import TaskMangerUI as ui
+    except ImportError as error:
+        print(f"skipped ({error})")
+        return
+
+    app = ui.QApplication.instance() or ui.QApplication(sys.argv)
+    tasks = [{'title': f"Follow up on invoice {i}", 'priority': i % 5 + 1, 'source': f"Email from user{i}@example.com"}
+             for i in range(rows)]
+
+    def before():
+        dialog = ui.EmailImportDialog()
+        dialog.setObjectName("")
+        dialog.setStyleSheet(OLD_DIALOG_STYLESHEET)  # replaces IMPORT_DIALOG_STYLESHEET
+        old_rows(ui, dialog, tasks)
+        return dialog
+
+    def after():
+        dialog = ui.EmailImportDialog()
+        dialog.add_tasks(tasks)
+        return dialog
+
+    print(f"{rows} import dialog rows")
+    old = new = float("inf")
+    for _ in range(REPEAT):
+        old = min(old, time_rows(app, before))
+        new = min(new, time_rows(app, after))
+    print(f"{'before (sheet + font per row)':<34} {old * 1000:>8.1f} ms {old / rows * 1e6:>8.0f} us/row")
+    print(f"{'after (dialog stylesheet, shared)':<34} {new * 1000:>8.1f} ms {new / rows * 1e6:>8.0f} us/row"
+          f"   {old / new:.1f}x")
+
+    # painted rows: the same few dozen tasks are repainted on every scroll / hover
+    now = datetime.now()
+    stamps = [now - timedelta(minutes=i) for i in range(50)] * 2000
+    start = time.perf_counter()
+    for stamp in stamps:
+        stamp.strftime(ui.DATE_LABEL_FORMAT)
+    formatted = time.perf_counter() - start
+    start = time.perf_counter()
+    for stamp in stamps:
+        ui.date_label(stamp)
+    cached = time.perf_counter() - start
+    print(f"{len(stamps)} row date labels: strftime {formatted * 1000:.1f} ms, cached {cached * 1000:.1f} ms"
+          f"   {formatted / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
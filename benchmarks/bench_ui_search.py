@@ -0,0 +1,74 @@
+"""
+Benchmark: search-as-you-type, one title search per keystroke vs IncrementalSearch
+(narrowing the previous matches while the query only grows).
+
+This is the matching work the desktop UI does per search; the UI also debounces
+keystrokes (TaskManagerUI.SEARCH_DELAY_MS) and runs searches over more than
+BACKGROUND_SEARCH_TASKS tasks on a worker thread.
+
+Run from the repository root (sizes are optional, default 10k 100k):
+    python benchmarks/bench_ui_search.py 10000 100000
+"""
+import random
+import sys
+import time
+
+import _common  # noqa: F401  (puts the repository root on sys.path)
+from taskcore.indexes import IncrementalSearch, TitleIndex
+
+DEFAULT_SIZES = [10_000, 100_000]
+WORDS = ("review report meeting invoice deploy fix bug write docs call client "
+         "update budget plan sprint design test release email backup migrate").split()
+TYPED = ["review report", "deploy fix", "budget"]
+FRAME_MS = 16
+
+
+class BenchTask:
+    __slots__ = ("task_id", "title")
+
+    def __init__(self, task_id, title):
+        self.task_id = task_id
+        self.title = title
+
+
+def build(n):
+    rng = random.Random(7)
+    index = TitleIndex()
+    for i in range(n):
+        index.add(BenchTask(str(i), f"{' '.join(rng.choice(WORDS) for _ in range(4))} #{i}"))
+    return index
+
+
+def type_query(text, search):
+    """Time every prefix of text as it is typed; return [(query, hits, ms)]"""
+    rows = []
+    for end in range(1, len(text) + 1):
+        query = text[:end]
+        start = time.perf_counter()
+        hits = len(search(query))
+        rows.append((query, hits, (time.perf_counter() - start) * 1000))
+    return rows
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for n in sizes:
+        index = build(n)
+        index.search("warm")  # build the trigram postings outside the timings
+        print(f"\nn={n}")
+        print(f"{'query':>16} {'hits':>8} {'full ms':>9} {'incremental ms':>15}")
+        for text in TYPED:
+            incremental = IncrementalSearch(index)
+            full_rows = type_query(text, index.search)
+            incremental_rows = type_query(text, incremental.search)
+            for (query, hits, full), (_, _, narrowed) in zip(full_rows, incremental_rows):
+                print(f"{query!r:>16} {hits:>8} {full:>9.2f} {narrowed:>15.2f}")
+            full_total = sum(row[2] for row in full_rows)
+            narrowed_total = sum(row[2] for row in incremental_rows)
+            over = sum(row[2] > FRAME_MS for row in incremental_rows)
+            print(f"{'typed ' + repr(text):>25}: {full_total:.1f} ms full, {narrowed_total:.1f} ms incremental, "
+                  f"{over} keystrokes over {FRAME_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
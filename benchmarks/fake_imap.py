@@ -0,0 +1,455 @@
+"""
+Minimal in-process IMAP4rev1 server for benchmarks and manual testing.
+
+Speaks the subset the email import code uses, over plain TCP on localhost:
+CAPABILITY, LOGIN, SELECT/EXAMINE, STATUS, SEARCH, FETCH (RFC822, UID,
+RFC822.SIZE, FLAGS, BODY[...] / BODY.PEEK[...] sections with partial ranges),
+the UID variants of SEARCH/FETCH, CLOSE, NOOP and LOGOUT. Any login is accepted.
+
+- latency: seconds slept before answering each command, to model a network round-trip
+- commands / bytes_sent: counters for the benchmarks
+- seed(folder, count, ...): fill a folder with generated mail (see generate_messages)
+- endpoint: "imap://127.0.0.1:<port>", usable as the importers' imap_server setting
+
+    with FakeIMAPServer(latency=0.02) as server:
+        server.add_message("INBOX", raw_bytes)
+        server.seed("Work", 1000, attachment_ratio=0.5)
+        connection = imaplib.IMAP4("127.0.0.1", server.port)
+"""
+import email.utils
+import random
+import re
+import socketserver
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.header import Header
+from email.message import EmailMessage
+
+
+class Mailbox:
+    def __init__(self, uidvalidity):
+        self.uidvalidity = uidvalidity
+        self.uidnext = 1
+        self.messages = []  # [(uid, raw bytes, internal datetime)], ascending uid
+
+    def add(self, raw, date=None):
+        if date is None:
+            date = _message_date(raw) or datetime.now(timezone.utc)
+        self.messages.append((self.uidnext, raw, date))
+        self.uidnext += 1
+
+
+class FakeIMAPServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        self.latency = latency
+        self.mailboxes = {}
+        self.commands = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = _TCPServer((host, port), _Handler)
+        self._server.imap = self
+        self._thread = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def endpoint(self):
+        return f"imap://{self.host}:{self.port}"
+
+    def mailbox(self, folder="INBOX"):
+        if folder not in self.mailboxes:
+            self.mailboxes[folder] = Mailbox(uidvalidity=len(self.mailboxes) + 1)
+        return self.mailboxes[folder]
+
+    def add_message(self, folder, raw, date=None):
+        self.mailbox(folder).add(raw, date)
+
+    def seed(self, folder, count, **profile):
+        """Add count generated messages to folder; profile: generate_messages options"""
+        for raw, date in generate_messages(count, **profile):
+            self.add_message(folder, raw, date)
+
+    def reset_counters(self):
+        with self._lock:
+            self.commands.clear()
+            self.bytes_sent = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, command, sent):
+        with self._lock:
+            if command:
+                self.commands[command] += 1
+            self.bytes_sent += sent
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.imap = self.server.imap
+        self.selected = None
+
+    def send(self, data, command=None):
+        self.wfile.write(data)
+        self.imap._count(command, len(data))
+
+    def handle(self):
+        self.send(b"* OK fake IMAP4rev1 ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, _, rest = line.rstrip(b"\r\n").partition(b" ")
+            command, _, args = rest.partition(b" ")
+            command = command.upper().decode()
+            if command == "UID":
+                sub, _, args = args.partition(b" ")
+                command = "UID " + sub.upper().decode()
+            if self.imap.latency:
+                time.sleep(self.imap.latency)
+            try:
+                done = self.dispatch(tag, command, args.decode("utf-8", "replace"))
+            except Exception as error:
+                self.send(tag + b" BAD " + str(error).encode() + b"\r\n", command)
+                continue
+            if done:
+                return
+
+    def dispatch(self, tag, command, args):
+        ok = tag + b" OK " + command.encode() + b" completed\r\n"
+        if command == "CAPABILITY":
+            self.send(b"* CAPABILITY IMAP4rev1\r\n" + ok, command)
+        elif command in ("LOGIN", "NOOP"):
+            self.send(ok, command)
+        elif command in ("SELECT", "EXAMINE"):
+            self.selected = self.imap.mailbox(_unquote(args))
+            box = self.selected
+            self.send(b"* %d EXISTS\r\n* 0 RECENT\r\n* FLAGS (\\Seen)\r\n"
+                      b"* OK [UIDVALIDITY %d] UIDs valid\r\n* OK [UIDNEXT %d] next UID\r\n"
+                      % (len(box.messages), box.uidvalidity, box.uidnext) + ok, command)
+        elif command == "STATUS":
+            folder, _, _ = args.rpartition(" (")
+            box = self.imap.mailbox(_unquote(folder))
+            self.send(b"* STATUS %s (MESSAGES %d UIDNEXT %d UIDVALIDITY %d)\r\n"
+                      % (folder.encode(), len(box.messages), box.uidnext, box.uidvalidity) + ok, command)
+        elif command in ("SEARCH", "UID SEARCH"):
+            self.search(ok, command, args)
+        elif command in ("FETCH", "UID FETCH"):
+            self.fetch(ok, command, args)
+        elif command == "CLOSE":
+            self.selected = None
+            self.send(ok, command)
+        elif command == "LOGOUT":
+            self.send(b"* BYE logging out\r\n" + ok, command)
+            return True
+        else:
+            self.send(tag + b" BAD unknown command\r\n", command)
+
+    def search(self, ok, command, args):
+        messages = self.selected.messages
+        tokens = _tokenize(args)
+        if tokens[:1] == ["CHARSET"]:
+            tokens = tokens[2:]
+        predicate = _all_of(tokens, messages)
+        by_uid = command.startswith("UID")
+        hits = [str(uid if by_uid else seq).encode()
+                for seq, (uid, raw, date) in enumerate(messages, 1) if predicate(seq, uid, raw, date)]
+        self.send(b"* SEARCH" + b"".join(b" " + hit for hit in hits) + b"\r\n" + ok, command)
+
+    def fetch(self, ok, command, args):
+        messages = self.selected.messages
+        message_set, _, items = args.partition(" ")
+        by_uid = command.startswith("UID")
+        items = _fetch_items(items)
+        if by_uid and "UID" not in items:
+            items.insert(0, "UID")
+        if by_uid:
+            numbers = _sequence_set(message_set, messages[-1][0] if messages else 0)
+            targets = [(seq, message) for seq, message in enumerate(messages, 1) if message[0] in numbers]
+        else:
+            numbers = _sequence_set(message_set, len(messages))
+            targets = [(seq, messages[seq - 1]) for seq in sorted(numbers) if seq <= len(messages)]
+        out = []
+        for seq, (uid, raw, date) in targets:
+            parts = []
+            for item in items:
+                if item == "UID":
+                    parts.append(b"UID %d" % uid)
+                elif item == "FLAGS":
+                    parts.append(b"FLAGS ()")
+                elif item == "RFC822.SIZE":
+                    parts.append(b"RFC822.SIZE %d" % len(raw))
+                elif item == "INTERNALDATE":
+                    parts.append(b'INTERNALDATE "%s"' % date.strftime("%d-%b-%Y %H:%M:%S +0000").encode())
+                elif item in ("RFC822", "BODY[]", "BODY.PEEK[]"):
+                    label = b"RFC822" if item == "RFC822" else b"BODY[]"
+                    parts.append(label + b" {%d}\r\n" % len(raw) + raw)
+                else:
+                    label, data = _section(item, raw)
+                    parts.append(label + b" {%d}\r\n" % len(data) + data)
+            out.append(b"* %d FETCH (" % seq + b" ".join(parts) + b")\r\n")
+        self.send(b"".join(out) + ok, command)
+
+
+# ------------------------------------------------------------------------------
+#   PARSING HELPERS
+
+_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\()|(\))|([^\s()"]+)')
+
+
+def _tokenize(text):
+    """Split an IMAP argument string into atoms, quoted strings and nested lists."""
+    stack = [[]]
+    for quoted, open_paren, close_paren, atom in _TOKEN.findall(text):
+        if open_paren:
+            stack.append([])
+        elif close_paren:
+            group = stack.pop()
+            stack[-1].append(group)
+        elif atom:
+            stack[-1].append(atom)
+        else:
+            stack[-1].append(re.sub(r"\\(.)", r"\1", quoted))
+    return stack[0]
+
+
+def _unquote(text):
+    text = text.strip()
+    if text.startswith('"') and text.endswith('"'):
+        return re.sub(r"\\(.)", r"\1", text[1:-1])
+    return text
+
+
+def _sequence_set(text, largest):
+    numbers = set()
+    for part in text.split(","):
+        low, _, high = part.partition(":")
+        low = largest if low == "*" else int(low)
+        high = low if not high else (largest if high == "*" else int(high))
+        if low > high:
+            low, high = high, low
+        numbers.update(range(low, high + 1))
+    return numbers
+
+
+def _all_of(tokens, messages):
+    tokens = list(tokens)
+    predicates = []
+    while tokens:
+        predicates.append(_criterion(tokens, messages))
+    return lambda *message: all(predicate(*message) for predicate in predicates)
+
+
+def _criterion(tokens, messages):
+    token = tokens.pop(0)
+    if isinstance(token, list):
+        return _all_of(token, messages)
+    key = token.upper()
+    if key == "ALL":
+        return lambda seq, uid, raw, date: True
+    if key == "OR":
+        left, right = _criterion(tokens, messages), _criterion(tokens, messages)
+        return lambda *message: left(*message) or right(*message)
+    if key == "NOT":
+        inner = _criterion(tokens, messages)
+        return lambda *message: not inner(*message)
+    if key in ("SINCE", "BEFORE", "ON"):
+        day = datetime.strptime(tokens.pop(0), "%d-%b-%Y").date()
+        compare = {"SINCE": day.__le__, "BEFORE": day.__gt__, "ON": day.__eq__}[key]
+        return lambda seq, uid, raw, date: compare(date.date())
+    if key in ("SUBJECT", "FROM", "TO"):
+        needle = tokens.pop(0).lower().encode()
+        return lambda seq, uid, raw, date: needle in _header_value(raw, key).lower()
+    if key in ("BODY", "TEXT"):
+        needle = tokens.pop(0).lower().encode()
+        return lambda seq, uid, raw, date: needle in raw.lower()
+    if key == "UID":
+        numbers = _sequence_set(tokens.pop(0), messages[-1][0] if messages else 0)
+        return lambda seq, uid, raw, date: uid in numbers
+    if key[0].isdigit() or key[0] == "*":
+        numbers = _sequence_set(key, len(messages))
+        return lambda seq, uid, raw, date: seq in numbers
+    raise ValueError(f"unsupported search key {token}")
+
+
+def _fetch_items(text):
+    """'(UID BODY.PEEK[HEADER.FIELDS (A B)] BODY.PEEK[TEXT]<0.100>)' -> list of item strings"""
+    text = text.strip()
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1]
+    items, depth, current = [], 0, ""
+    for char in text:
+        if char == " " and depth == 0:
+            if current:
+                items.append(current)
+            current = ""
+            continue
+        depth += char in "[("
+        depth -= char in "])"
+        current += char
+    if current:
+        items.append(current)
+    return [item.upper() for item in items]
+
+
+_SECTION = re.compile(r"BODY(?:\.PEEK)?\[([^\]]*)\](?:<(\d+)(?:\.(\d+))?>)?")
+
+
+def _section(item, raw):
+    """Return (response label, data) for a BODY[section]<partial> fetch item."""
+    match = _SECTION.fullmatch(item)
+    if match is None:
+        raise ValueError(f"unsupported fetch item {item}")
+    section, start, length = match.groups()
+    header, body = _split_message(raw)
+    if section == "HEADER":
+        data = header
+    elif section == "TEXT":
+        data = body
+    elif section.startswith("HEADER.FIELDS"):
+        names = set(section[section.index("(") + 1:section.rindex(")")].split())
+        not_fields = section.startswith("HEADER.FIELDS.NOT")
+        data = b"".join(field for name, field in _header_fields(header)
+                        if (name in names) != not_fields) + b"\r\n"
+    else:
+        raise ValueError(f"unsupported section {section}")
+    label = b"BODY[" + section.encode() + b"]"
+    if start is not None:
+        start = int(start)
+        data = data[start:start + int(length)] if length else data[start:]
+        label += b"<%d>" % start
+    return label, data
+
+
+def _split_message(raw):
+    for separator in (b"\r\n\r\n", b"\n\n"):
+        index = raw.find(separator)
+        if index != -1:
+            return raw[:index + len(separator)], raw[index + len(separator):]
+    return raw, b""
+
+
+def _header_fields(header):
+    """Yield (NAME, raw field bytes incl. continuation lines) for each header field."""
+    fields = []
+    for line in header.splitlines(keepends=True):
+        if line in (b"\r\n", b"\n"):
+            break
+        if line[:1] in (b" ", b"\t") and fields:
+            fields[-1][1].append(line)
+        else:
+            fields.append((line.split(b":", 1)[0].strip().upper().decode("ascii", "replace"), [line]))
+    return [(name, b"".join(lines)) for name, lines in fields]
+
+
+def _header_value(raw, name):
+    header, _ = _split_message(raw)
+    for field_name, field in _header_fields(header):
+        if field_name == name:
+            return field.split(b":", 1)[1].strip()
+    return b""
+
+
+def _message_date(raw):
+    value = _header_value(raw, "DATE")
+    try:
+        return email.utils.parsedate_to_datetime(value.decode("ascii", "replace")) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+# ------------------------------------------------------------------------------
+#   GENERATED MAILBOXES
+
+SUBJECTS = ["Action required: {} review", "TODO before Friday: {}", "Reminder: {} sync",
+            "Urgent: {} is blocked", "Follow up on {}"]
+OTHER_SUBJECTS = ["Newsletter: {} weekly", "Lunch on Thursday?", "Photos from the {} offsite", "Re: {} notes"]
+TOPICS = ["budget", "roadmap", "release", "hiring", "invoice", "security audit", "résumé", "café order"]
+FILLER = ["Thanks for the update, see the notes below.", "The numbers for last quarter are attached.",
+          "Let me know if you have any questions.", "We can discuss this on our next call.",
+          "Crème brûlée is back on the menu, naïve as it sounds.", "Regards, the operations team"]
+TRANSFER_ENCODINGS = ("7bit", "quoted-printable", "base64")
+
+
+def generate_messages(count, seed=0, start=0, days=30, task_ratio=0.5, html_ratio=0.5, attachment_ratio=0.2,
+                      attachment_sizes=(20_000, 200_000, 2_000_000), charsets=("utf-8", "iso-8859-1"),
+                      transfer_encodings=TRANSFER_ENCODINGS, body_lines=(3, 60)):
+    """
+    Yield (raw bytes, date) for count varied, reproducible messages (same seed, same mail).
+
+    - task_ratio: share of messages with a task subject and Task: / Deadline: / Priority: lines
+    - html_ratio: share sent as multipart/alternative with an HTML part
+    - attachment_ratio / attachment_sizes: share with one attachment of a size picked from the list
+    - charsets / transfer_encodings: picked per message for the subject (RFC 2047 encoded
+      words when not ASCII) and the text parts; "7bit" messages keep to ASCII text
+    - body_lines: (min, max) filler lines per body
+    - dates are spread over the last `days` days, oldest first; start offsets Message-IDs
+    """
+    rng = random.Random(seed)
+    attachments = {}
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        number = start + i
+        charset = rng.choice(charsets)
+        transfer_encoding = rng.choice(transfer_encodings)
+        ascii_only = transfer_encoding == "7bit"
+        is_task = rng.random() < task_ratio
+        topic = rng.choice(TOPICS)
+        if ascii_only:
+            topic = topic.encode("ascii", "ignore").decode() or "report"
+        subject = rng.choice(SUBJECTS if is_task else OTHER_SUBJECTS).format(topic) + f" #{number}"
+
+        lines = [rng.choice(FILLER) for _ in range(rng.randint(*body_lines))]
+        if ascii_only:
+            lines = [line.encode("ascii", "ignore").decode() for line in lines]
+        if is_task:
+            position = rng.randint(0, len(lines))
+            lines[position:position] = [f"Task: {topic} for item {number}", "Deadline: Friday",
+                                        f"Priority: {rng.choice(['High', 'Medium', 'Low'])}"]
+        text = "\n".join(lines) + "\n"
+
+        message = EmailMessage()
+        message["Subject"] = subject if subject.isascii() else Header(subject, charset).encode()
+        message["From"] = f"sender{rng.randint(1, 50)}@example.com"
+        message["To"] = "me@example.com"
+        message["Message-ID"] = f"<{number}.{seed}@generated.example>"
+        date = now - timedelta(days=days) + timedelta(days=days) * (i + 1) / (count + 1)
+        message["Date"] = email.utils.format_datetime(date)
+        message.set_content(text, charset=charset, cte=transfer_encoding if transfer_encoding != "7bit" else None)
+        if rng.random() < html_ratio:
+            html = "<html><body>" + "".join(f"<p>{line}</p>" for line in lines) + "</body></html>"
+            message.add_alternative(html, subtype="html", charset=charset,
+                                    cte=transfer_encoding if transfer_encoding != "7bit" else None)
+        if rng.random() < attachment_ratio:
+            size = rng.choice(attachment_sizes)
+            if size not in attachments:
+                attachments[size] = rng.randbytes(size)
+            message.add_attachment(attachments[size], maintype="application", subtype="pdf",
+                                   filename=f"attachment-{number}.pdf")
+        yield message.as_bytes(), date
@@ -0,0 +1,16 @@
+"""
+Core of the Task Manager, shared by the CLI (main.py) and the desktop UI (TaskMangerUI.py).
+
+- manager      : Task, CompactTask and TaskManager, the task store with every index
+- indexes      : priority queue, priority buckets, title trigrams, counters, ordered views
+- storage      : durable stores (JournalStore, SQLiteBackend, MmapSnapshot)
+- email_import : EmailTaskExtractor, the one IMAP scan pipeline both front ends import through
+- email_fetch / email_extract / email_sync : its fetching, parsing and incremental-sync stages
+"""
+from .email_import import EmailTaskExtractor
+from .email_sync import EmailSyncState
+from .manager import CompactTask, Task, TaskManager
+from .storage import DATA_DIR, JournalStore, MmapSnapshot, SQLiteBackend, StoreLockedError
+
+__all__ = ["CompactTask", "DATA_DIR", "EmailSyncState", "EmailTaskExtractor", "JournalStore", "MmapSnapshot",
+           "SQLiteBackend", "StoreLockedError", "Task", "TaskManager"]
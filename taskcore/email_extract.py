@@ -0,0 +1,336 @@
+import email
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from email.header import decode_header
+
+# Module-level functions (not methods) so worker processes can run them:
+# raw message bytes go in, a compact task dict (or None) comes back.
+
+CHUNK_SIZE = 64  # messages per job handed to a worker process
+
+# Workers start from a clean process (forkserver, or spawn where there is none)
+# instead of a fork of the caller: the GUI extracts from a QThread, and a fork
+# would copy Qt's and the other threads' locks in whatever state they were in
+POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+# ------------------------------------------------------------------------------
+#   EXTRACTION ENGINE
+
+class ExtractionEngine:
+    """
+    Single-pass task extraction with precompiled rules, configurable by user rules.
+
+    rules: optional dict overriding DEFAULT_RULES (e.g. the "extraction_rules" entry
+    of config.json); the defaults reproduce the original extraction exactly:
+    - task_labels / deadline_labels / priority_labels: "Label: value" lines to pick
+      up; when a field has several labels the earlier label wins, wherever it appears
+    - priority_values: {"HIGH": 5, ...} for the Priority: value, default_priority otherwise
+    - task_keywords: the GUI importer keeps only emails containing one of them
+    - urgent_words / high_words: GUI priority 5 / 3 when present, default_priority otherwise
+
+    Every label ends with ':', so one scan jumps from colon to colon (str.find) and
+    looks the few characters before each colon up in a label table, instead of one
+    case-insensitive regex search over the whole body per label. Keyword rules are
+    lower-cased tuples built once, checked with plain substring tests.
+    Instances pickle, so they can be handed to worker processes.
+    """
+
+    DEFAULT_RULES = {
+        "task_labels": ["Task", "TODO", "Action item"],
+        "deadline_labels": ["Deadline"],
+        "priority_labels": ["Priority"],
+        "priority_values": {"HIGH": 5, "MEDIUM": 3, "NORMAL": 2, "LOW": 1},
+        "default_priority": 2,
+        "task_keywords": ["todo", "task", "deadline", "urgent", "action required", "follow up", "reminder"],
+        "urgent_words": ["urgent", "asap", "immediate", "critical", "deadline"],
+        "high_words": ["important", "priority", "soon", "action required"],
+    }
+    FIELDS = ("task", "deadline", "priority")
+
+    # the value after "Label:", up to the end of its line
+    _VALUE = re.compile(r"\s*(.*?)(?=\n|$)")
+
+    def __init__(self, rules=None):
+        rules = {**self.DEFAULT_RULES, **(rules or {})}
+        self.rules = rules
+
+        # label (lower case) -> (field, rank); rank 0 is the preferred label of its field
+        self._labels = {}
+        for field in self.FIELDS:
+            for rank, label in enumerate(rules[f"{field}_labels"]):
+                if not label or ":" in label:
+                    raise ValueError(f"Invalid {field} label {label!r}: the label is matched before its ':'")
+                self._labels.setdefault(label.lower(), (field, rank))
+        self._label_lengths = sorted({len(label) for label in self._labels}, reverse=True)
+
+        self.priority_values = {name.upper(): value for name, value in rules["priority_values"].items()}
+        self.default_priority = rules["default_priority"]
+        self.task_keywords = tuple(keyword.lower() for keyword in rules["task_keywords"])
+        self.urgent_words = tuple(word.lower() for word in rules["urgent_words"])
+        self.high_words = tuple(word.lower() for word in rules["high_words"])
+
+    def __reduce__(self):
+        return (ExtractionEngine, (self.rules,))
+
+    def extract_fields(self, content):  # Time Complexity O(len(content))
+        """
+        - One scan over content: return {field: value} for task / deadline / priority
+        - Same result as one re.search(label + r":\s*(.*?)(?=\n|$)", IGNORECASE) per label,
+          keeping the best-ranked label found for each field
+        """
+        found = {}
+        labels = self._labels
+        lengths = self._label_lengths
+        find = content.find
+        colon = find(":")
+        while colon != -1:
+            for length in lengths:
+                if length > colon:
+                    continue
+                label = labels.get(content[colon - length:colon].lower())
+                if label is None:
+                    continue
+                field, rank = label
+                if field not in found or rank < found[field][0]:
+                    found[field] = (rank, self._VALUE.match(content, colon + 1).group(1).strip())
+            if len(found) == 3 and not any(rank for rank, _ in found.values()):
+                break  # every field has its preferred label, nothing can replace it
+            colon = find(":", colon + 1)
+        return {field: value for field, (rank, value) in found.items()}
+
+    def extract_task_info(self, content, subject):
+        fields = self.extract_fields(content)
+
+        # If no task label found, use subject
+        task_desc = fields.get("task") or subject
+        if not task_desc:
+            return None
+        return {
+            'description': task_desc,
+            'deadline': fields.get("deadline"),
+            'priority': self.priority_values.get(fields.get("priority", "Normal").upper(), self.default_priority),
+            'created_date': datetime.now().strftime("%Y-%m-%d %H:%M")
+        }
+
+    def has_task_keyword(self, text):
+        text = text.lower()
+        return any(keyword in text for keyword in self.task_keywords)
+
+    def determine_priority(self, text):
+        text = text.lower()
+        if any(word in text for word in self.urgent_words):
+            return 5
+        if any(word in text for word in self.high_words):
+            return 3
+        return self.default_priority
+
+
+# ------------------------------------------------------------------------------
+#   CLI RULES (TaskManager.scan_emails_for_tasks)
+
+def decode_email_subject(subject):
+    if not subject:
+        return ""
+    decoded_parts = decode_header(subject)
+    decoded_subject = ""
+    for part, encoding in decoded_parts:
+        if isinstance(part, bytes):
+            decoded_subject += part.decode(encoding if encoding else 'utf-8', errors='ignore')
+        else:
+            decoded_subject += str(part)
+    return decoded_subject
+
+
+def get_email_content(email_message):
+    content = ""
+    if email_message.is_multipart():
+        for part in email_message.walk():
+            if part.get_content_type() == "text/plain":
+                try:
+                    content += part.get_payload(decode=True).decode('utf-8', errors='ignore')
+                except:
+                    continue
+    else:
+        try:
+            content = email_message.get_payload(decode=True).decode('utf-8', errors='ignore')
+        except:
+            pass
+    return content
+
+
+def extract_task_info(content, subject, engine=None):
+    return (engine or DEFAULT_ENGINE).extract_task_info(content, subject)
+
+
+def cli_task_from_message(raw, engine=None):
+    """
+    - Parse one raw message and apply the CLI rules (engine: an ExtractionEngine with
+      user rules, pass it with functools.partial when running on a process pool)
+    - Return the task dict plus its 'message_id', or None
+    """
+    email_message = email.message_from_bytes(raw)
+    subject = decode_email_subject(email_message['subject'])
+    task = extract_task_info(get_email_content(email_message), subject, engine)
+    if task:
+        task['message_id'] = (email_message['Message-ID'] or '').strip()
+    return task
+
+
+# ------------------------------------------------------------------------------
+#   GUI RULES (EmailTaskExtractor)
+
+def decode_header_value(header_value):
+    """Decode email header value"""
+    if header_value is None:
+        return ""
+
+    decoded_parts = decode_header(header_value)
+    decoded_string = ""
+
+    for part, encoding in decoded_parts:
+        if isinstance(part, bytes):
+            decoded_string += part.decode(encoding or 'utf-8', errors='ignore')
+        else:
+            decoded_string += part
+
+    return decoded_string
+
+
+def get_email_body(email_message):
+    """Extract email body text"""
+    body = ""
+
+    if email_message.is_multipart():
+        for part in email_message.walk():
+            content_type = part.get_content_type()
+            if content_type == "text/plain":
+                try:
+                    body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
+                    break
+                except:
+                    continue
+    else:
+        try:
+            body = email_message.get_payload(decode=True).decode('utf-8', errors='ignore')
+        except:
+            body = str(email_message.get_payload())
+
+    return body[:500]  # Limit body length
+
+
+def extract_task_text(subject, body):
+    """Extract meaningful task text from email"""
+    # Priority to subject line for task extraction
+    if subject and len(subject.strip()) > 5:
+        return subject.strip()[:100]  # Limit length
+
+    # If subject is not useful, try to extract from body
+    lines = body.split('\n')
+    for line in lines[:10]:  # Check first 10 lines
+        line = line.strip()
+        if len(line) > 10 and len(line) < 100:
+            return line
+
+    return subject.strip()[:50] if subject else "Email task"
+
+
+def determine_priority(text, engine=None):
+    """Determine priority based on email content"""
+    return (engine or DEFAULT_ENGINE).determine_priority(text)
+
+
+def gui_task_from_message(raw, engine=None):
+    """
+    - Parse one raw message and apply the GUI rules (task keyword in subject or body)
+    - Return {'title', 'source', 'date', 'priority', 'message_id'} or None
+    """
+    engine = engine or DEFAULT_ENGINE
+    email_message = email.message_from_bytes(raw)
+    subject = decode_header_value(email_message['Subject'])
+    body = get_email_body(email_message)
+
+    # Check if email contains task-related keywords
+    combined_text = f"{subject} {body}".lower()
+    if not engine.has_task_keyword(combined_text):
+        return None
+    # Extract potential task from subject or body
+    task_text = extract_task_text(subject, body)
+    if not task_text:
+        return None
+    return {
+        'title': task_text,
+        'source': f"Email from {email_message['From']}",
+        'date': email_message['Date'],
+        'priority': engine.determine_priority(combined_text),
+        'message_id': (email_message['Message-ID'] or '').strip()
+    }
+
+
+# ------------------------------------------------------------------------------
+#   PROCESS POOL STAGE
+
+DEFAULT_ENGINE = ExtractionEngine()
+TASK_KEYWORDS = DEFAULT_ENGINE.task_keywords
+
+
+def _extract_chunk(extract, raws):
+    results = []
+    for raw in raws:
+        try:
+            results.append(extract(raw))
+        except Exception as e:
+            results.append({'error': str(e)})
+    return results
+
+
+def extract_in_processes(messages, extract, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Run extract(raw) over a stream of messages on a ProcessPoolExecutor (POOL_CONTEXT).
+
+    - messages: iterable of (key, raw bytes), e.g. fetch_folders output reshaped
+    - extract: module-level function(raw) -> small dict or None (cli_task_from_message,
+      gui_task_from_message), so only compact results travel back between processes
+    - Yield (key, result) in input order; a message that raised gives {'error': message}
+    - Raw bytes are sent in chunks of chunk_size; at most 2 * workers chunks are in
+      flight, so memory stays flat however long the stream is
+    - workers=None uses os.cpu_count(); workers=0, or a stream that fits in one
+      chunk, runs inline without starting any process
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    messages = iter(messages)
+    chunk = _next_chunk(messages, chunk_size)
+    following = _next_chunk(messages, chunk_size) if chunk else []
+    if workers <= 0 or not following:
+        while chunk:
+            yield from zip((key for key, _ in chunk), _extract_chunk(extract, [raw for _, raw in chunk]))
+            chunk, following = following, _next_chunk(messages, chunk_size)
+        return
+
+    window = deque()
+    with ProcessPoolExecutor(workers, mp_context=POOL_CONTEXT) as executor:
+        while chunk:
+            keys = [key for key, _ in chunk]
+            window.append((keys, executor.submit(_extract_chunk, extract, [raw for _, raw in chunk])))
+            chunk, following = following, _next_chunk(messages, chunk_size)
+            if len(window) >= 2 * workers:
+                keys, future = window.popleft()
+                yield from zip(keys, future.result())
+        while window:
+            keys, future = window.popleft()
+            yield from zip(keys, future.result())
+
+
+def _next_chunk(messages, chunk_size):
+    chunk = []
+    for item in messages:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            break
+    return chunk
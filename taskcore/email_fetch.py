@@ -0,0 +1,296 @@
+import imaplib
+import queue
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Headers fetched instead of the whole message. Content-Type and
+# Content-Transfer-Encoding are needed to decode the partial body (multipart
+# boundaries, base64 / quoted-printable); the rest is what the importers read.
+HEADER_FIELDS = ("SUBJECT", "FROM", "DATE", "MESSAGE-ID", "CONTENT-TYPE", "CONTENT-TRANSFER-ENCODING")
+
+IMAP_SERVER = "imap.gmail.com"  # default endpoint, see connect_imap
+
+BATCH_SIZE = 200      # messages per FETCH command
+BODY_BYTES = 16384    # leading body bytes fetched per message, enough for task lines
+SHARD_BATCHES = 4     # FETCH batches per shard handed to one pooled connection
+
+_FETCH_START = re.compile(rb"\s*(\d+) \(")
+_FETCH_UID = re.compile(rb"UID (\d+)")
+_MESSAGE_ID = re.compile(rb"^Message-ID:[ \t]*(.*?)[ \t]*\r?$", re.IGNORECASE | re.MULTILINE)
+
+
+def connect_imap(server=IMAP_SERVER):
+    """
+    - Open an (unauthenticated) IMAP connection to server:
+      "host" or "host:port" / "imaps://host[:port]" -> SSL, port 993 by default
+      "imap://host[:port]"                          -> plain TCP, port 143 by default
+      (e.g. "imap://127.0.0.1:1143" for the local fake server in benchmarks/fake_imap.py)
+    """
+    scheme, _, address = server.strip().rpartition("://")
+    host, _, port = address.rstrip("/").partition(":")
+    if scheme == "imap":
+        return imaplib.IMAP4(host, int(port) if port else 143)
+    if scheme not in ("", "imaps"):
+        raise ValueError(f"Unsupported IMAP endpoint {server!r}, use host[:port], imaps:// or imap://")
+    return imaplib.IMAP4_SSL(host, int(port) if port else 993)
+
+
+def message_set(ids):  # Time Complexity O(n log n)
+    """
+    - Compress message numbers / UIDs into an IMAP message set: [1, 2, 3, 7, 9, 10] -> b"1:3,7,9:10"
+    """
+    numbers = sorted({int(i) for i in ids})
+    ranges = []
+    start = previous = None
+    for number in numbers:
+        if previous is not None and number == previous + 1:
+            previous = number
+            continue
+        if start is not None:
+            ranges.append(f"{start}:{previous}" if previous != start else str(start))
+        start = previous = number
+    if start is not None:
+        ranges.append(f"{start}:{previous}" if previous != start else str(start))
+    return ",".join(ranges).encode()
+
+
+def fetch_messages(imap_connection, ids, uid=False, batch_size=BATCH_SIZE, body_bytes=BODY_BYTES):
+    """
+    Fetch many messages with one FETCH command per batch instead of one RFC822 fetch each.
+
+    - ids: message sequence numbers (uid=False, after SELECT) or UIDs (uid=True)
+    - Each command asks for a compressed message set (e.g. 1:200) with
+      BODY.PEEK[HEADER.FIELDS (...)] and BODY.PEEK[TEXT]<0.body_bytes>, so
+      attachments past the first body_bytes are never downloaded and the
+      \\Seen flag is left alone (body_bytes=None fetches the whole text,
+      body_bytes=0 only the headers)
+    - Yield (id, raw) in the order of ids, raw being the selected headers plus the
+      (possibly truncated) body, ready for email.message_from_bytes
+    - Messages the server does not return (deleted meanwhile) are skipped
+    """
+    ids = list(ids)
+    items = f"UID BODY.PEEK[HEADER.FIELDS ({' '.join(HEADER_FIELDS)})]"
+    if body_bytes is None:
+        items += " BODY.PEEK[TEXT]"
+    elif body_bytes:
+        items += f" BODY.PEEK[TEXT]<0.{body_bytes}>"
+    items = f"({items})"
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        if uid:
+            typ, data = imap_connection.uid("FETCH", message_set(batch), items)
+        else:
+            typ, data = imap_connection.fetch(message_set(batch), items)
+        if typ != "OK":
+            raise RuntimeError(f"FETCH failed: {data}")
+        found = {}
+        for number, uid_number, header, body in parse_fetch_response(data):
+            found[uid_number if uid else number] = header + body
+        for message_id in batch:
+            raw = found.get(int(message_id))
+            if raw is not None:
+                yield message_id, raw
+
+
+def parse_fetch_response(data):
+    """
+    - Group imaplib FETCH response items into (sequence number, uid, header, text) per message
+    - imaplib returns a (prefix, literal) tuple per literal and plain bytes for the
+      rest of the line; a new message starts at a prefix like b"12 (UID 40 BODY[...] {n}"
+    """
+    messages = []
+    current = None
+    for item in data:
+        prefix, literal = item if isinstance(item, tuple) else (item, None)
+        if prefix is None:
+            continue
+        start = _FETCH_START.match(prefix)
+        if start is not None:
+            current = [int(start.group(1)), None, b"", b""]
+            messages.append(current)
+        if current is None:
+            continue
+        if current[1] is None:
+            found_uid = _FETCH_UID.search(prefix)
+            if found_uid is not None:
+                current[1] = int(found_uid.group(1))
+        if literal is not None:
+            if prefix.rfind(b"BODY[HEADER") > prefix.rfind(b"BODY[TEXT"):
+                current[2] = literal
+            else:
+                current[3] = literal
+    return [tuple(message) for message in messages]
+
+
+def keyword_criteria(keywords, keys=("SUBJECT", "BODY")):
+    """
+    - SEARCH keys matching messages that contain any keyword in any of keys, e.g.
+      ["todo", "task"] -> '(OR OR OR SUBJECT "todo" BODY "todo" SUBJECT "task" BODY "task")'
+    - Lets the server do the keyword triage, so non-matching messages are never fetched
+    """
+    terms = [f'{key} {quote_string(keyword)}' for keyword in keywords for key in keys]
+    if not terms:
+        return None
+    return "(" + "OR " * (len(terms) - 1) + " ".join(terms) + ")"
+
+
+def quote_string(value):
+    """IMAP quoted string: value in double quotes with backslashes and double quotes escaped"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def quote_folder(folder):
+    """Quote a folder name for IMAP commands when it has spaces or specials ("Sent Mail")"""
+    if folder.startswith('"') or not re.search(r'[\s"()]', folder):
+        return folder
+    return quote_string(folder)
+
+
+# ------------------------------------------------------------------------------
+#   CONCURRENT INGESTION
+
+class IMAPPool:
+    """
+    Up to `size` authenticated IMAP connections shared by worker threads.
+
+    - connect: function() -> logged-in imaplib connection, called lazily when a
+      worker needs one and fewer than size are open
+    - connections: already open connections to reuse (they count towards size and
+      are left open by close())
+    - imap_map(function, items) runs function(connection, item) for every item, each
+      call holding one connection, and yields the results in item order; at most
+      2 * size calls are in flight, so a long stream never piles up in memory
+    """
+
+    def __init__(self, connect, size=4, connections=()):
+        self.connect = connect
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._open = len(connections)
+        self._opened = []
+        self._selected = {}
+        self._lock = threading.Lock()
+        for connection in connections:
+            self._idle.put(connection)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            may_open = self._open < self.size
+            if may_open:
+                self._open += 1
+        if not may_open:
+            return self._idle.get()
+        try:
+            connection = self.connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+        with self._lock:
+            self._opened.append(connection)
+        return connection
+
+    def _run(self, function, item):
+        connection = self._acquire()
+        try:
+            return function(connection, item)
+        finally:
+            self._idle.put(connection)
+
+    def imap_map(self, function, items):
+        window = deque()
+        with ThreadPoolExecutor(self.size) as executor:
+            for item in items:
+                window.append(executor.submit(self._run, function, item))
+                if len(window) >= 2 * self.size:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+
+    def select(self, connection, folder):
+        """EXAMINE folder on connection unless it is already the selected one"""
+        if self._selected.get(id(connection)) != folder:
+            connection.select(quote_folder(folder), readonly=True)
+            self._selected[id(connection)] = folder
+
+    def forget_selection(self, connection):
+        self._selected.pop(id(connection), None)
+
+    def mark_selected(self, connection, folder):
+        self._selected[id(connection)] = folder
+
+    def close(self):
+        """
+        - Log out the connections the pool opened itself, in parallel
+        - No CLOSE first: folders are only EXAMINEd, LOGOUT alone releases them
+        """
+        def logout(connection):
+            try:
+                connection.logout()
+            except Exception:
+                pass
+        if self._opened:
+            with ThreadPoolExecutor(len(self._opened)) as executor:
+                executor.map(logout, self._opened)
+        self._opened = []
+
+
+def search_folders(pool, folders, search):
+    """
+    - Run search(connection, folder) -> [uid, ...] for every folder in parallel
+    - Return [(folder, uids), ...] in folder order
+    """
+    def run(connection, folder):
+        pool.forget_selection(connection)
+        uids = search(connection, folder)
+        if connection.state == "SELECTED":  # search selected the folder itself
+            pool.mark_selected(connection, folder)
+        return folder, uids
+    return list(pool.imap_map(run, folders))
+
+
+def fetch_folders(pool, folder_uids, batch_size=BATCH_SIZE, body_bytes=BODY_BYTES):
+    """
+    - folder_uids: [(folder, [uid, ...]), ...], e.g. from search_folders
+    - Yield (folder, uid, raw) for every message, in folder order then uid order
+    - Each folder's UIDs are cut into about one shard per connection (at most
+      SHARD_BATCHES * batch_size UIDs, which bounds the memory in flight); shards are
+      fetched in parallel over the pool, each with one EXAMINE and then batch_size
+      FETCHes, and re-assembled in order as they arrive
+    """
+    def fetch(connection, job):
+        folder, uids = job
+        pool.select(connection, folder)
+        return folder, list(fetch_messages(connection, uids, uid=True, batch_size=batch_size, body_bytes=body_bytes))
+
+    def jobs():
+        for folder, uids in folder_uids:
+            shard = max(1, min(SHARD_BATCHES * batch_size, -(-len(uids) // pool.size)))
+            for start in range(0, len(uids), shard):
+                yield folder, uids[start:start + shard]
+
+    for folder, messages in pool.imap_map(fetch, jobs()):
+        for uid, raw in messages:
+            yield folder, uid, raw
+
+
+def unique_messages(messages):
+    """
+    - Drop (folder, uid, raw) items whose Message-ID was already yielded, so a mail
+      filed in several folders (e.g. Gmail labels) is processed once
+    """
+    seen = set()
+    for folder, uid, raw in messages:
+        header_end = raw.find(b"\r\n\r\n")
+        match = _MESSAGE_ID.search(raw, 0, header_end if header_end != -1 else len(raw))
+        if match is not None and match.group(1):
+            if match.group(1) in seen:
+                continue
+            seen.add(match.group(1))
+        yield folder, uid, raw
@@ -0,0 +1,211 @@
+import email
+from datetime import datetime, timedelta
+from functools import partial
+
+from . import email_extract
+from .email_fetch import (IMAP_SERVER, IMAPPool, connect_imap, fetch_folders, keyword_criteria, search_folders,
+                          unique_messages)
+from .email_sync import new_uids
+
+
+class EmailTaskExtractor:
+    """
+    The email import pipeline used by both front ends: IMAP search, batched fetch,
+    MIME parsing / extraction on a process pool and incremental sync.
+
+    - the CLI extracts "Task:" / "Priority:" lines from every message in range
+      (extract=email_extract.cli_task_from_message, triage=False)
+    - the desktop UI keeps messages mentioning a task keyword, triaged on their
+      headers first (the defaults, email_extract.gui_task_from_message)
+    """
+    TASK_KEYWORDS = email_extract.TASK_KEYWORDS
+
+    def __init__(self, task_senders=None, rules=None, engine=None):
+        self.imap_server = None
+        self.smtp_server = None
+        self.credentials = None  # (email, password, server) for extra pool connections
+        # Header rules used when the server is not asked to filter (server_filter=False):
+        # a subject containing a task keyword, or a sender containing one of these strings
+        self.task_senders = [sender.lower() for sender in (task_senders or [])]
+        # Keyword / priority rules (email_extract.ExtractionEngine): an engine, or user
+        # rules overriding the defaults
+        if engine is None:
+            engine = email_extract.ExtractionEngine(rules) if rules else email_extract.DEFAULT_ENGINE
+        self.engine = engine
+
+    def connect_to_email(self, email_address, password, imap_server=IMAP_SERVER, smtp_server="smtp.gmail.com"):
+        """Connect to email account (imap_server: host[:port], imaps:// or imap:// endpoint)"""
+        try:
+            # Connect to IMAP server
+            self.imap_server = connect_imap(imap_server)
+            self.imap_server.login(email_address, password)
+            self.credentials = (email_address, password, imap_server)
+            return True
+        except Exception as e:
+            print(f"Failed to connect to email: {e}")
+            return False
+
+    def open_connection(self):
+        """Open one more logged-in IMAP connection (used by the connection pool)"""
+        email_address, password, imap_server = self.credentials
+        connection = connect_imap(imap_server)
+        connection.login(email_address, password)
+        return connection
+
+    def extract_tasks_from_emails(self, folder="INBOX", days_back=7, sync_state=None, server_filter=True,
+                                  folders=None, connections=1, workers=None, extract=None, triage=True):
+        """Extract potential tasks from emails
+
+        Collects iter_tasks_from_emails (same options) into a list; errors are
+        printed and give an empty list.
+        """
+        try:
+            return list(self.iter_tasks_from_emails(folder, days_back, sync_state, server_filter, folders,
+                                                    connections, workers, extract=extract, triage=triage))
+        except Exception as e:
+            print(f"Error extracting tasks from emails: {e}")
+            return []
+
+    def iter_tasks_from_emails(self, folder="INBOX", days_back=7, sync_state=None, server_filter=True,
+                               folders=None, connections=1, workers=None, progress=None, cancelled=None,
+                               extract=None, triage=True):
+        """Yield potential tasks from emails as they are found
+
+        With triage (the default) it runs in two phases so bodies are only
+        downloaded for likely tasks:
+        1. Triage on headers. With server_filter the keyword check is pushed to the
+           server (SEARCH ... OR SUBJECT/BODY "keyword"), so only matching messages
+           are listed; their headers are fetched to skip already imported Message-IDs.
+           Without it the headers of every message in the date range are fetched and
+           kept when the subject has a task keyword or the sender is in task_senders.
+        2. Bodies (first BODY_BYTES) are fetched for the remaining candidates only and
+           checked for keywords exactly as before.
+        Without triage every message in the date range goes straight to phase 2.
+
+        extract(raw, engine) turns one raw message into a task dict or None
+        (default email_extract.gui_task_from_message); it runs on `workers`
+        processes (None = one per CPU, 0 = inline), so it must be a module-level function.
+
+        folders (default [folder]) are searched in parallel and their messages fetched
+        as UID shards over up to `connections` IMAP connections; results keep folder
+        then UID order and a mail filed in several folders is only listed once.
+
+        With sync_state (email_sync.EmailSyncState) only messages newer than the
+        last scanned UID are fetched and already imported Message-IDs are skipped.
+        The folder positions in sync_state follow the stream: they cover the
+        messages handled up to the last yielded task, and every scanned message
+        once the scan completes, so saving the state after storing the yielded
+        tasks is a resume point (the caller saves it).
+
+        progress(stage, done, total) is called for every message of each phase;
+        cancelled() is polled between messages and stops the scan. Errors are raised.
+        """
+        if not self.imap_server:
+            return
+
+        folders = folders or [folder]
+        extract = partial(extract or email_extract.gui_task_from_message, engine=self.engine)
+        pool = IMAPPool(self.open_connection, connections, [self.imap_server])
+        try:
+            # Search for emails from the last N days
+            date_since = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
+            criteria = keyword_criteria(self.engine.task_keywords) if triage and server_filter else None
+            positions = {}
+
+            def search(connection, name):
+                if sync_state is None:
+                    pool.select(connection, name)
+                    search_keys = f'SINCE {date_since}' + (f' {criteria}' if criteria else '')
+                    _, message_ids = connection.uid('SEARCH', None, search_keys)
+                    return message_ids[0].split()
+                uids, uidvalidity, last_uid = new_uids(connection, name, sync_state, date_since, criteria)
+                positions[name] = (uidvalidity, last_uid)
+                return uids
+
+            found = search_folders(pool, folders, search)
+            if triage:
+                found = self._triage_headers(pool, found, sync_state, server_filter, progress, cancelled)
+                if found is None:
+                    return
+                messages = fetch_folders(pool, found)
+            else:
+                messages = unique_messages(fetch_folders(pool, found))
+
+            # Phase 2: headers + the first BODY_BYTES of the body, parsed and run through
+            # extract in worker processes, results in message order
+            total = sum(len(uids) for _, uids in found)
+            bodies = (((name, msg_id), email_body) for name, msg_id, email_body in messages)
+            for done, ((name, msg_id), task) in enumerate(email_extract.extract_in_processes(bodies, extract,
+                                                                                             workers), 1):
+                if cancelled is not None and cancelled():
+                    return
+                if progress is not None:
+                    progress("Reading emails", done, total)
+                if sync_state is not None:
+                    sync_state.advance(name, positions[name][0], int(msg_id))
+                if task is None:
+                    continue
+                if 'error' in task:
+                    print(f"Error parsing email {msg_id}: {task['error']}")
+                    continue
+                if sync_state is not None and sync_state.seen(task['message_id']):
+                    continue
+                yield task
+
+            # the searches covered every UID up to last_uid, including emails without a task
+            if sync_state is not None:
+                for name, (uidvalidity, last_uid) in positions.items():
+                    sync_state.advance(name, uidvalidity, last_uid)
+        finally:
+            pool.close()
+
+    def _triage_headers(self, pool, found, sync_state, server_filter, progress, cancelled):
+        """Phase 1: headers only, one FETCH per shard; return [(folder, candidate uids)], None when cancelled"""
+        total = sum(len(uids) for _, uids in found)
+        candidates = {}
+        for done, (name, msg_id, header) in enumerate(unique_messages(fetch_folders(pool, found, body_bytes=0)), 1):
+            if cancelled is not None and cancelled():
+                return None
+            if progress is not None:
+                progress("Checking email headers", done, total)
+            email_message = email.message_from_bytes(header)
+            if sync_state is not None and sync_state.seen((email_message['Message-ID'] or '').strip()):
+                continue
+            if server_filter or self.is_task_header(self.decode_header_value(email_message['Subject']),
+                                                    email_message['From']):
+                candidates.setdefault(name, []).append(msg_id)
+        return list(candidates.items())
+
+    def is_task_header(self, subject, sender):
+        """Header-only triage rule: task keyword in the subject or a known task sender"""
+        subject = (subject or "").lower()
+        sender = (sender or "").lower()
+        return (self.engine.has_task_keyword(subject)
+                or any(task_sender in sender for task_sender in self.task_senders))
+
+    def decode_header_value(self, header_value):
+        """Decode email header value"""
+        return email_extract.decode_header_value(header_value)
+
+    def get_email_body(self, email_message):
+        """Extract email body text"""
+        return email_extract.get_email_body(email_message)
+
+    def extract_task_text(self, subject, body):
+        """Extract meaningful task text from email"""
+        return email_extract.extract_task_text(subject, body)
+
+    def determine_priority(self, text):
+        """Determine priority based on email content"""
+        return self.engine.determine_priority(text)
+
+    def disconnect(self):
+        """Disconnect from email server"""
+        if self.imap_server:
+            try:
+                if self.imap_server.state == 'SELECTED':  # an unchanged incremental sync never selects
+                    self.imap_server.close()
+                self.imap_server.logout()
+            except:
+                pass
+            self.imap_server = None
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+
+from .email_fetch import quote_folder
+
+
+class EmailSyncState:
+    """
+    Incremental email import state, persisted as JSON.
+
+    - folders  : {folder: {"uidvalidity": int, "last_uid": int}}, the highest UID
+                 already scanned per folder, valid only while UIDVALIDITY is unchanged
+    - messages : {Message-ID: task_id} for every imported message, so a message
+                 seen again (re-delivered, copied to another folder, state reset)
+                 never creates a second task
+    """
+
+    def __init__(self, path="email_sync.json"):
+        self.path = path
+        self.folders = {}
+        self.messages = {}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                state = json.load(file)
+            self.folders = state.get("folders", {})
+            self.messages = state.get("messages", {})
+
+    def position(self, folder):
+        """
+        - Return (uidvalidity, last_uid) for folder, (None, 0) if it was never synced
+        """
+        entry = self.folders.get(folder)
+        if entry is None:
+            return None, 0
+        return entry["uidvalidity"], entry["last_uid"]
+
+    def advance(self, folder, uidvalidity, last_uid):
+        known_validity, current = self.position(folder)
+        if known_validity != uidvalidity:
+            current = 0
+        self.folders[folder] = {"uidvalidity": uidvalidity, "last_uid": max(current, last_uid)}
+
+    def seen(self, message_id):
+        return bool(message_id) and message_id in self.messages
+
+    def remember(self, message_id, task_id):
+        if message_id:
+            self.messages[message_id] = task_id
+
+    def task_for(self, message_id):
+        return self.messages.get(message_id)
+
+    def save(self):
+        """
+        - Write the state to a temporary file and rename it into place
+        """
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"folders": self.folders, "messages": self.messages}, file, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+
+_STATUS_FIELDS = re.compile(rb"(UIDVALIDITY|UIDNEXT) (\d+)")
+
+
+def folder_status(imap_connection, folder):
+    """
+    - One STATUS round-trip: return (uidvalidity, uidnext) without selecting the folder
+    """
+    typ, data = imap_connection.status(quote_folder(folder), "(UIDVALIDITY UIDNEXT)")
+    if typ != "OK":
+        raise RuntimeError(f"STATUS {folder} failed: {data}")
+    fields = {name.decode(): int(value) for name, value in _STATUS_FIELDS.findall(data[0])}
+    return fields["UIDVALIDITY"], fields["UIDNEXT"]
+
+
+def new_uids(imap_connection, folder, state, since=None, criteria=None):
+    """
+    - Return (uids, uidvalidity, last_uid): UIDs in folder not scanned yet, ascending,
+      as bytes, and the position to store with state.advance once they are processed
+    - An unchanged folder costs a single STATUS round-trip and returns no UIDs
+    - Otherwise the folder is selected read-only and searched for UIDs above the stored position;
+      a folder seen for the first time, or whose UIDVALIDITY changed (old UIDs are
+      meaningless then), is searched by date instead (since: "01-Jan-2024" or None)
+    - criteria: optional extra SEARCH keys ANDed to the search (e.g. a keyword filter);
+      last_uid still covers the messages it filtered out
+    - Fetch the returned UIDs with imap_connection.uid("FETCH", ...)
+    """
+    uidvalidity, uidnext = folder_status(imap_connection, folder)
+    known_validity, last_uid = state.position(folder)
+    if known_validity != uidvalidity:
+        last_uid = 0
+    elif uidnext <= last_uid + 1:
+        return [], uidvalidity, last_uid
+
+    # read-only (EXAMINE): the scan never sets \Seen, and a later CLOSE expunges nothing
+    imap_connection.select(quote_folder(folder), readonly=True)
+    if last_uid:
+        search = f"UID {last_uid + 1}:*"
+    elif since:
+        search = f'SINCE "{since}"'
+    else:
+        search = "ALL"
+    if criteria:
+        search += " " + criteria
+    typ, data = imap_connection.uid("SEARCH", None, search)
+    if typ != "OK":
+        raise RuntimeError(f"SEARCH {folder} failed: {data}")
+    # "UID n:*" always matches the highest UID, even when it is below n
+    uids = [uid for uid in data[0].split() if int(uid) > last_uid]
+    uids.sort(key=int)
+    # everything below UIDNEXT was covered by the search, matched or not
+    return uids, uidvalidity, max(uidnext - 1, int(uids[-1]) if uids else 0)
+
@@ -0,0 +1,674 @@
+import bisect
+import heapq
+from datetime import datetime
+
+
+class IndexedPriorityQueue:
+    """
+    Binary max-heap of task ids that remembers where every id sits.
+
+    - Highest priority first, ties go to the id that was pushed first
+    - position map {task_id: index in heap} makes remove/update O(log n)
+    - nothing is ever copied or re-heapified to answer peek / top-k
+    """
+
+    def __init__(self):
+        self._heap = []        # list of task ids, heap ordered by self._keys
+        self._position = {}    # {task_id: index in self._heap}
+        self._keys = {}        # {task_id: (-priority, sequence)}
+        self._sequence = 0     # insertion counter used as tie breaker
+        self._version = 0      # bumped by every change, so ordered() can detect one mid-iteration
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, task_id):
+        return task_id in self._position
+
+    def push(self, task_id, priority):  # Time Complexity O(log n)
+        """
+        - Insert task_id, or change its priority if it is already queued
+        """
+        if task_id in self._position:
+            self.update(task_id, priority)
+            return
+        self._sequence += 1
+        self._version += 1
+        self._keys[task_id] = (-priority, self._sequence)
+        self._heap.append(task_id)
+        self._position[task_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def build(self, items):  # Time Complexity O(n log n) in C, no Python-level sifting
+        """
+        - Bulk-load an empty queue from (task_id, priority) pairs
+        - A list sorted by key is already a valid heap, so one sort replaces n pushes
+        """
+        entries = []
+        for task_id, priority in items:
+            self._sequence += 1
+            entries.append(((-priority, self._sequence), task_id))
+        entries.sort()
+        self._version += 1
+        self._keys = {task_id: key for key, task_id in entries}
+        self._heap = [task_id for _, task_id in entries]
+        self._position = {task_id: index for index, task_id in enumerate(self._heap)}
+
+    def update(self, task_id, priority):  # Time Complexity O(log n)
+        """
+        - Change the priority of a queued task and restore heap order
+        - Return False if task_id is not queued
+        """
+        if task_id not in self._position:
+            return False
+        self._version += 1
+        old_key = self._keys[task_id]
+        new_key = (-priority, old_key[1])
+        self._keys[task_id] = new_key
+        index = self._position[task_id]
+        if new_key < old_key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+        return True
+
+    def discard(self, task_id):  # Time Complexity O(log n)
+        """
+        - Remove task_id from the queue if present
+        - Return True if something was removed
+        """
+        index = self._position.pop(task_id, None)
+        if index is None:
+            return False
+        self._version += 1
+        del self._keys[task_id]
+        last_id = self._heap.pop()
+        if index < len(self._heap):
+            # Move the last leaf into the hole and fix it in whichever direction it needs
+            self._heap[index] = last_id
+            self._position[last_id] = index
+            self._sift_up(index)
+            self._sift_down(self._position[last_id])
+        return True
+
+    def peek(self):  # Time Complexity O(1)
+        """
+        - Return the highest priority task_id without removing it (None if empty)
+        """
+        return self._heap[0] if self._heap else None
+
+    def ordered(self):  # Time Complexity O(k log k) for the first k items
+        """
+        - Lazily yield task ids from highest to lowest priority
+        - Walks the heap tree with a small frontier heap, so the queue itself
+          is never modified or copied
+        - Raises RuntimeError when the queue changed since the iteration started,
+          like a dict changed during iteration: the walk would skip or repeat ids
+        """
+        if not self._heap:
+            return
+        heap, keys = self._heap, self._keys
+        version = self._version
+        frontier = [(keys[heap[0]], 0)]
+        while frontier:
+            _, index = heapq.heappop(frontier)
+            yield heap[index]
+            if self._version != version:
+                raise RuntimeError("priority queue changed during iteration")
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (keys[heap[child]], child))
+
+    def top(self, k):  # Time Complexity O(k log k)
+        """
+        - Return list of the k highest priority task ids
+        """
+        result = []
+        if k <= 0:
+            return result
+        for task_id in self.ordered():
+            result.append(task_id)
+            if len(result) == k:
+                break
+        return result
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._position[heap[i]] = i
+        self._position[heap[j]] = j
+
+    def _sift_up(self, index):
+        keys, heap = self._keys, self._heap
+        while index > 0:
+            parent = (index - 1) // 2
+            if keys[heap[index]] < keys[heap[parent]]:
+                self._swap(index, parent)
+                index = parent
+            else:
+                break
+
+    def _sift_down(self, index):
+        keys, heap = self._keys, self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and keys[heap[child]] < keys[heap[smallest]]:
+                    smallest = child
+            if smallest == index:
+                break
+            self._swap(index, smallest)
+            index = smallest
+
+
+class PriorityIndex:
+    """
+    Tasks grouped into one bucket per priority value.
+
+    - buckets {priority: {task_id: task}} keep insertion order inside a priority
+    - priorities is a sorted list of the distinct priority values, searched with bisect
+    - equality lookups are O(1 + m), range lookups O(log p + m), m = matches
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._priorities = []
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def add(self, task):  # Time Complexity O(1), O(p) when a new priority value appears
+        bucket = self._buckets.get(task.priority)
+        if bucket is None:
+            bucket = self._buckets[task.priority] = {}
+            bisect.insort(self._priorities, task.priority)
+        bucket[task.task_id] = task
+
+    def remove(self, task, priority=None):  # Time Complexity O(1), O(p) when a bucket empties
+        """
+        - priority: the value the task was indexed under, if it has changed since
+        """
+        if priority is None:
+            priority = task.priority
+        bucket = self._buckets.get(priority)
+        if bucket is None or bucket.pop(task.task_id, None) is None:
+            return False
+        if not bucket:
+            del self._buckets[priority]
+            del self._priorities[bisect.bisect_left(self._priorities, priority)]
+        return True
+
+    def move(self, task, old_priority):
+        """
+        - Re-file a task whose priority changed from old_priority
+        """
+        if self.remove(task, old_priority):
+            self.add(task)
+
+    def equal(self, priority):  # Time Complexity O(1 + m)
+        return list(self._buckets.get(priority, {}).values())
+
+    def range(self, low=None, high=None):  # Time Complexity O(log p + m)
+        """
+        - Return tasks with low <= priority <= high, lowest priority first
+        - Either bound may be None to leave that side open
+        """
+        start = 0 if low is None else bisect.bisect_left(self._priorities, low)
+        stop = len(self._priorities) if high is None else bisect.bisect_right(self._priorities, high)
+        results = []
+        for priority in self._priorities[start:stop]:
+            results.extend(self._buckets[priority].values())
+        return results
+
+
+class TitleIndex:
+    """
+    Inverted trigram index over lower-cased task titles.
+
+    - grams {trigram: set of task_ids}; titles are padded with two START
+      markers so prefixes have their own trigrams
+    - a query only verifies the tasks that contain every one of its trigrams
+    - queries shorter than 3 characters, or so broad that most titles are
+      candidates, fall back to an in-order scan of the cached lower-cased
+      titles (still no per-query lower())
+    - add_many() (bulk load) defers the trigram postings until the first query
+      that needs them, so a cold start only pays for the lower-cased titles
+    """
+
+    START = "\x02"
+
+    def __init__(self):
+        self._grams = {}      # {trigram: {task_id, ...}}, None until a deferred build runs
+        self._entries = {}    # {task_id: (sequence, lower-cased title, task)}
+        self._sequence = 0    # keeps results in insertion order like the old scan
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _trigrams(self, text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, task):  # Time Complexity O(len(title))
+        self._sequence += 1
+        lowered = task.title.lower()
+        self._entries[task.task_id] = (self._sequence, lowered, task)
+        if self._grams is None:
+            return
+        for gram in self._trigrams(self.START * 2 + lowered):
+            self._grams.setdefault(gram, set()).add(task.task_id)
+
+    def add_many(self, tasks):  # Time Complexity O(n), trigrams deferred
+        """
+        - Bulk load: record the titles now, build the trigram postings on the first lookup
+        """
+        if self._entries:
+            for task in tasks:
+                self.add(task)
+            return
+        self._grams = None
+        for task in tasks:
+            self._sequence += 1
+            self._entries[task.task_id] = (self._sequence, task.title.lower(), task)
+
+    def ensure_built(self):  # Time Complexity O(total title length) once, O(1) after
+        """
+        - Run a deferred trigram build now; call it on the thread that changes the
+          index before searching from another thread, so the build cannot race an update
+        """
+        if self._grams is None:
+            self._build_grams()
+
+    def _build_grams(self):  # Time Complexity O(total title length)
+        grams = {}
+        for task_id, (_, lowered, _) in self._entries.items():
+            for gram in self._trigrams(self.START * 2 + lowered):
+                postings = grams.get(gram)
+                if postings is None:
+                    grams[gram] = {task_id}
+                else:
+                    postings.add(task_id)
+        self._grams = grams
+
+    def remove(self, task_id):  # Time Complexity O(len(title))
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return False
+        if self._grams is None:
+            return True
+        for gram in self._trigrams(self.START * 2 + entry[1]):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(task_id)
+                if not postings:
+                    del self._grams[gram]
+        return True
+
+    def update(self, task):  # Time Complexity O(len(old) + len(new))
+        """
+        - Re-index a renamed task, keeping its original position in result order
+        """
+        entry = self._entries.get(task.task_id)
+        if entry is None:
+            self.add(task)
+            return
+        lowered = task.title.lower()
+        if self._grams is None:
+            self._entries[task.task_id] = (entry[0], lowered, task)
+            return
+        old_grams = self._trigrams(self.START * 2 + entry[1])
+        new_grams = self._trigrams(self.START * 2 + lowered)
+        for gram in old_grams - new_grams:
+            postings = self._grams[gram]
+            postings.discard(task.task_id)
+            if not postings:
+                del self._grams[gram]
+        for gram in new_grams - old_grams:
+            self._grams.setdefault(gram, set()).add(task.task_id)
+        self._entries[task.task_id] = (entry[0], lowered, task)
+
+    def search(self, query):  # Time Complexity O(c + m log m), c = candidates, m = matches
+        """
+        - Return tasks whose title contains query (case insensitive)
+        """
+        query = query.lower()
+        return self._lookup(self._trigrams(query), query, prefix=False)
+
+    def search_entries(self, query):  # Time Complexity O(c + m log m)
+        """
+        - Like search(), but return the index entries (sequence, lower-cased title, task)
+        """
+        query = query.lower()
+        return self._lookup(self._trigrams(query), query, prefix=False, entries=True)
+
+    def prefix_search(self, prefix):  # Time Complexity O(c + m log m)
+        """
+        - Return tasks whose title starts with prefix (case insensitive)
+        """
+        prefix = prefix.lower()
+        return self._lookup(self._trigrams(self.START * 2 + prefix), prefix, prefix=True)
+
+    def _lookup(self, grams, query, prefix, entries=False):
+        if not grams:
+            return self._scan(query, prefix, entries)
+        self.ensure_built()
+        postings = []
+        for gram in grams:
+            found = self._grams.get(gram)
+            if not found:
+                return []
+            postings.append(found)
+        postings.sort(key=len)
+        if len(postings[0]) * 8 > len(self._entries):
+            # Broad query: an in-order scan of the cached titles beats intersecting and sorting
+            return self._scan(query, prefix, entries)
+        candidates = postings[0].intersection(*postings[1:])
+        found = [self._entries[task_id] for task_id in candidates]
+        if prefix:
+            hits = [entry for entry in found if entry[1].startswith(query)]
+        else:
+            hits = [entry for entry in found if query in entry[1]]
+        hits.sort(key=lambda entry: entry[0])
+        return hits if entries else [entry[2] for entry in hits]
+
+    def _scan(self, query, prefix, entries=False):  # Time Complexity O(n)
+        if entries:
+            if prefix:
+                return [entry for entry in self._entries.values() if entry[1].startswith(query)]
+            return [entry for entry in self._entries.values() if query in entry[1]]
+        if prefix:
+            return [task for _, title, task in self._entries.values() if title.startswith(query)]
+        return [task for _, title, task in self._entries.values() if query in title]
+
+
+class IncrementalSearch:
+    """
+    Search-as-you-type over a TitleIndex, remembering the last query and its matches.
+
+    - a query that contains the last one can only match a subset of the last matches,
+      so only those are re-checked, against their cached lower-cased titles, instead
+      of searching the whole index
+    - candidates() / matches() / remember() split search() so the matching step can
+      run on a worker thread while the state is only touched by the caller's thread;
+      they pass TitleIndex entries (sequence, lower-cased title, task) around
+    - invalidate() after any task change (add, remove, rename): the remembered matches
+      would otherwise miss new tasks or keep renamed ones
+    """
+
+    def __init__(self, title_index):
+        self.title_index = title_index
+        self._query = None
+        self._matches = None
+
+    def candidates(self, query):
+        """
+        - The remembered matches when query extends the last query, None otherwise
+        """
+        query = query.lower()
+        if self._query and self._query in query:
+            return self._matches
+        return None
+
+    def matches(self, query, candidates=None):  # Time Complexity O(len(candidates)), index search without
+        """
+        - Entries whose title contains query: filtered from candidates, or looked up in the index
+        - Reads only; safe to call off the thread that owns the search
+        """
+        query = query.lower()
+        if candidates is None:
+            return self.title_index.search_entries(query)
+        return [entry for entry in candidates if query in entry[1]]
+
+    def remember(self, query, matches):
+        self._query = query.lower()
+        self._matches = matches
+
+    def search(self, query):
+        """
+        - Return the tasks whose title contains query, like TitleIndex.search
+        """
+        matches = self.matches(query, self.candidates(query))
+        self.remember(query, matches)
+        return [entry[2] for entry in matches]
+
+    def invalidate(self):
+        self._query = None
+        self._matches = None
+
+
+class TaskCounters:
+    """
+    Running totals behind get_stats(), updated on every mutation.
+
+    - total / completed / pending and per-priority counts are plain integers
+    - pending created_at timestamps live in a sorted list, so the
+      pending-by-age buckets are a handful of bisects per scrape
+    """
+
+    # (bucket name, upper age limit in days); None means "older than everything above"
+    AGE_BUCKETS = [("under_1_day", 1), ("1_to_7_days", 7), ("7_to_30_days", 30), ("over_30_days", None)]
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self._priority_total = {}      # {priority: number of tasks}
+        self._priority_completed = {}  # {priority: number of completed tasks}
+        self._pending_created = []     # sorted created_at epochs of pending tasks
+
+    def add_many(self, tasks):  # Time Complexity O(n log n)
+        """
+        - Bulk version of add(): one sort of the pending timestamps instead of n insorts
+        """
+        pending = self._pending_created
+        for task in tasks:
+            self.total += 1
+            self._bump(self._priority_total, task.priority, 1)
+            if task.completed:
+                self.completed += 1
+                self._bump(self._priority_completed, task.priority, 1)
+            else:
+                pending.append(task.created_ts)
+        pending.sort()
+
+    def add(self, task):  # Time Complexity O(log n), appends in the common case
+        self.total += 1
+        self._bump(self._priority_total, task.priority, 1)
+        if task.completed:
+            self.completed += 1
+            self._bump(self._priority_completed, task.priority, 1)
+        else:
+            bisect.insort(self._pending_created, task.created_ts)
+
+    def remove(self, task):  # Time Complexity O(log n)
+        self.total -= 1
+        self._bump(self._priority_total, task.priority, -1)
+        if task.completed:
+            self.completed -= 1
+            self._bump(self._priority_completed, task.priority, -1)
+        else:
+            self._drop_pending(task)
+
+    def set_completed(self, task, completed):  # Time Complexity O(log n)
+        """
+        - Call before flipping task.completed; no-op if the state does not change
+        """
+        if task.completed == completed:
+            return
+        if completed:
+            self.completed += 1
+            self._bump(self._priority_completed, task.priority, 1)
+            self._drop_pending(task)
+        else:
+            self.completed -= 1
+            self._bump(self._priority_completed, task.priority, -1)
+            bisect.insort(self._pending_created, task.created_ts)
+
+    def change_priority(self, task, old_priority):  # Time Complexity O(1)
+        """
+        - Call after task.priority changed from old_priority
+        """
+        self._bump(self._priority_total, old_priority, -1)
+        self._bump(self._priority_total, task.priority, 1)
+        if task.completed:
+            self._bump(self._priority_completed, old_priority, -1)
+            self._bump(self._priority_completed, task.priority, 1)
+
+    def snapshot(self, now=None):  # Time Complexity O(p + log n)
+        """
+        - Return the get_stats() dictionary
+        """
+        by_priority = {}
+        for priority in sorted(self._priority_total):
+            total = self._priority_total[priority]
+            completed = self._priority_completed.get(priority, 0)
+            by_priority[priority] = {"total": total, "completed": completed, "pending": total - completed}
+
+        now = (now or datetime.now()).timestamp()
+        pending_by_age = {}
+        newer_than = len(self._pending_created)  # index of the first task younger than the previous limit
+        for name, days in self.AGE_BUCKETS:
+            if days is None:
+                pending_by_age[name] = newer_than
+                break
+            cutoff = now - days * 86400
+            start = bisect.bisect_left(self._pending_created, cutoff)
+            pending_by_age[name] = newer_than - start
+            newer_than = start
+
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "pending": self.total - self.completed,
+            "by_priority": by_priority,
+            "pending_by_age": pending_by_age,
+        }
+
+    def _drop_pending(self, task):
+        created = task.created_ts
+        index = bisect.bisect_left(self._pending_created, created)
+        if index < len(self._pending_created) and self._pending_created[index] == created:
+            del self._pending_created[index]
+
+    def _bump(self, counts, priority, delta):
+        counts[priority] = counts.get(priority, 0) + delta
+        if not counts[priority]:
+            del counts[priority]
+
+
+class SortedView:
+    """
+    Tasks kept permanently sorted by key(task), smallest key first.
+
+    - stored as a list of short sorted sublists (each at most 2 * LOAD long),
+      so an insert or delete only shifts one sublist
+    - ties keep insertion order; a task keeps its place among equals when re-keyed
+    - page(offset, limit) costs O(n / LOAD + limit) instead of a full sort
+    """
+
+    LOAD = 500
+
+    def __init__(self, key):
+        self._key = key
+        self._lists = []     # sorted sublists of (sort key, sequence, task)
+        self._maxes = []     # last entry of every sublist, for bisect
+        self._entries = {}   # {task_id: entry currently stored}
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        for sublist in self._lists:
+            for entry in sublist:
+                yield entry[2]
+
+    def build(self, tasks):  # Time Complexity O(n log n)
+        """
+        - Bulk-load an empty view: one sort, then cut into sublists
+        """
+        entries = []
+        for task in tasks:
+            self._sequence += 1
+            entry = (self._key(task), self._sequence, task)
+            entries.append(entry)
+            self._entries[task.task_id] = entry
+        entries.sort()
+        self._lists = [entries[i:i + self.LOAD] for i in range(0, len(entries), self.LOAD)]
+        self._maxes = [sublist[-1] for sublist in self._lists]
+
+    def add(self, task, sequence=None):  # Time Complexity O(log n + LOAD)
+        if sequence is None:
+            self._sequence += 1
+            sequence = self._sequence
+        entry = (self._key(task), sequence, task)
+        self._entries[task.task_id] = entry
+        if not self._lists:
+            self._lists.append([entry])
+            self._maxes.append(entry)
+            return
+        position = bisect.bisect_left(self._maxes, entry)
+        if position == len(self._lists):
+            position -= 1
+        sublist = self._lists[position]
+        bisect.insort(sublist, entry)
+        self._maxes[position] = sublist[-1]
+        if len(sublist) > 2 * self.LOAD:
+            # Split an overgrown sublist in half so shifting stays cheap
+            self._lists.insert(position + 1, sublist[self.LOAD:])
+            del sublist[self.LOAD:]
+            self._maxes[position] = sublist[-1]
+            self._maxes.insert(position + 1, self._lists[position + 1][-1])
+
+    def remove(self, task_id):  # Time Complexity O(log n + LOAD)
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return None
+        position = bisect.bisect_left(self._maxes, entry)
+        sublist = self._lists[position]
+        del sublist[bisect.bisect_left(sublist, entry)]
+        if sublist:
+            self._maxes[position] = sublist[-1]
+        else:
+            del self._lists[position]
+            del self._maxes[position]
+        return entry
+
+    def update(self, task):  # Time Complexity O(log n + LOAD)
+        """
+        - Re-sort a task whose key may have changed (no-op if it did not)
+        """
+        entry = self._entries.get(task.task_id)
+        if entry is None:
+            self.add(task)
+        elif entry[0] != self._key(task):
+            self.remove(task.task_id)
+            self.add(task, entry[1])
+
+    def index(self, task_id):  # Time Complexity O(n / LOAD + log LOAD)
+        """
+        - Return the position of task_id in the view (what page() counts offsets in), None if absent
+        """
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return None
+        position = bisect.bisect_left(self._maxes, entry)
+        before = sum(len(sublist) for sublist in self._lists[:position])
+        return before + bisect.bisect_left(self._lists[position], entry)
+
+    def page(self, offset=0, limit=None):  # Time Complexity O(n / LOAD + limit)
+        """
+        - Return up to limit tasks starting at position offset (limit=None: to the end)
+        """
+        result = []
+        if limit is not None and limit <= 0:
+            return result
+        for sublist in self._lists:
+            if offset >= len(sublist):
+                offset -= len(sublist)
+                continue
+            for entry in sublist[offset:]:
+                result.append(entry[2])
+                if len(result) == limit:
+                    return result
+            offset = 0
+        return result
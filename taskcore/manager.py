@@ -0,0 +1,869 @@
+"""
+Task engine shared by the CLI (main.py) and the desktop UI (TaskMangerUI.py).
+
+- Task / CompactTask: the task records
+- TaskManager: tasks by id plus every index (priority queue, priority buckets,
+  title trigrams, running counters, ordered views), undo, durable storage
+  (journal, SQLite or mmap snapshot) and change notifications for listeners
+"""
+from contextlib import contextmanager
+from datetime import datetime
+import gc
+from itertools import islice
+import sys
+import time
+
+from .storage import LazyTaskMap, MmapSnapshot
+from .indexes import IndexedPriorityQueue, PriorityIndex, SortedView, TaskCounters, TitleIndex
+
+class Task:
+    def __init__(self, task_id, title, priority=1, created_ts=None):
+        self.task_id = task_id
+        self.title = title
+        self.priority = priority
+        self.completed = False
+        # created_ts: created_at as seconds since the epoch, the form the indexes sort on
+        self.created_ts = time.time() if created_ts is None else created_ts
+        self._created_at = datetime.fromtimestamp(self.created_ts)
+
+    @property
+    def created_at(self):
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = value
+        self.created_ts = value.timestamp()
+
+    def __lt__(self, other):
+        return self.priority > other.priority
+
+
+class CompactTask:
+    """
+    Memory-light Task used by TaskManager(compact=True).
+
+    - __slots__ instead of a per-instance __dict__
+    - created_at stored as one float (epoch seconds) instead of a datetime object
+    - titles are interned, so repeated titles (e.g. email imports) share one string
+    - same attributes as Task; created_at is rebuilt as a datetime on access
+    """
+    __slots__ = ("task_id", "title", "priority", "completed", "created_ts")
+
+    def __init__(self, task_id, title, priority=1, created_ts=None):
+        self.task_id = task_id
+        self.title = sys.intern(title)
+        self.priority = priority
+        self.completed = False
+        self.created_ts = time.time() if created_ts is None else created_ts
+
+    @property
+    def created_at(self):
+        return datetime.fromtimestamp(self.created_ts)
+
+    @created_at.setter
+    def created_at(self, value):
+        self.created_ts = value.timestamp()
+
+    def __lt__(self, other):
+        return self.priority > other.priority
+
+
+class TaskManager:
+    # Display orders: sort key of each ordered view; equal keys keep insertion order,
+    # so "added" lists tasks in the order they were added
+    ORDERS = {
+        "added": lambda task: 0,
+        "priority": lambda task: -task.priority,
+        "date": lambda task: -task.created_ts,
+        "priority_date": lambda task: (-task.priority, -task.created_ts),
+    }
+    STATUSES = ("all", "pending", "completed")
+
+    def __init__(self, title_index=True, educational=False, compact=False, storage=None, backend=None,
+                 snapshot=None):
+        if sum(option is not None for option in (storage, backend, snapshot)) > 1:
+            raise ValueError("Use only one of storage (in-memory + journal), backend (SQLite) or snapshot (mmap)")
+
+        # compact=True stores tasks as CompactTask (__slots__, float timestamp, interned title)
+        self.task_class = CompactTask if compact else Task
+
+        # Backend: optional storage.SQLiteBackend that replaces the dict and every
+        # in-memory index below; queries are then answered by indexed SQL
+        self.backend = backend
+
+        # Snapshot: optional storage.MmapSnapshot (or its path) opened lazily; tasks are
+        # built on first access and the indexes below only on the first query needing them
+        if isinstance(snapshot, str):
+            snapshot = MmapSnapshot(snapshot)
+        self.snapshot = snapshot
+        self._indexes_ready = snapshot is None
+
+        # Ordered Views: {(order, "all" | "status"): SortedView}, always-sorted listings so
+        # sorting and paging never re-sort; each is built the first time its order is listed
+        self.views = {}
+
+        if backend is not None:
+            self.tasks = backend.task_map(self._make_task)
+            self.priority_queue = self.priority_index = self.title_index = None
+            self.counters = None
+        else:
+            # Hash Table: store all tasks {task_id: Task}
+            self.tasks = {} if snapshot is None else LazyTaskMap(snapshot, self._make_task)
+
+            # Indexed Priority Queue: pending tasks only, keyed by task_id
+            self.priority_queue = IndexedPriorityQueue()
+
+            # Priority Index: {priority: tasks} buckets for equality / range searches
+            self.priority_index = PriorityIndex()
+
+            # Title Index: trigram -> task ids, for substring / prefix search (None = plain scan)
+            self.title_index = TitleIndex() if title_index else None
+
+            # Counters: running totals so get_stats never walks the tasks
+            self.counters = TaskCounters()
+
+        # educational=True makes sort_by_priority / sort_by_date run the original
+        # bubble / selection sorts instead of reading the ordered views
+        self.educational = educational
+
+        # Stack: for undo operations
+        self.history = []
+
+        # Listeners: called with the ids of changed tasks (see subscribe / batch_changes)
+        self._listeners = []
+        self._pending_changes = None  # {task_id: kind} while inside batch_changes()
+
+        # Storage: optional durable store (e.g. storage.JournalStore); every change is logged to it
+        self.storage = None
+        if storage is not None:
+            self._load_from_storage(storage)
+            self.storage = storage
+
+    def _next_task_id(self):
+        task_id = len(self.tasks) + 1
+        while str(task_id) in self.tasks:
+            task_id += 1
+        return str(task_id)
+
+    # --------------------------------------------------------------------------
+
+    #                      CHANGE NOTIFICATIONS
+
+    def subscribe(self, listener):
+        """
+        - listener(changes) is called after every change, changes = {"added": [...],
+          "removed": [...], "updated": [...]} lists of task ids
+        - inside batch_changes() it is called once, when the block ends
+        """
+        self._listeners.append(listener)
+
+    @contextmanager
+    def batch_changes(self):
+        """
+        - Collect the changes made in the block and notify the listeners once at the end
+        - A task added then removed in the block is left out; removed then added
+          (undo of a delete) is reported as updated
+        """
+        if self._pending_changes is not None:  # nested: the outer block notifies
+            yield
+            return
+        self._pending_changes = {}
+        try:
+            yield
+        finally:
+            pending, self._pending_changes = self._pending_changes, None
+            self._notify(pending)
+
+    def _changed(self, task_id, kind):
+        pending = self._pending_changes
+        if pending is None:
+            if self._listeners:
+                self._notify({task_id: kind})
+            return
+        previous = pending.get(task_id)
+        if kind == "added" and previous == "removed":
+            pending[task_id] = "updated"
+        elif kind == "removed" and previous == "added":
+            del pending[task_id]
+        elif kind != "updated" or previous is None:
+            pending[task_id] = kind
+
+    def _notify(self, pending):
+        if not pending or not self._listeners:
+            return
+        changes = {"added": [], "removed": [], "updated": []}
+        for task_id, kind in pending.items():
+            changes[kind].append(task_id)
+        for listener in self._listeners:
+            listener(changes)
+
+    # --------------------------------------------------------------------------
+
+    #          HASH INCLUDED HERE
+    def add_task(self, task_id, title, priority=1):  # Time Complexity O(log n), Space Complexity O(1)
+        """
+        **BADAWY (ME)
+        - Create new Task object
+        - Store in tasks dictionary
+        - Add to the indexed priority_queue
+        - Save operation to history stack: ("add", task_id)
+        - Return True if added, False if task_id is already in use
+        """
+        if task_id in self.tasks.keys():
+            return False
+        task = self.task_class(task_id, title, priority)
+        self.tasks[task_id] = task
+        self._index_task(task)  # O(log n)
+        self._save_to_history("add", task_id)
+        self._changed(task_id, "added")
+        return True
+
+    def get_task(self, task_id):  # O(1) for both space and time
+        """
+         **BADAWY (ME)
+        - Return task from tasks dictionary
+        - Return None if task doesn't exist
+        """
+        return self.tasks.get(task_id, None)
+
+    def remove_task(self, task_id):  # O(log n) time, O(1) space
+        """
+         **BADAWY (ME)
+        - Remove task from tasks dictionary
+        - Drop it from the priority queue
+        - Save operation to history: ("remove", task_id, task_copy)
+        - Return True if removed, False if not found
+        """
+        if task_id in self.tasks:
+            task_copy = self.tasks[task_id]
+            del self.tasks[task_id]
+            self._unindex_task(task_copy)
+            self._save_to_history("remove", (task_id, task_copy))
+            self._changed(task_id, "removed")
+            return True
+        return False
+
+    def edit_task(self, task_id, title=None, priority=None):  # O(log n) time, O(1) space
+        """
+        - Change the title and/or priority of an existing task
+        - Re-position it in the priority queue if the priority changed
+        - Save to history: ("edit", (task_id, old_title, old_priority))
+        - Return True if edited, False if not found
+        """
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        old_title, old_priority = task.title, task.priority
+        if title is not None:
+            task.title = title
+        if priority is not None:
+            task.priority = priority
+        self._reindex_task(task, old_title, old_priority)
+        self._save_to_history("edit", (task_id, old_title, old_priority))
+        if (task.title, task.priority) != (old_title, old_priority):
+            self._changed(task_id, "updated")
+        return True
+
+    def _index_task(self, task):  # O(log n)
+        """
+        - Add a task that just entered self.tasks to every index
+        """
+        if self.backend is not None:
+            return  # self.tasks[task_id] = task already inserted the row
+        if self.storage is not None:
+            self._log(self.storage.log_add, task)
+        if not self._indexes_ready:
+            return  # picked up when the indexes are built from self.tasks
+        if not task.completed:
+            self.priority_queue.push(task.task_id, task.priority)
+        self.priority_index.add(task)
+        if self.title_index is not None:
+            self.title_index.add(task)
+        self.counters.add(task)
+        for view in self.views.values():
+            view.add(task)
+
+    def _unindex_task(self, task):  # O(log n)
+        """
+        - Drop a task that just left self.tasks from every index
+        """
+        if self.backend is not None:
+            return  # del self.tasks[task_id] already deleted the row
+        if self.storage is not None:
+            self._log(self.storage.log_remove, task)
+        if not self._indexes_ready:
+            return
+        self.priority_queue.discard(task.task_id)
+        self.priority_index.remove(task)
+        if self.title_index is not None:
+            self.title_index.remove(task.task_id)
+        self.counters.remove(task)
+        for view in self.views.values():
+            view.remove(task.task_id)
+
+    def _reindex_task(self, task, old_title, old_priority):  # O(log n)
+        """
+        - Bring the indexes up to date after task.title / task.priority changed in place
+        """
+        if self.backend is not None:
+            self.backend.update(task)
+            return
+        if self.storage is not None:
+            self._log(self.storage.log_edit, task)
+        if not self._indexes_ready:
+            return
+        if task.priority != old_priority:
+            self.priority_queue.update(task.task_id, task.priority)
+            self.priority_index.move(task, old_priority)
+            self.counters.change_priority(task, old_priority)
+            for view in self.views.values():
+                view.update(task)
+        if task.title != old_title and self.title_index is not None:
+            self.title_index.update(task)
+
+    def _set_completed(self, task, completed):  # O(log n)
+        """
+        - Flip task.completed and keep the queue and counters in step
+        - Completed tasks leave the queue so peeks never have to skip them
+        """
+        if self.backend is not None:
+            task.completed = completed
+            self.backend.update(task)
+            return
+        if self._indexes_ready:
+            self.counters.set_completed(task, completed)
+        task.completed = completed
+        if self.storage is not None:
+            self._log(self.storage.log_completed, task)
+        if not self._indexes_ready:
+            return
+        if completed:
+            self.priority_queue.discard(task.task_id)
+        else:
+            self.priority_queue.push(task.task_id, task.priority)
+        for view in self.views.values():
+            view.update(task)  # only the status-grouped views move it
+
+    def _log(self, log_method, task):
+        """
+        - Append one change to the storage journal, writing a snapshot when one is due
+        """
+        log_method(task)
+        if self.storage.snapshot_due():
+            self.checkpoint()
+
+    # --------------------------------------------------------------------------
+
+    #                          PERSISTENCE
+
+    def _make_task(self, row):
+        """
+        - Build a Task from a storage row (task_id, title, priority, completed, created_ts)
+        """
+        task_id, title, priority, completed, created_ts = row
+        task = self.task_class(task_id, title, priority, created_ts)
+        task.completed = bool(completed)
+        return task
+
+    def _load_from_storage(self, storage):  # Time Complexity O(journal)
+        """
+        - Open the storage's snapshot lazily with its journal replayed on top
+          (JournalStore.load); as with TaskManager(snapshot=...), tasks are built
+          on first access and the indexes by the first query needing them
+        - The cyclic garbage collector is paused meanwhile: replaying a long journal
+          allocates many objects but creates no garbage, so its passes are pure overhead
+        """
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.tasks = storage.load(self._make_task)
+            self.snapshot = self.tasks.snapshot
+            self._indexes_ready = False
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _build_indexes(self, tasks):  # Time Complexity O(n log n)
+        """
+        - Bulk-build every index from a list of tasks (one sort each)
+        """
+        self.priority_queue.build((task.task_id, task.priority) for task in tasks if not task.completed)
+        for task in tasks:
+            self.priority_index.add(task)
+        if self.title_index is not None:
+            self.title_index.add_many(tasks)
+        self.counters.add_many(tasks)
+        for view in self.views.values():
+            view.build(tasks)
+
+    def _ensure_indexes(self):  # Time Complexity O(n log n) once, then O(1)
+        """
+        - With a lazily opened snapshot: materialize every task and build the
+          indexes the first time a query needs them
+        - Point lookups (get_task, complete, edit, remove) never get here, so they
+          stay O(log n) against the mapped file
+        """
+        if self._indexes_ready:
+            return
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._build_indexes(list(self.tasks.values()))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self._indexes_ready = True
+
+    def save_snapshot(self, path):  # Time Complexity O(n log n)
+        """
+        - Write every task to a binary MmapSnapshot file at path
+        - Tasks never touched since opening a snapshot are copied from the mapped
+          records without being materialized
+        """
+        MmapSnapshot.write(path, self._rows())
+
+    def _rows(self):
+        """
+        - Every task as a storage row (task_id, title, priority, completed, created_ts);
+          tasks never touched since opening a snapshot are read from the mapped records
+        """
+        if isinstance(self.tasks, LazyTaskMap):
+            return self.tasks.rows()
+        return ((task.task_id, task.title, task.priority, task.completed, task.created_ts)
+                for task in self.tasks.values())
+
+    def checkpoint(self):  # Time Complexity O(n)
+        """
+        - Write a compacted snapshot of every task and truncate the journal
+        - With the SQLite backend: commit the open write batch
+        """
+        if self.storage is not None:
+            self.storage.write_snapshot(self._rows())
+        if self.backend is not None:
+            self.backend.flush()
+
+    def flush(self):
+        """
+        - Make every change so far durable: write the buffered journal records /
+          commit the open SQLite write batch (a snapshot is only written by save_snapshot)
+        """
+        if self.storage is not None:
+            self.storage.flush()
+        if self.backend is not None:
+            self.backend.flush()
+
+    def close(self):
+        """
+        - Flush the last journal batch / write transaction and close the storage files
+        """
+        if self.storage is not None:
+            self.storage.close()
+        if self.backend is not None:
+            self.backend.close()
+        if self.snapshot is not None:
+            self.snapshot.close()
+
+    # -------------------------------------------------------------------------------------
+
+    #                        PRIORITY QUEUE INCLUDED HERE
+
+    def get_next_task(self):  # Time complexity O(1) and space complexity O(1)
+        """
+        AHMED
+        - Peek the root of the indexed priority queue
+        - Removed and completed tasks are dropped from the queue as they happen,
+          so the root is always the highest priority pending task
+        - Return the task object or None if no tasks available
+        """
+        if self.backend is not None:
+            return next(self._pending_by_priority(), None)
+        self._ensure_indexes()
+        next_task_id = self.priority_queue.peek()
+        if next_task_id is None:
+            return None
+        return self.tasks[next_task_id]
+
+    def get_top_3_tasks(self):  # Time complexity O(log n) and space complexity O(1)
+        """
+        AHMED
+        - Return list of top 3 highest priority incomplete tasks
+        - Don't remove them from queue, just peek
+        - Walk the heap lazily instead of copying it
+        """
+        return list(self.top_k(3))
+
+    def top_k(self, k=None, filter=None):  # Time complexity O(m log m), m = tasks consumed
+        """
+        - Lazily yield pending tasks from highest to lowest priority
+        - filter: optional function(task) -> bool, tasks it rejects are skipped
+        - Stop after k matches (k=None means keep going until the queue is exhausted)
+        - Generator: the caller only pays for the tasks it actually consumes
+        - It walks the live queue: adding, removing, completing or re-prioritizing a
+          task before it is exhausted makes the next step raise RuntimeError, so to
+          change the tasks it yields, collect them first (list(tm.top_k(k)))
+        """
+        if k is not None and k <= 0:
+            return
+        found = 0
+        for task in self._pending_by_priority():
+            if filter is not None and not filter(task):
+                continue
+            yield task
+            found += 1
+            if found == k:
+                return
+
+    def _pending_by_priority(self):
+        """
+        - Lazily yield pending tasks, highest priority first, from the heap or the SQL index
+        """
+        if self.backend is not None:
+            return self._backend_pending_by_priority()
+        self._ensure_indexes()
+        return (self.tasks[task_id] for task_id in self.priority_queue.ordered())
+
+    def _backend_pending_by_priority(self):
+        """
+        - Rows of the SQL index as tasks; RuntimeError once a write lands mid-iteration,
+          the same rule IndexedPriorityQueue.ordered() applies to the heap
+        """
+        writes = self.backend.writes
+        for row in self.backend.pending_by_priority():
+            if self.backend.writes != writes:
+                raise RuntimeError("tasks changed during iteration")
+            yield self._make_task(row)
+
+    # -------------------------------------------------------------------------------------
+
+    #                           STACK INCLUDED HERE
+
+    def undo(self):  # O(log n) time, O(1) space
+        """
+            BADAWY: Implement this
+            - Pop last operation from history stack
+            - If operation was "add": remove the task
+            - If operation was "remove": add the task back
+            - If operation was "complete": mark as incomplete
+            - If operation was "uncomplete": mark as completed again
+            - If operation was "edit": restore old title and priority
+            - Return True if undo successful, False if no history
+            """
+        if not self.history:
+            return False
+        last_operation = self.history.pop()
+        if last_operation[0] == "add":
+            task_id = last_operation[1]
+            task = self.tasks.pop(task_id, None)
+            # Also remove it from the indexes
+            if task is not None:
+                self._unindex_task(task)
+                self._changed(task_id, "removed")
+            return True
+        elif last_operation[0] == "remove":
+            task_id, task = last_operation[1]
+            self.tasks[task_id] = task
+            self._index_task(task)
+            self._changed(task_id, "added")
+            return True
+        elif last_operation[0] == "complete":
+            task_id = last_operation[1]
+            if task_id in self.tasks:
+                self._set_completed(self.tasks[task_id], False)
+                self._changed(task_id, "updated")
+                return True
+        elif last_operation[0] == "uncomplete":
+            task_id = last_operation[1]
+            if task_id in self.tasks:
+                self._set_completed(self.tasks[task_id], True)
+                self._changed(task_id, "updated")
+                return True
+        elif last_operation[0] == "edit":
+            task_id, old_title, old_priority = last_operation[1]
+            if task_id in self.tasks:
+                task = self.tasks[task_id]
+                new_title, new_priority = task.title, task.priority
+                task.title = old_title
+                task.priority = old_priority
+                self._reindex_task(task, new_title, new_priority)
+                self._changed(task_id, "updated")
+                return True
+        return False
+
+    def _save_to_history(self, operation, data):  # O(1) for both space and time
+        """
+            BADAWY: Implement this helper
+            - Push (operation, data) to history stack
+            - Keep only last 10 operations (remove old ones)
+            """
+        self.history.append((operation, data))
+        if len(self.history) > 10:
+            self.history.pop(0)
+
+    # --------------------------------------------------------------------------------
+
+    #                     SEARCHING METHODS
+
+    def linear_search(self, title):  # time complexity O(c + m log m) with the title index, O(n) without
+        """
+       KARIM
+        - Return list of tasks where title contains the search term
+        - Use simple string matching (case insensitive)<-----######
+        - With the title index only tasks sharing every trigram of the term are checked
+        - Without it, search through all tasks in tasks
+        """
+        if self.backend is not None:
+            return [self._make_task(row) for row in self.backend.title_contains(title)]
+        if self.title_index is not None:
+            self._ensure_indexes()
+            return self.title_index.search(title)
+
+        resultsOfSearch = []  # List of tasks where title contains the search term
+        searchTerm = title.lower()  # convert the title of the search term to lower case for (case insensitive)
+        for task in self.tasks.values():
+            if searchTerm in task.title.lower():  # check if the search term equals the task's title
+                resultsOfSearch.append(task)
+
+        return resultsOfSearch
+
+    def prefix_search(self, prefix):  # time complexity O(c + m log m) with the title index, O(n) without
+        """
+        KARIM
+        - Return list of tasks whose title starts with prefix (case insensitive)
+        """
+        if self.backend is not None:
+            return [self._make_task(row) for row in self.backend.title_prefix(prefix)]
+        if self.title_index is not None:
+            self._ensure_indexes()
+            return self.title_index.prefix_search(prefix)
+        prefix = prefix.lower()
+        return [task for task in self.tasks.values() if task.title.lower().startswith(prefix)]
+
+    def binary_search_by_priority(self, target_priority):  # time complexity O(1 + m)     # space complexity  O(m), m = matches
+        """
+        KARIM
+        - Look up the bucket for target_priority in the priority index
+        - The index is kept up to date by add/remove/edit/undo, so no per-query sort
+        - Return list of matching tasks
+        """
+        if self.backend is not None:
+            return [self._make_task(row) for row in self.backend.priority_equal(target_priority)]
+        self._ensure_indexes()
+        return self.priority_index.equal(target_priority)
+
+    def search_by_priority_range(self, min_priority=None, max_priority=None):  # time complexity O(log p + m)
+        """
+        KARIM
+        - Binary search the sorted distinct priorities for the range bounds
+        - Return list of tasks with min_priority <= priority <= max_priority
+        - Leave a bound as None for an open range, e.g. min_priority=4 for "priority >= 4"
+        """
+        if self.backend is not None:
+            return [self._make_task(row) for row in self.backend.priority_range(min_priority, max_priority)]
+        self._ensure_indexes()
+        return self.priority_index.range(min_priority, max_priority)
+
+    # -----------------------------------------------------------------------------
+
+    #                          SORTING
+
+    def sort_by_priority(self, educational=None):  # Time Complexity O(n), O(n^2) in educational mode
+        """
+            ZIAD
+            - Return list of all tasks sorted by priority (highest priority first)
+            - Read from the "priority" ordered view, which is kept sorted on every change
+            - educational=True (or TaskManager(educational=True)) runs the bubble sort instead
+            """
+        if not self._use_educational(educational):
+            return self.list_tasks("priority")
+        return self._bubble_sort_by_priority()
+
+    def sort_by_date(self, educational=None):  # Time Complexity O(n), O(n^2) in educational mode
+        """
+        ZIAD
+        - Return list of all tasks sorted by created_at (newest first)
+        - Read from the "date" ordered view
+        - educational=True (or TaskManager(educational=True)) runs the selection sort instead
+        """
+        if not self._use_educational(educational):
+            return self.list_tasks("date")
+        return self._selection_sort_by_date()
+
+    def list_tasks(self, order="priority", offset=0, limit=None, status="all"):  # Time Complexity O(n / 500 + limit)
+        """
+        - Return one page of tasks from an ordered view
+        - order: "added" (insertion order), "priority" (highest first), "date" (newest first)
+          or "priority_date" (highest priority first, newest first within a priority)
+        - offset / limit select the page, limit=None returns everything after offset
+        - status: "all", "pending" or "completed" tasks only
+        """
+        self._check_listing(order, status)
+        if self.backend is not None:
+            return [self._make_task(row) for row in self.backend.page(order, offset, limit, status)]
+        if order == "added" and status == "all" and not self._indexes_ready:
+            # insertion order is the lazy map's own order, so the first pages need no index
+            stop = None if limit is None else offset + limit
+            return [self.tasks[task_id] for task_id in islice(self.tasks, offset, stop)]
+        if status == "all":
+            return self._view(order, "all").page(offset, limit)
+        start, count = self._status_range(status)
+        if limit is None or offset + limit > count:
+            limit = max(count - offset, 0)
+        return self._view(order, "status").page(start + offset, limit)
+
+    def count_tasks(self, status="all"):  # Time Complexity O(1)
+        """
+        - Number of tasks list_tasks(status=status) pages through
+        """
+        if status not in self.STATUSES:
+            raise ValueError(f"Unknown status {status!r}, expected one of {list(self.STATUSES)}")
+        if self.backend is not None:
+            return self.backend.count_status(status)
+        if status == "all":
+            return len(self.tasks)
+        return self._status_range(status)[1]
+
+    def task_position(self, task_id, order="priority", status="all"):  # Time Complexity O(n / 500)
+        """
+        - Position of task_id in list_tasks(order, status=status), None if it is not listed there
+        """
+        self._check_listing(order, status)
+        if self.backend is not None:
+            return self.backend.position(task_id, order, status)
+        if order == "added" and status == "all" and not self._indexes_ready:
+            return self.tasks.position(task_id)
+        if status == "all":
+            return self._view(order, "all").index(task_id)
+        task = self.tasks.get(task_id)
+        if task is None or task.completed != (status == "completed"):
+            return None
+        start, _ = self._status_range(status)
+        return self._view(order, "status").index(task_id) - start
+
+    def _check_listing(self, order, status):
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown order {order!r}, expected one of {list(self.ORDERS)}")
+        if status not in self.STATUSES:
+            raise ValueError(f"Unknown status {status!r}, expected one of {list(self.STATUSES)}")
+
+    def _status_range(self, status):
+        """(offset, count) of the status's tasks inside the "status" views: pending first, then completed"""
+        self._ensure_indexes()
+        pending = self.counters.total - self.counters.completed
+        if status == "pending":
+            return 0, pending
+        return pending, self.counters.completed
+
+    def _view(self, order, grouping):  # Time Complexity O(1), O(n log n) the first time
+        """
+        - The ordered view for order: "all" holds every task, "status" holds the pending
+          tasks followed by the completed ones (each part in order)
+        - A view is built when it is first listed and kept sorted from then on, so a
+          front end only maintains the orders it actually shows
+        """
+        self._ensure_indexes()
+        view = self.views.get((order, grouping))
+        if view is None:
+            key = self.ORDERS[order]
+            if grouping == "status":
+                key = (lambda task, key=key: (task.completed, key(task)))
+            view = SortedView(key)
+            view.build(list(self.tasks.values()))
+            self.views[order, grouping] = view
+        return view
+
+    def _use_educational(self, educational):
+        return self.educational if educational is None else educational
+
+    def _bubble_sort_by_priority(self):
+        """
+            ZIAD
+            - Get all tasks from tasks
+            - Sort using bubble sort algorithm
+            - Return sorted list (highest priority first)
+            - compare between each two adj element until the lowest priority get at the end of list
+            """
+        task_list = list(self.tasks.values())
+        n = len(task_list)
+        # Bubble sort: Time Complexity O(n^2)
+        for i in range(n):
+            for j in range(0, n - i - 1):
+                if task_list[j].priority < task_list[j + 1].priority:
+                    task_list[j], task_list[j + 1] = task_list[j + 1], task_list[j]
+        return task_list
+
+    def _selection_sort_by_date(self):
+        """
+        ZIAD
+        - Get all tasks from tasks
+        - Sort by created_at using selection sort
+        - Return sorted list (newest first)
+        - newest then newer then older then oldest
+        - day 9-->4-->3-->2
+        """
+        task_list = list(self.tasks.values())
+        n = len(task_list)
+        # selection sort: Time Complexity O(n^2)
+        for i in range(n):
+            max_idx = i
+            for j in range(i + 1, n):
+                if task_list[j].created_at > task_list[max_idx].created_at:
+                    max_idx = j
+            task_list[i], task_list[max_idx] = task_list[max_idx], task_list[i]
+
+        return task_list
+
+    # ----------------------------------------------------------------------------
+
+    #                         OPTIONAL METHODS
+
+    def complete_task(self,task_id):  # Time complexity O(log n) space complexity O(1)
+        """
+            - Mark task as completed
+            - Save to history: ("complete", task_id)
+            - Return True if successful, False if task not found or already completed
+            """
+        if task_id in self.tasks and not self.tasks[task_id].completed:
+            current_task = self.tasks[task_id]
+            self._set_completed(current_task, True)
+            self._save_to_history("complete", task_id)
+            self._changed(task_id, "updated")
+            return True
+        else:
+            return False
+
+    def uncomplete_task(self, task_id):  # Time complexity O(log n) space complexity O(1)
+        """
+            - Mark a completed task as pending again
+            - Save to history: ("uncomplete", task_id)
+            - Return True if successful, False if task not found or not completed
+            """
+        if task_id in self.tasks and self.tasks[task_id].completed:
+            self._set_completed(self.tasks[task_id], False)
+            self._save_to_history("uncomplete", task_id)
+            self._changed(task_id, "updated")
+            return True
+        return False
+
+    def get_all_tasks(self):  # Time complexity O(n) space complexity O(n)
+        """
+            - Return list of all tasks from self.tasks, in the order they were added
+        """
+        return list(self.tasks.values())
+
+    def get_stats(self):  # Time complexity O(p + log n) space complexity O(p), p = distinct priorities
+        """
+            - Return dictionary with:
+            - "total": total number of tasks
+            - "completed": number of completed tasks
+            - "pending": number of pending tasks
+            - "by_priority": {priority: {"total", "completed", "pending"}}
+            - "pending_by_age": pending tasks bucketed by how long ago they were created
+            - Read straight from the running counters, no walk over the tasks
+            - With the SQLite backend: indexed GROUP BY / COUNT queries
+         """
+        if self.backend is not None:
+            return self.backend.stats(TaskCounters.AGE_BUCKETS)
+        self._ensure_indexes()
+        return self.counters.snapshot()
+
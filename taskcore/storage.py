@@ -0,0 +1,753 @@
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_DIR = "task_data"  # default JournalStore directory, shared by the CLI and the desktop UI
+
+
+class StoreLockedError(RuntimeError):
+    """The store directory is already open in another process (the CLI or the desktop UI)"""
+
+
+def _lock_file(path):
+    """
+    - Open path and take an exclusive, non-blocking lock on it; closing the file releases it
+    - The operating system drops the lock when the process exits, so a crash leaves no stale lock
+    """
+    lock = open(path, "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock.close()
+        raise StoreLockedError(f"{os.path.dirname(path) or '.'} is already open in another Task Manager "
+                               f"(CLI or desktop UI); close it first") from None
+    return lock
+
+
+def _remove_quietly(path):
+    """Delete path if the operating system lets us (Windows refuses while the file is mapped)"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class JournalStore:
+    """
+    Durable storage for TaskManager: append-only write-ahead log + compacted snapshots.
+
+    Files inside `directory`:
+    - snapshot-<lsn>.snap : MmapSnapshot of every task up to journal record <lsn>
+    - journal.log         : one JSON record per line, [lsn, op, task_id, ...]
+
+    Row format (snapshot and "add" records): [task_id, title, priority, completed, created_ts]
+
+    - Records are buffered and written as one group commit: the batch is
+      flushed (and fsync'ed when fsync=True) once it holds batch_size records
+      or flush_interval seconds have passed since the last flush
+    - A crash loses at most the records of the batch that was not flushed yet
+    - Every snapshot_every records TaskManager writes a new snapshot and the
+      journal is truncated, so start-up replay stays short
+    - The snapshot is opened through mmap and only the journal is replayed at
+      start-up, so opening a large store costs about as much as its journal
+    - One process at a time: opening takes an exclusive lock on `lock` in the
+      directory (until close()) and raises StoreLockedError when another process
+      holds it, since two writers would mix their lsns and overwrite each other's snapshot
+    """
+
+    LEGACY_SNAPSHOT_FILE = "snapshot.json"  # JSON snapshot written by earlier versions, converted on load
+    JOURNAL_FILE = "journal.log"
+    LOCK_FILE = "lock"
+
+    def __init__(self, directory, batch_size=64, flush_interval=0.5, fsync=True, snapshot_every=100_000):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+
+        os.makedirs(directory, exist_ok=True)
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self._lock = _lock_file(os.path.join(directory, self.LOCK_FILE))
+
+        self._buffer = []              # encoded records waiting for the next group commit
+        self._last_flush = time.monotonic()
+        self._lsn = 0                  # sequence number of the last record handed out
+        self._snapshot_lsn = 0         # lsn of the newest snapshot file
+        self._records_since_snapshot = 0
+        self._journal = None
+
+    # ------------------------------------------------------------------ loading
+
+    def load(self, make_task):  # Time Complexity O(journal)
+        """
+        - Return a LazyTaskMap {task_id: task}: the newest snapshot opened through
+          mmap with the journal replayed on top; make_task builds a task from a row
+        - Snapshot tasks are only decoded when they are looked up, so start-up time
+          grows with the journal, not with the number of tasks
+        - Journal records at or below the snapshot's lsn are already in it and are skipped
+        - A torn last line (crash in the middle of a write) is dropped and cut off the file
+        """
+        snapshots = self._snapshot_files()
+        if not snapshots:
+            snapshots = [self._first_snapshot()]
+        snapshot_lsn, snapshot_path = snapshots[-1]
+        for _, old_path in snapshots[:-1]:
+            _remove_quietly(old_path)  # left over by a crash or a snapshot that was still mapped
+        tasks = LazyTaskMap(MmapSnapshot(snapshot_path), make_task)
+
+        self._lsn = self._snapshot_lsn = snapshot_lsn
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            good_bytes = 0
+            with open(self.journal_path, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    good_bytes += len(line)
+                    lsn = record[0]
+                    if lsn <= snapshot_lsn:
+                        continue
+                    self._apply(tasks, record)
+                    self._lsn = lsn
+                    replayed += 1
+            if good_bytes < os.path.getsize(self.journal_path):
+                # Cut the torn tail off so new records do not land on a broken line
+                os.truncate(self.journal_path, good_bytes)
+
+        self._records_since_snapshot = replayed
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        return tasks
+
+    def _snapshot_path(self, lsn):
+        return os.path.join(self.directory, f"snapshot-{lsn}.snap")
+
+    def _snapshot_files(self):
+        """[(lsn, path)] of the snapshot files in the directory, oldest first"""
+        snapshots = []
+        for name in os.listdir(self.directory):
+            lsn = name[len("snapshot-"):-len(".snap")]
+            if name.startswith("snapshot-") and name.endswith(".snap") and lsn.isdigit():
+                snapshots.append((int(lsn), os.path.join(self.directory, name)))
+        return sorted(snapshots)
+
+    def _first_snapshot(self):
+        """
+        - (lsn, path) of a new snapshot for a store that has none: the JSON
+          snapshot of an earlier version converted, or an empty one
+        """
+        lsn, rows = 0, []
+        legacy_path = os.path.join(self.directory, self.LEGACY_SNAPSHOT_FILE)
+        if os.path.exists(legacy_path):
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                legacy = json.load(file)
+            lsn, rows = legacy["lsn"], legacy["tasks"]
+        path = self._snapshot_path(lsn)
+        MmapSnapshot.write(path, rows)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+        return lsn, path
+
+    def _apply(self, tasks, record):
+        op, task_id = record[1], record[2]
+        if op == "add":
+            tasks[task_id] = tasks.make_task(record[2:])
+        elif op == "remove":
+            tasks.pop(task_id, None)
+        elif task_id in tasks:
+            task = tasks[task_id]
+            if op == "complete":
+                task.completed = True
+            elif op == "uncomplete":
+                task.completed = False
+            elif op == "edit":
+                task.title, task.priority = record[3], record[4]
+
+    # ------------------------------------------------------------------ logging
+
+    def log_add(self, task):
+        self._append(["add", task.task_id, task.title, task.priority, task.completed, task.created_ts])
+
+    def log_remove(self, task):
+        self._append(["remove", task.task_id])
+
+    def log_completed(self, task):
+        self._append(["complete" if task.completed else "uncomplete", task.task_id])
+
+    def log_edit(self, task):
+        self._append(["edit", task.task_id, task.title, task.priority])
+
+    def _append(self, record):  # Time Complexity O(1) amortized
+        self._lsn += 1
+        self._records_since_snapshot += 1
+        self._buffer.append(json.dumps([self._lsn] + record, separators=(",", ":")))
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        - Group commit: write every buffered record with one write() and one fsync()
+        """
+        if self._buffer and self._journal is not None:
+            self._journal.write("\n".join(self._buffer) + "\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    # ------------------------------------------------------------------ snapshots
+
+    def snapshot_due(self):
+        return self._records_since_snapshot >= self.snapshot_every
+
+    def write_snapshot(self, rows):  # Time Complexity O(n)
+        """
+        - Write every row (task_id, title, priority, completed, created_ts) to a
+          new snapshot, then start an empty journal
+        - The snapshot is named after the last lsn it includes and written through
+          a temporary file, so a crash leaves either the old or the new snapshot,
+          never half of one; load() opens the newest
+        """
+        self.flush()
+        path = self._snapshot_path(self._lsn)
+        old_path = self._snapshot_path(self._snapshot_lsn)
+        if path != old_path or not os.path.exists(path):
+            MmapSnapshot.write(path, rows)
+            self._snapshot_lsn = self._lsn
+            if old_path != path:
+                # Still mapped by the open LazyTaskMap: POSIX unlinks it anyway, on
+                # Windows the removal fails and the next load() deletes it
+                _remove_quietly(old_path)
+
+        # Records up to self._lsn now live in the snapshot; a crash before the
+        # truncate below is harmless because load() skips them by lsn
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._records_since_snapshot = 0
+
+    def close(self):
+        self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._lock is not None:
+            self._lock.close()  # releases the directory for the next process
+            self._lock = None
+
+
+class SQLiteBackend:
+    """
+    SQLite file that replaces TaskManager's in-memory dict and indexes.
+
+    - TaskManager(backend=SQLiteBackend("tasks.db")) keeps no tasks in RAM;
+      searches, sorts, paging and stats run as indexed SQL queries
+    - Writes are batched: they share one open transaction that is committed
+      every batch_size writes, on the first write after flush_interval seconds,
+      and on flush/close
+    - The batch stays open (uncommitted, holding the write lock) until then, so the
+      owner calls flush() before it goes idle: the CLI before every prompt,
+      TaskManager.flush() on a timer in a GUI; sqlite3 connections belong to one
+      thread, so the backend cannot commit from a timer thread itself
+    - WAL journal mode lets other processes read the committed rows while one writes
+    - SQL strings are module constants, so sqlite3's statement cache
+      (cached_statements) reuses the prepared statements instead of re-parsing
+
+    Rows handed back are (task_id, title, priority, completed, created_ts),
+    the same row format JournalStore uses.
+    """
+
+    COLUMNS = "task_id, title, priority, completed, created_ts"
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS tasks (
+               seq INTEGER PRIMARY KEY,
+               task_id TEXT NOT NULL UNIQUE,
+               title TEXT NOT NULL,
+               title_lower TEXT NOT NULL,
+               priority INTEGER NOT NULL,
+               completed INTEGER NOT NULL DEFAULT 0,
+               created_ts REAL NOT NULL)""",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority, seq)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_pending ON tasks (completed, priority, seq)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_ts)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_pending_created ON tasks (completed, created_ts)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_priority_created ON tasks (priority, created_ts)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_title_lower ON tasks (title_lower)",
+    ]
+
+    INSERT = ("INSERT INTO tasks (task_id, title, title_lower, priority, completed, created_ts) "
+              "VALUES (?, ?, ?, ?, ?, ?)")
+    DELETE = "DELETE FROM tasks WHERE task_id = ?"
+    UPDATE = "UPDATE tasks SET title = ?, title_lower = ?, priority = ?, completed = ? WHERE task_id = ?"
+    GET = f"SELECT {COLUMNS} FROM tasks WHERE task_id = ?"
+    EXISTS = "SELECT 1 FROM tasks WHERE task_id = ?"
+    COUNT = "SELECT COUNT(*) FROM tasks"
+    ALL = f"SELECT {COLUMNS} FROM tasks ORDER BY seq"
+    IDS = "SELECT task_id FROM tasks ORDER BY seq"
+    PENDING_BY_PRIORITY = f"SELECT {COLUMNS} FROM tasks WHERE completed = 0 ORDER BY priority DESC, seq"
+    TITLE_CONTAINS = f"SELECT {COLUMNS} FROM tasks WHERE instr(title_lower, ?) > 0 ORDER BY seq"
+    TITLE_PREFIX = (f"SELECT {COLUMNS} FROM tasks WHERE title_lower >= ? AND title_lower < ? "
+                    "ORDER BY seq")
+    PRIORITY_EQUAL = f"SELECT {COLUMNS} FROM tasks WHERE priority = ? ORDER BY seq"
+    PRIORITY_RANGE = (f"SELECT {COLUMNS} FROM tasks WHERE priority BETWEEN ? AND ? "
+                      "ORDER BY priority, seq")
+    ORDERS = {
+        "added": "seq",
+        "priority": "priority DESC, seq",
+        "date": "created_ts DESC, seq",
+        "priority_date": "priority DESC, created_ts DESC, seq",
+    }
+    STATUS_FILTERS = {"all": "", "pending": "WHERE completed = 0", "completed": "WHERE completed = 1"}
+    COUNT_COMPLETED = "SELECT COUNT(*) FROM tasks WHERE completed = ?"
+    STATS_BY_PRIORITY = ("SELECT priority, COUNT(*), SUM(completed) FROM tasks "
+                         "GROUP BY priority ORDER BY priority")
+    PENDING_OLDER_THAN = "SELECT COUNT(*) FROM tasks WHERE completed = 0 AND created_ts < ?"
+
+    def __init__(self, path, batch_size=256, flush_interval=0.5, cached_statements=128):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # isolation_level=None: transactions are opened and committed explicitly below
+        self.connection = sqlite3.connect(path, isolation_level=None, cached_statements=cached_statements)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self.connection.execute(statement)
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+        self.writes = 0  # every write so far; lets lazy readers detect a change mid-iteration
+
+    # ------------------------------------------------------------------ writes
+
+    def _write(self, sql, params):
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+        self.connection.execute(sql, params)
+        self.writes += 1
+        self._pending_writes += 1
+        if self._pending_writes >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def insert(self, task):
+        self._write(self.INSERT, (task.task_id, task.title, task.title.lower(), task.priority,
+                                  int(task.completed), task.created_ts))
+
+    def delete(self, task_id):
+        self._write(self.DELETE, (task_id,))
+
+    def update(self, task):
+        self._write(self.UPDATE, (task.title, task.title.lower(), task.priority, int(task.completed), task.task_id))
+
+    def flush(self):
+        """
+        - Commit the open write batch
+        """
+        if self.connection.in_transaction:
+            self.connection.execute("COMMIT")
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    # ------------------------------------------------------------------ reads
+
+    def _rows(self, sql, params=()):
+        return self.connection.execute(sql, params)
+
+    def get(self, task_id):
+        return self._rows(self.GET, (task_id,)).fetchone()
+
+    def contains(self, task_id):
+        return self._rows(self.EXISTS, (task_id,)).fetchone() is not None
+
+    def count(self):
+        return self._rows(self.COUNT).fetchone()[0]
+
+    def all_rows(self):
+        return self._rows(self.ALL)
+
+    def task_ids(self):
+        return (row[0] for row in self._rows(self.IDS))
+
+    def pending_by_priority(self):  # lazy cursor over idx_tasks_pending
+        return self._rows(self.PENDING_BY_PRIORITY)
+
+    def title_contains(self, query):
+        return self._rows(self.TITLE_CONTAINS, (query.lower(),)).fetchall()
+
+    def title_prefix(self, prefix):  # range scan over idx_tasks_title_lower
+        prefix = prefix.lower()
+        return self._rows(self.TITLE_PREFIX, (prefix, prefix + "\U0010ffff")).fetchall()
+
+    def priority_equal(self, priority):
+        return self._rows(self.PRIORITY_EQUAL, (priority,)).fetchall()
+
+    def priority_range(self, low=None, high=None):
+        low = -(2 ** 63) if low is None else low
+        high = 2 ** 63 - 1 if high is None else high
+        return self._rows(self.PRIORITY_RANGE, (low, high)).fetchall()
+
+    def count_status(self, status="all"):
+        if status == "all":
+            return self.count()
+        return self._rows(self.COUNT_COMPLETED, (int(status == "completed"),)).fetchone()[0]
+
+    def page(self, order, offset=0, limit=None, status="all"):
+        sql = (f"SELECT {self.COLUMNS} FROM tasks {self.STATUS_FILTERS[status]} "
+               f"ORDER BY {self.ORDERS[order]} LIMIT ? OFFSET ?")
+        return self._rows(sql, (-1 if limit is None else limit, offset)).fetchall()
+
+    def position(self, task_id, order, status="all"):  # one window-function scan over the status's rows
+        sql = (f"SELECT position FROM (SELECT task_id, ROW_NUMBER() OVER (ORDER BY {self.ORDERS[order]}) - 1 "
+               f"AS position FROM tasks {self.STATUS_FILTERS[status]}) WHERE task_id = ?")
+        row = self._rows(sql, (task_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def stats(self, age_buckets, now=None):
+        """
+        - Return the get_stats() dictionary computed by SQL aggregates
+        - age_buckets: TaskCounters.AGE_BUCKETS style [(name, upper age in days or None), ...]
+        """
+        by_priority = {}
+        total = completed = 0
+        for priority, count, done in self._rows(self.STATS_BY_PRIORITY):
+            done = done or 0
+            by_priority[priority] = {"total": count, "completed": done, "pending": count - done}
+            total += count
+            completed += done
+
+        now = (now or datetime.now()).timestamp()
+        pending_by_age = {}
+        newer_than = total - completed  # pending tasks younger than the previous limit
+        for name, days in age_buckets:
+            if days is None:
+                pending_by_age[name] = newer_than
+                break
+            older = self._rows(self.PENDING_OLDER_THAN, (now - days * 86400,)).fetchone()[0]
+            pending_by_age[name] = newer_than - older
+            newer_than = older
+
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": total - completed,
+            "by_priority": by_priority,
+            "pending_by_age": pending_by_age,
+        }
+
+    def task_map(self, make_task):
+        return SQLiteTaskMap(self, make_task)
+
+
+class SQLiteTaskMap(MutableMapping):
+    """
+    dict-like {task_id: Task} view over an SQLiteBackend, used as TaskManager.tasks.
+
+    - every lookup builds a fresh Task from its row (make_task); changes to a
+      Task are written back by TaskManager through backend.update()
+    """
+
+    def __init__(self, backend, make_task):
+        self.backend = backend
+        self.make_task = make_task
+
+    def __getitem__(self, task_id):
+        row = self.backend.get(task_id)
+        if row is None:
+            raise KeyError(task_id)
+        return self.make_task(row)
+
+    def __setitem__(self, task_id, task):
+        if self.backend.contains(task_id):
+            self.backend.update(task)
+        else:
+            self.backend.insert(task)
+
+    def __delitem__(self, task_id):
+        if not self.backend.contains(task_id):
+            raise KeyError(task_id)
+        self.backend.delete(task_id)
+
+    def __contains__(self, task_id):
+        return self.backend.contains(task_id)
+
+    def __iter__(self):
+        return self.backend.task_ids()
+
+    def __len__(self):
+        return self.backend.count()
+
+    def values(self):
+        return [self.make_task(row) for row in self.backend.all_rows()]
+
+
+class MmapSnapshot:
+    """
+    Read-only binary snapshot opened through mmap, for near-instant cold starts.
+
+    File layout (little endian):
+    - header      : HEADER (magic, version, record size, count, section offsets)
+    - records     : count fixed-width RECORDs, in task insertion order
+                    (id offset/length, title offset/length, created_ts, priority, completed)
+    - id index    : open-addressing hash table of uint32 slots (record number + 1,
+                    0 = empty), crc32(task_id) with linear probing, load factor <= 1/2
+    - string heap : UTF-8 task ids and titles, addressed by the records
+
+    Opening only reads the header; a task is decoded when it is looked up, and a
+    lookup reads about one index slot, one record and its heap bytes, so the
+    pages the OS loads (and the RSS) grow with the tasks actually touched.
+    Task ids are stored as text and come back as str.
+    """
+
+    MAGIC = b"TASKSNAP"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIIQQQQQ")
+    RECORD = struct.Struct("<QIQIdqB7x")
+    INDEX_ENTRY = struct.Struct("<I")
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, record_size, self.count, self._slots,
+         self._records_offset, self._index_offset, self._heap_offset) = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {self.VERSION} task snapshot")
+
+    @classmethod
+    def write(cls, path, rows):  # Time Complexity O(n)
+        """
+        - Write rows (task_id, title, priority, completed, created_ts) to path
+        - Written to a temporary file and renamed into place, so readers that
+          still have the old file mapped keep a consistent view
+        """
+        heap = bytearray()
+        records = []
+        ids = []
+        for task_id, title, priority, completed, created_ts in rows:
+            id_bytes = str(task_id).encode("utf-8")
+            title_bytes = title.encode("utf-8")
+            id_offset = len(heap)
+            heap += id_bytes
+            title_offset = len(heap)
+            heap += title_bytes
+            records.append(cls.RECORD.pack(id_offset, len(id_bytes), title_offset, len(title_bytes),
+                                           created_ts, priority, 1 if completed else 0))
+            ids.append(id_bytes)
+
+        count = len(records)
+        slots = 1
+        while slots < 2 * count:
+            slots *= 2
+        mask = slots - 1
+        table = array("I", bytes(4 * slots))
+        for record_number, id_bytes in enumerate(ids):
+            slot = zlib.crc32(id_bytes) & mask
+            while table[slot]:
+                if ids[table[slot] - 1] == id_bytes:
+                    raise ValueError(f"Duplicate task id {id_bytes.decode('utf-8')!r} in snapshot rows")
+                slot = (slot + 1) & mask
+            table[slot] = record_number + 1
+        if sys.byteorder != "little":
+            table.byteswap()
+
+        records_offset = cls.HEADER.size
+        index_offset = records_offset + count * cls.RECORD.size
+        heap_offset = index_offset + slots * cls.INDEX_ENTRY.size
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, cls.RECORD.size, count, slots,
+                                       records_offset, index_offset, heap_offset))
+            file.write(b"".join(records))
+            file.write(table.tobytes())
+            file.write(heap)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+    def _string(self, offset, length):
+        start = self._heap_offset + offset
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def _id_bytes(self, record_number):
+        id_offset, id_length = struct.unpack_from("<QI", self._mmap, self._records_offset + record_number * self.RECORD.size)
+        start = self._heap_offset + id_offset
+        return self._mmap[start:start + id_length]
+
+    def row_at(self, record_number):  # Time Complexity O(1)
+        """
+        - Decode record number record_number into (task_id, title, priority, completed, created_ts)
+        """
+        id_offset, id_length, title_offset, title_length, created_ts, priority, completed = \
+            self.RECORD.unpack_from(self._mmap, self._records_offset + record_number * self.RECORD.size)
+        return (self._string(id_offset, id_length), self._string(title_offset, title_length),
+                priority, bool(completed), created_ts)
+
+    def find(self, task_id):  # Time Complexity O(1) expected
+        """
+        - Probe the id hash table; return the record number or None
+        """
+        if not self.count:
+            return None
+        key = str(task_id).encode("utf-8")
+        mask = self._slots - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            entry = self.INDEX_ENTRY.unpack_from(self._mmap, self._index_offset + slot * 4)[0]
+            if not entry:
+                return None
+            if self._id_bytes(entry - 1) == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def get(self, task_id):
+        record_number = self.find(task_id)
+        return None if record_number is None else self.row_at(record_number)
+
+    def task_ids(self):  # lazy, record order
+        for record_number in range(self.count):
+            yield self._id_bytes(record_number).decode("utf-8")
+
+    def rows(self):  # lazy, record order
+        for record_number in range(self.count):
+            yield self.row_at(record_number)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+class LazyTaskMap(MutableMapping):
+    """
+    dict-like {task_id: Task} over an MmapSnapshot, used as TaskManager.tasks.
+
+    - a task is built from its record the first time it is looked up, then cached
+    - adds, edits and removals live in memory on top of the read-only snapshot
+      (cache for new / touched tasks, removed for snapshot tasks deleted since)
+    """
+
+    def __init__(self, snapshot, make_task):
+        self.snapshot = snapshot
+        self.make_task = make_task
+        self._cache = {}       # {task_id: Task} materialized or added tasks
+        self._removed = set()  # snapshot task ids deleted since opening
+        self._extra = {}       # ids in _cache that are not live snapshot tasks, in the order added
+
+    def _in_snapshot(self, task_id):
+        return task_id not in self._removed and self.snapshot.find(task_id) is not None
+
+    def __getitem__(self, task_id):
+        task = self._cache.get(task_id)
+        if task is not None:
+            return task
+        if task_id in self._removed:
+            raise KeyError(task_id)
+        row = self.snapshot.get(task_id)
+        if row is None:
+            raise KeyError(task_id)
+        task = self._cache[task_id] = self.make_task(row)
+        return task
+
+    def __setitem__(self, task_id, task):
+        if task_id not in self._cache and not self._in_snapshot(task_id):
+            self._extra[task_id] = None
+        self._cache[task_id] = task
+
+    def __delitem__(self, task_id):
+        if task_id in self._extra:
+            del self._extra[task_id]
+            del self._cache[task_id]
+        elif self._in_snapshot(task_id):
+            self._removed.add(task_id)
+            self._cache.pop(task_id, None)
+        else:
+            raise KeyError(task_id)
+
+    def __contains__(self, task_id):
+        return task_id in self._cache or self._in_snapshot(task_id)
+
+    def __iter__(self):
+        for task_id in self.snapshot.task_ids():
+            if task_id not in self._removed:
+                yield task_id
+        yield from list(self._extra)
+
+    def __len__(self):
+        return self.snapshot.count - len(self._removed) + len(self._extra)
+
+    def position(self, task_id):  # Time Complexity O(removed + added)
+        """
+        - Index of task_id in iteration (insertion) order, None if it is not here
+        """
+        if task_id in self._extra:
+            return self.snapshot.count - len(self._removed) + list(self._extra).index(task_id)
+        record_number = None if task_id in self._removed else self.snapshot.find(task_id)
+        if record_number is None:
+            return None
+        return record_number - sum(1 for removed_id in self._removed
+                                   if self.snapshot.find(removed_id) < record_number)
+
+    def values(self):  # Time Complexity O(n)
+        """
+        - Every task, materializing (and caching) untouched ones in one pass over the records
+        """
+        cache = self._cache
+        removed = self._removed
+        make_task = self.make_task
+        tasks = []
+        for row in self.snapshot.rows():
+            task_id = row[0]
+            if task_id in removed:
+                continue
+            task = cache.get(task_id)
+            if task is None:
+                task = cache[task_id] = make_task(row)
+            tasks.append(task)
+        tasks.extend(cache[task_id] for task_id in list(self._extra))
+        return tasks
+
+    def rows(self):
+        """
+        - Yield every current row without materializing untouched tasks (used to save)
+        """
+        for row in self.snapshot.rows():
+            task_id = row[0]
+            if task_id in self._removed:
+                continue
+            task = self._cache.get(task_id)
+            yield row if task is None else _task_row(task)
+        for task_id in list(self._extra):
+            yield _task_row(self._cache[task_id])
+
+
+def _task_row(task):
+    """(task_id, title, priority, completed, created_ts) row for a Task"""
+    return (task.task_id, task.title, task.priority, task.completed, task.created_ts)